@@ -0,0 +1,163 @@
+from arvores_sintaticas.declaracao import Declaracao, Tipo, TipoFuncao
+from lexer.simbolos import Simbolos
+from .validator import AnaliseSemantica, TabelaSimbolos
+from typing import Optional
+
+# Analise semantica incremental de uma nova versao do programa.
+#
+# O resultado de uma declaracao do nivel mais externo so depende dela mesma e
+# dos nomes globais que ela le ou declara: o tipo de cada um deles quando ela eh
+# analisada (a assinatura, se for uma funcao), ou None se ele ainda nao estava
+# declarado (o que eh um erro ao ler e o que permite declarar). A analise anota esses nomes, as dependencias da
+# declaracao, junto com o que ela declara no escopo global e o erro que deu, se
+# deu. As dependencias de todas as declaracoes formam o grafo de dependencias
+# entre elas, pelos nomes.
+#
+# Na versao seguinte, uma declaracao que eh o mesmo objeto de antes (como as
+# que o ParserIncremental reaproveita) e cujas dependencias tem o mesmo tipo
+# agora eh reaproveitada: so as suas declaracoes globais entram na tabela. As
+# outras, as novas e as que dependem de um nome que mudou de tipo, sao
+# analisadas de novo.
+#
+# Para isso, todas as declaracoes sao analisadas, mesmo depois de um erro:
+# depois de uma declaracao com erro, a analise continua com os nomes globais que
+# ela chegou a declarar (o nome de uma funcao com erro no corpo, por exemplo).
+# self.erros recebe os erros na ordem das declaracoes, e analisar lanca o
+# primeiro, que eh o mesmo que a AnaliseSemantica lancaria. Os tipos das
+# expressoes compartilhadas sao calculados de novo em cada versao.
+
+# TabelaSimbolos que anota as dependencias da declaracao em analise.
+class TabelaDependencias(TabelaSimbolos):
+    def __init__(self, simbolos: Simbolos):
+        super().__init__(simbolos)
+        self.dependencias: dict[int, Optional[Tipo | TipoFuncao]] = {}
+        # Os nomes globais declarados pela propria declaracao, que nao sao dependencias.
+        self.proprios: set[int] = set()
+
+    # Comeca a anotar as dependencias de outra declaracao.
+    def comeca(self):
+        self.dependencias = {}
+        self.proprios = set()
+
+    # O tipo ou a assinatura do nome no escopo global, ou None.
+    def ligacao_global(self, simbolo: int) -> Optional[Tipo | TipoFuncao]:
+        pilha = self.declaracoes.get(simbolo)
+
+        if not pilha or pilha[0][0] != 0:
+            return None
+
+        return self.assinaturas.get((simbolo, 0)) or pilha[0][1]
+
+    def anota(self, simbolo: int):
+        if simbolo not in self.dependencias and simbolo not in self.proprios:
+            self.dependencias[simbolo] = self.ligacao_global(simbolo)
+
+    def inserir(self, simbolo: int, tipo: Tipo):
+        if len(self.declarados) == 1:
+            self.anota(simbolo)
+            self.proprios.add(simbolo)
+
+        super().inserir(simbolo, tipo)
+
+    def buscar(self, simbolo: int) -> Tipo:
+        pilha = self.declaracoes.get(simbolo)
+
+        # Os nomes locais sao da propria declaracao.
+        if pilha is None or pilha[-1][0] == 0:
+            self.anota(simbolo)
+
+        return super().buscar(simbolo)
+
+    def assinatura(self, simbolo: int) -> Optional[TipoFuncao]:
+        pilha = self.declaracoes.get(simbolo)
+
+        if pilha is None or pilha[-1][0] == 0:
+            self.anota(simbolo)
+
+        return super().assinatura(simbolo)
+
+# O que a analise de uma declaracao do nivel mais externo produziu.
+class Resultado:
+    __slots__ = ("declaracao", "dependencias", "declarados", "erro")
+
+    def __init__(self, declaracao: Declaracao, dependencias: dict[int, Optional[Tipo | TipoFuncao]], declarados: list[tuple[int, Tipo | TipoFuncao]], erro: Optional[Exception]):
+        self.declaracao = declaracao
+        self.dependencias = dependencias
+        self.declarados = declarados  # Os nomes globais declarados, na ordem, com o tipo ou a assinatura.
+        self.erro = erro
+
+class AnaliseIncremental(AnaliseSemantica):
+    def __init__(self, simbolos: Simbolos):
+        super().__init__(simbolos)
+        self.tabela_simbolos = TabelaDependencias(simbolos)
+        # O resultado de cada declaracao da ultima versao, pelo id dela.
+        self.resultados: dict[int, Resultado] = {}
+        self.erros: list[Exception] = []
+        self.reaproveitadas = 0
+        self.reanalisadas = 0
+
+    def analisar(self, declaracoes: list[Declaracao]):
+        anteriores = self.resultados
+        tabela = self.tabela_simbolos = TabelaDependencias(self.tabela_simbolos.simbolos)
+        self.resultados = {}
+        self.tipos = {}
+        self.erros = []
+        self.reaproveitadas = 0
+        self.reanalisadas = 0
+
+        for declaracao in declaracoes:
+            # Os resultados sao guardados pelo id, entao uma declaracao so pode aparecer uma vez.
+            if id(declaracao) in self.resultados:
+                raise ValueError("A mesma declaracao aparece mais de uma vez no programa.")
+
+            resultado = anteriores.get(id(declaracao))
+
+            if resultado is not None and resultado.declaracao is declaracao and self.valido(resultado):
+                for simbolo, ligacao in resultado.declarados:
+                    tabela.inserir_ligacao(simbolo, ligacao)
+
+                self.reaproveitadas += 1
+            else:
+                resultado = self.analisa_declaracao(declaracao)
+                self.reanalisadas += 1
+
+            self.resultados[id(declaracao)] = resultado
+
+            if resultado.erro is not None:
+                self.erros.append(resultado.erro)
+
+        if self.erros:
+            raise self.erros[0]
+
+    # Se as dependencias do resultado tem o mesmo tipo no escopo global de agora.
+    def valido(self, resultado: Resultado) -> bool:
+        ligacao_global = self.tabela_simbolos.ligacao_global
+
+        return all(ligacao_global(simbolo) is ligacao for simbolo, ligacao in resultado.dependencias.items())
+
+    def analisa_declaracao(self, declaracao: Declaracao) -> Resultado:
+        tabela = self.tabela_simbolos
+        globais = tabela.declarados[0]
+        antes = len(globais)
+        erro = None
+
+        tabela.comeca()
+
+        try:
+            self.visitar(declaracao)
+        except Exception as e:
+            erro = e
+
+            # O erro pode ter deixado escopos abertos.
+            while len(tabela.declarados) > 1:
+                tabela.remover_escopo()
+
+            self.tipo_retorno_atual = None
+
+        declarados = [(simbolo, tabela.ligacao_global(simbolo)) for simbolo in globais[antes:]]
+
+        return Resultado(declaracao, tabela.dependencias, declarados, erro)
+
+    # As declaracoes da ultima versao que dependem do nome global simbolo.
+    def dependentes(self, simbolo: int) -> list[Declaracao]:
+        return [resultado.declaracao for resultado in self.resultados.values() if simbolo in resultado.dependencias]
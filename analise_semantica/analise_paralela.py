@@ -0,0 +1,143 @@
+from arvores_sintaticas.declaracao import Declaracao, Funcao, Tipo, TipoFuncao
+from lexer.simbolos import Simbolos
+from .validator import AnaliseSemantica, assinatura
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Optional
+import multiprocessing
+import os
+
+# Analise semantica com os corpos das funcoes do nivel mais externo checados
+# em varios processos.
+#
+# A primeira fase percorre as declaracoes do nivel mais externo na ordem, como
+# a AnaliseSemantica: declara cada funcao (sem entrar no corpo) e analisa as
+# outras declaracoes, que podem declarar variaveis globais e dependem da
+# ordem. Ela termina no primeiro erro, e produz o escopo global congelado:
+# a lista das declaracoes globais na ordem (com a assinatura, para as funcoes),
+# e para cada funcao quantas delas o corpo enxerga (as de antes dela, e ela
+# mesma).
+#
+# A segunda fase checa o corpo de cada funcao de antes do primeiro erro da
+# primeira fase, de forma independente: um corpo nao declara nada no escopo
+# global. As funcoes sao divididas em faixas seguidas, e cada processo monta a
+# sua tabela de simbolos com as globais visiveis conforme avanca na faixa.
+#
+# self.erros recebe os erros na ordem das declaracoes, no maximo um por corpo
+# de funcao, mais o da primeira fase; analisar lanca o primeiro deles, que eh o
+# mesmo que a AnaliseSemantica lancaria.
+#
+# Os processos sao criados com fork e herdam a arvore, os simbolos e o escopo
+# global, entao so os indices das funcoes e os erros passam entre processos.
+# Onde nao ha fork, ou com poucas funcoes, a segunda fase roda neste processo.
+
+# Uma funcao para a segunda fase: o indice dela nas declaracoes e quantas globais ela ve.
+FuncaoGlobal = tuple[int, int]
+
+# O que os processos da segunda fase herdam: declaracoes, funcoes, globais,
+# simbolos e expressoes compartilhadas.
+_estado: Optional[tuple] = None
+
+# Checa os corpos das funcoes[inicio:fim] e retorna os erros, com o indice da funcao.
+def analisa_funcoes(estado: tuple, inicio: int, fim: int) -> list[tuple[int, Exception]]:
+    declaracoes, funcoes, globais, simbolos, compartilhados = estado
+
+    analisador = AnaliseSemantica(simbolos)
+    analisador.compartilhados = compartilhados
+    tabela = analisador.tabela_simbolos
+    inseridas = 0
+    erros = []
+
+    for indice, visiveis in funcoes[inicio:fim]:
+        for simbolo, ligacao in globais[inseridas:visiveis]:
+            tabela.inserir_ligacao(simbolo, ligacao)
+
+        inseridas = visiveis
+
+        try:
+            analisador.visitar_corpo(declaracoes[indice])
+        except Exception as e:
+            erros.append((indice, e))
+
+            # O erro pode ter deixado escopos abertos.
+            while len(tabela.declarados) > 1:
+                tabela.remover_escopo()
+
+            analisador.tipo_retorno_atual = None
+
+    return erros
+
+def _analisa_funcoes(inicio: int, fim: int) -> list[tuple[int, Exception]]:
+    return analisa_funcoes(_estado, inicio, fim)
+
+class AnaliseParalela(AnaliseSemantica):
+    def __init__(self, simbolos: Simbolos, trabalhadores: Optional[int] = None, minimo_funcoes: int = 256):
+        super().__init__(simbolos)
+        self.trabalhadores = trabalhadores if trabalhadores is not None else os.cpu_count() or 1
+        # Com menos funcoes que isso, criar os processos nao compensa.
+        self.minimo_funcoes = minimo_funcoes
+        self.erros: list[Exception] = []
+
+    def analisar(self, declaracoes: Iterable[Declaracao]):
+        declaracoes = list(declaracoes)
+        funcoes, globais, erro = self.declara_globais(declaracoes)
+
+        erros = self.analisa_corpos(declaracoes, funcoes, globais)
+
+        if erro is not None:
+            erros.append(erro)
+
+        self.erros = [e for _, e in sorted(erros, key = lambda erro: erro[0])]
+
+        if self.erros:
+            raise self.erros[0]
+
+    # Primeira fase. Retorna as funcoes, as globais e o erro, se houve, com o
+    # indice da declaracao em que ele aconteceu.
+    def declara_globais(self, declaracoes: list[Declaracao]) -> tuple[list[FuncaoGlobal], list[tuple[int, Tipo | TipoFuncao]], Optional[tuple[int, Exception]]]:
+        tabela = self.tabela_simbolos
+        globais_tabela = tabela.declarados[0]
+        funcoes: list[FuncaoGlobal] = []
+        globais: list[tuple[int, Tipo | TipoFuncao]] = []
+
+        for i, declaracao in enumerate(declaracoes):
+            try:
+                if isinstance(declaracao, Funcao):
+                    tabela.inserir_funcao(declaracao.simbolo, assinatura(declaracao))
+                else:
+                    self.visitar(declaracao)
+            except Exception as e:
+                return funcoes, globais, (i, e)
+
+            for simbolo in globais_tabela[len(globais):]:
+                globais.append((simbolo, tabela.ligacao(simbolo)))
+
+            if isinstance(declaracao, Funcao):
+                funcoes.append((i, len(globais)))
+
+        return funcoes, globais, None
+
+    # Segunda fase.
+    def analisa_corpos(self, declaracoes: list[Declaracao], funcoes: list[FuncaoGlobal], globais: list[tuple[int, Tipo | TipoFuncao]]) -> list[tuple[int, Exception]]:
+        global _estado
+
+        estado = (declaracoes, funcoes, globais, self.tabela_simbolos.simbolos, self.compartilhados)
+        partes = min(self.trabalhadores, len(funcoes) // max(1, self.minimo_funcoes))
+
+        if partes <= 1 or "fork" not in multiprocessing.get_all_start_methods():
+            return analisa_funcoes(estado, 0, len(funcoes))
+
+        # Algumas faixas por processo, para equilibrar corpos de tamanhos diferentes.
+        faixas = partes * 4
+        cortes = [len(funcoes) * i // faixas for i in range(faixas + 1)]
+
+        _estado = estado
+
+        try:
+            contexto = multiprocessing.get_context("fork")
+
+            with ProcessPoolExecutor(max_workers = partes, mp_context = contexto) as executor:
+                resultados = executor.map(_analisa_funcoes, cortes[:-1], cortes[1:])
+
+                return [erro for erros in resultados for erro in erros]
+        finally:
+            _estado = None
@@ -0,0 +1,109 @@
+from arvores_sintaticas.declaracao import *
+from arvores_sintaticas.expressao import *
+from arvores_sintaticas.visitante import Visitante, percorre
+
+# Crafting Interpreters, Robert Nystrom - Cap. 11.
+
+# Resolve cada nome da arvore sintatica para uma coordenada (profundidade, slot):
+# profundidade eh o nivel do escopo da declaracao (0 eh o escopo global, e cada
+# funcao e bloco abre o proximo nivel) e slot eh a posicao dela entre as
+# declaracoes desse escopo, na ordem. Var, Parametro e Funcao (pelo nome)
+# recebem a coordenada da propria declaracao; Variavel e Atribuicao, a da
+# declaracao visivel do nome. Bloco e Funcao recebem em total_slots quantas
+# declaracoes o escopo deles tem, e total_slots_globais guarda as do escopo
+# global. Com isso, um interpretador ou gerador de codigo pode guardar as
+# variaveis em arrays, um por nivel, em vez de dicionarios.
+#
+# Os escopos sao os mesmos da AnaliseSemantica: o nome de uma funcao eh
+# declarado no escopo de fora, antes do corpo, e os parametros e o corpo ficam
+# num escopo so. Como a coordenada usa o nivel do escopo, e nao a distancia ate
+# ele, ela nao depende de onde o nome eh usado, entao serve tambem para os nos
+# compartilhados (veja arvores_sintaticas.compartilhamento).
+#
+# O Resolvedor nao reporta erros: um nome nao declarado fica com (-1, -1), e
+# uma declaracao repetida no mesmo escopo ganha outro slot; os erros continuam
+# sendo da AnaliseSemantica. A arvore eh percorrida sem recursao (com
+# percorre), e precisa ser de objetos, nao de visoes de uma Arena.
+
+NAO_DECLARADA = (-1, -1)
+
+class Resolvedor(Visitante):
+    def __init__(self) -> None:
+        # Para cada simbolo, as coordenadas das declaracoes visiveis, a mais interna no topo.
+        self.declaracoes: dict[int, list[tuple[int, int]]] = {}
+        # Para cada escopo aberto, os simbolos declarados nele.
+        self.declarados: list[list[int]] = [[]]
+        self.total_slots_globais = 0
+        self.entrando = True
+
+    def resolver(self, declaracoes: list[Declaracao]) -> None:
+        for no, entrando in percorre(declaracoes):
+            self.entrando = entrando
+            self.visitar(no)
+
+        self.total_slots_globais = len(self.declarados[0])
+
+    # Declara simbolo no escopo atual e retorna a coordenada dele.
+    def declara(self, simbolo: int) -> tuple[int, int]:
+        declarados = self.declarados[-1]
+        coordenada = (len(self.declarados) - 1, len(declarados))
+
+        self.declaracoes.setdefault(simbolo, []).append(coordenada)
+        declarados.append(simbolo)
+
+        return coordenada
+
+    def resolve(self, simbolo: int) -> tuple[int, int]:
+        pilha = self.declaracoes.get(simbolo)
+
+        return pilha[-1] if pilha else NAO_DECLARADA
+
+    def novo_escopo(self) -> None:
+        self.declarados.append([])
+
+    # Fecha o escopo atual e retorna quantas declaracoes ele teve.
+    def remover_escopo(self) -> int:
+        declarados = self.declarados.pop()
+
+        for simbolo in declarados:
+            pilha = self.declaracoes[simbolo]
+            pilha.pop()
+
+            if not pilha:
+                del self.declaracoes[simbolo]
+
+        return len(declarados)
+
+    def visitar_funcao(self, funcao: Funcao) -> None:
+        if self.entrando:
+            funcao.profundidade, funcao.slot = self.declara(funcao.simbolo)
+            self.novo_escopo()
+        else:
+            funcao.total_slots = self.remover_escopo()
+
+    def visitar_bloco(self, bloco: Bloco) -> None:
+        if self.entrando:
+            self.novo_escopo()
+        else:
+            bloco.total_slots = self.remover_escopo()
+
+    def visitar_parametro(self, parametro: Parametro) -> None:
+        if self.entrando:
+            parametro.profundidade, parametro.slot = self.declara(parametro.simbolo)
+
+    # O inicializador ve as declaracoes de antes da variavel.
+    def visitar_var(self, var: Var) -> None:
+        if not self.entrando:
+            var.profundidade, var.slot = self.declara(var.simbolo)
+
+    def visitar_variavel(self, variavel: Variavel) -> None:
+        if self.entrando:
+            variavel.profundidade, variavel.slot = self.resolve(variavel.simbolo)
+
+    def visitar_atribuicao(self, atribuicao: Atribuicao) -> None:
+        if self.entrando:
+            atribuicao.profundidade, atribuicao.slot = self.resolve(atribuicao.simbolo)
+
+    # Os outros nos nao declaram nem usam nomes.
+    def desconhecido(self, no) -> None:
+        pass
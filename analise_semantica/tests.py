@@ -0,0 +1,513 @@
+from .validator import AnaliseSemantica, TabelaSimbolos
+from .resolvedor import Resolvedor, NAO_DECLARADA
+from .analise_paralela import AnaliseParalela
+from .analise_incremental import AnaliseIncremental
+from lexer.lex_tabela import LexerTabela
+from lexer.simbolos import Simbolos
+from parser.parser import Parser
+from parser.parser_arena import ParserArena
+from parser.parser_compartilhado import ParserCompartilhado
+from parser.parser_iterativo import ParserIterativo
+from parser.parser_incremental import ParserIncremental
+from arvores_sintaticas.declaracao import TipoFuncao, TipoLista, TipoPrimitivo
+
+import random
+import unittest
+
+# Faz a analise lexica e sintatica de fonte e retorna o analisador
+# semantico depois de analisar as declaracoes. Com arena, a arvore fica numa
+# Arena e o analisador recebe as visoes dela; com compartilhar, as expressoes
+# iguais sao um no so (veja arvores_sintaticas.compartilhamento).
+def analisa(fonte: str, arena: bool = False, compartilhar: bool = False) -> AnaliseSemantica:
+    lexer = LexerTabela(fonte)
+    lexer.lex()
+    
+    if arena:
+        parser = ParserArena(lexer.tokens)
+    elif compartilhar:
+        parser = ParserCompartilhado(lexer.tokens)
+    else:
+        parser = Parser(lexer.tokens)
+    
+    parser.parse()
+    
+    analisador = AnaliseSemantica(lexer.simbolos)
+    
+    if compartilhar:
+        analisador.compartilhados = parser.fabrica.compartilhados
+    
+    analisador.analisar(parser.arena.declaracoes() if arena else parser.declaracoes)
+    
+    return analisador
+
+def analisa_expressao(fonte: str):
+    lexer = LexerTabela(fonte + ";")
+    lexer.lex()
+    
+    return Parser(lexer.tokens).expressao()
+
+def analisa_declaracoes(fonte: str):
+    lexer = LexerTabela(fonte)
+    lexer.lex()
+    parser = Parser(lexer.tokens)
+    parser.parse()
+    
+    return parser.declaracoes
+
+class TabelaSimbolosTests(unittest.TestCase):
+    def teste_escopos_por_simbolo(self):
+        simbolos = Simbolos()
+        a, b = simbolos.interna("a"), simbolos.interna("b")
+        
+        tabela = TabelaSimbolos(simbolos)
+        tabela.inserir(a, TipoPrimitivo.INT)
+        tabela.novo_escopo()
+        tabela.inserir(a, TipoPrimitivo.FLOAT)
+        
+        self.assertEqual(tabela.buscar(a), TipoPrimitivo.FLOAT)
+        
+        with self.assertRaisesRegex(Exception, "'a' já declarada"):
+            tabela.inserir(a, TipoPrimitivo.BOOL)
+        with self.assertRaisesRegex(Exception, "'b' não declarada"):
+            tabela.buscar(b)
+        
+        tabela.remover_escopo()
+        self.assertEqual(tabela.buscar(a), TipoPrimitivo.INT)
+    
+    def teste_escopos_aninhados(self):
+        simbolos = Simbolos()
+        a, b, c = simbolos.interna("a"), simbolos.interna("b"), simbolos.interna("c")
+        
+        tabela = TabelaSimbolos(simbolos)
+        tabela.inserir(b, TipoPrimitivo.STRING)
+        tabela.inserir(a, TipoPrimitivo.INT)
+        
+        for _ in range(1000):
+            tabela.novo_escopo()
+        
+        tabela.inserir(a, TipoPrimitivo.BOOL)
+        tabela.inserir(c, TipoPrimitivo.FLOAT)
+        
+        self.assertEqual(tabela.buscar(a), TipoPrimitivo.BOOL)
+        self.assertEqual(tabela.buscar(b), TipoPrimitivo.STRING)
+        self.assertEqual(tabela.escopos[0], {b: TipoPrimitivo.STRING, a: TipoPrimitivo.INT})
+        self.assertEqual(tabela.escopos[-1], {a: TipoPrimitivo.BOOL, c: TipoPrimitivo.FLOAT})
+        self.assertEqual(len(tabela.escopos), 1001)
+        
+        tabela.remover_escopo()
+        
+        self.assertEqual(tabela.buscar(a), TipoPrimitivo.INT)
+        self.assertEqual(tabela.escopos[-1], {})
+        
+        with self.assertRaisesRegex(Exception, "'c' não declarada"):
+            tabela.buscar(c)
+    
+    def teste_assinaturas(self):
+        simbolos = Simbolos()
+        f, x = simbolos.interna("f"), simbolos.interna("x")
+        assinatura = TipoFuncao((TipoPrimitivo.INT, TipoPrimitivo.FLOAT), TipoPrimitivo.BOOL)
+        
+        tabela = TabelaSimbolos(simbolos)
+        tabela.inserir(x, TipoPrimitivo.INT)
+        tabela.novo_escopo()
+        tabela.inserir_funcao(f, assinatura)
+        tabela.inserir_funcao(x, TipoFuncao((TipoPrimitivo.INT, TipoPrimitivo.FLOAT), TipoPrimitivo.INT))
+        
+        self.assertIs(tabela.assinatura(f), assinatura)
+        self.assertIs(tabela.buscar(f), TipoPrimitivo.BOOL)
+        # As tuplas de parametros iguais sao a mesma.
+        self.assertIs(tabela.assinatura(x).parametros, assinatura.parametros)
+        
+        tabela.remover_escopo()
+        
+        self.assertIsNone(tabela.assinatura(x))
+        self.assertEqual(tabela.assinaturas, {})
+
+class AnaliseSemanticaTests(unittest.TestCase):
+    def teste_mesmo_nome_mesmo_simbolo(self):
+        analisador = analisa("""
+            xerife x: float = 1.0;
+            procurado f(x: int): int { vorta x; }
+            x = 2.5;
+        """)
+        
+        simbolos = analisador.tabela_simbolos.simbolos
+        self.assertEqual(simbolos.nomes, ["x", "f"])
+        self.assertEqual(analisador.tabela_simbolos.escopos, [{0: TipoPrimitivo.FLOAT, 1: TipoPrimitivo.INT}])
+    
+    def teste_atribuicao_incompativel(self):
+        with self.assertRaisesRegex(Exception, "Atribuição incompatível"):
+            analisa('xerife x: float = 1.0; x = "texto";')
+    
+    def teste_chamadas(self):
+        funcoes = """
+            procurado f(a: int, b: float): float { vorta b + f(a, b); }
+            procurado g(): lista[int] { vorta [1]; }
+            xerife x: int = 1;
+        """
+        
+        analisa(funcoes + "atire f(x, 2.0); atire g(); { procurado x(s: string): int { vorta 1; } atire x(\"s\"); }")
+        
+        erros = [
+            ("atire f(1);", "A função 'f' espera 2 argumento\\(s\\), mas recebeu 1"),
+            ("atire f(1.0, 2.0);", r"Argumentos incompatíveis na chamada de 'f'. Esperado: \(TipoPrimitivo.INT, TipoPrimitivo.FLOAT\)"),
+            ("atire f(1, z);", "'z' não declarada"),
+            ("xerife y: int = f(1, 2.0);", "Tipo incompatível na declaração da variável 'y'"),
+            ("atire x(1);", "'x' não é uma função"),
+            ("atire h();", "'h' não declarada"),
+            ("atire (f)(1, 2.0);", "Só funções podem ser chamadas"),
+            # Fora do bloco, x volta a ser a variavel.
+            ("{ procurado x(): int { vorta 1; } } atire x();", "'x' não é uma função"),
+            ("procurado k(a: int): int { xerife f: int = a; vorta f(a); }", "'f' não é uma função"),
+        ]
+        
+        for fonte, erro in erros:
+            with self.subTest(fonte=fonte), self.assertRaisesRegex(Exception, erro):
+                analisa(funcoes + fonte)
+    
+    def teste_listas_compactas(self):
+        analisador = analisa("xerife l: lista[int] = [1, -2, 3]; xerife m: lista[float] = [0.5];")
+        
+        self.assertIs(analisador.visitar_expressao(analisa_expressao("[-1.0, 2.0]")), TipoLista(TipoPrimitivo.FLOAT))
+        
+        for fonte in ["[1, 2.0]", "[[1], [2]]"]:
+            with self.subTest(fonte=fonte), self.assertRaisesRegex(Exception, "Lista"):
+                analisador.visitar_expressao(analisa_expressao(fonte))
+        
+        with self.assertRaisesRegex(Exception, "Tipo incompatível na declaração da variável 'f'"):
+            analisa("xerife f: lista[float] = [1, 2];", arena = True)
+    
+    def teste_tipos_de_lista(self):
+        analisador = analisa("xerife l: lista[int] = [1, 2]; xerife m: lista[int] = l;")
+        
+        self.assertIs(analisador.visitar_expressao(analisa_expressao("[3]")), TipoLista(TipoPrimitivo.INT))
+        
+        with self.assertRaisesRegex(Exception, "Operação inválida para tipo TipoLista"):
+            analisa("xerife l: lista[int] = [1]; atire l - l;")
+    
+    def teste_visoes_da_arena(self):
+        fonte = """
+            xerife x: float = 1.0;
+            xerife l: lista[int] = [1, 2, 3];
+            procurado f(y: int, z: lista[int]): int { bang (y > 1) { vorta y; } miss vorta -y; }
+            cavalgando (x < 2.5) { x = x + 1.0; }
+        """
+        
+        self.assertEqual(
+            analisa(fonte, arena = True).tabela_simbolos.escopos,
+            analisa(fonte).tabela_simbolos.escopos,
+        )
+        
+        with self.assertRaisesRegex(Exception, "Atribuição incompatível"):
+            analisa('xerife x: float = 1.0; x = "texto";', arena = True)
+    
+    def teste_expressoes_compartilhadas(self):
+        fonte = """
+            xerife x: float = 1.0;
+            atire x * 2.0 - x;
+            { xerife x: int = 1; atire x < 2; }
+            atire x * 2.0 - x;
+        """
+        analisador = analisa(fonte, compartilhar = True)
+        
+        self.assertEqual(analisador.tabela_simbolos.escopos, analisa(fonte).tabela_simbolos.escopos)
+        self.assertIn(TipoPrimitivo.FLOAT, analisador.tipos.values())
+        self.assertEqual(len(analisador.tipos), len(analisador.compartilhados))
+        
+        # O x do bloco eh outro no, com o tipo da declaracao de dentro.
+        with self.assertRaisesRegex(Exception, "Tipos incompatíveis"):
+            analisa("xerife x: float = 1.0; atire x - 1.0; { xerife x: int = 1; atire x - 1.0; }", compartilhar = True)
+        
+        # Depois da funcao, x eh a funcao, e nao a variavel de fora.
+        with self.assertRaisesRegex(Exception, "Tipos incompatíveis"):
+            analisa("xerife x: float = 1.0; { atire x - 1.0; procurado x(y: float): int { } atire x - 1.0; }", compartilhar = True)
+
+# Resolve as declaracoes de fonte e retorna o resolvedor e as declaracoes.
+def resolve(fonte: str, classe_parser: type[Parser] = Parser):
+    lexer = LexerTabela(fonte)
+    lexer.lex()
+    
+    parser = classe_parser(lexer.tokens)
+    parser.parse()
+    
+    resolvedor = Resolvedor()
+    resolvedor.resolver(parser.declaracoes)
+    
+    return resolvedor, parser.declaracoes
+
+def coordenada(no) -> tuple[int, int]:
+    return (no.profundidade, no.slot)
+
+class ResolvedorTests(unittest.TestCase):
+    FONTE = """
+        xerife a: int = 1;
+        xerife b: float = 2.0;
+        procurado f(x: int, a: float): float {
+            xerife c: float = a + b;
+            { xerife a: int = x; a = c; b = z; }
+            vorta f(x, a);
+        }
+        atire a;
+    """
+    
+    def teste_coordenadas(self):
+        resolvedor, (a, b, f, atire) = resolve(self.FONTE)
+        c, bloco, retorno = f.corpo
+        declaracao_a, atribuicao_a, atribuicao_b = bloco.statements
+        
+        self.assertEqual([coordenada(no) for no in [a, b, f]], [(0, 0), (0, 1), (0, 2)])
+        self.assertEqual([coordenada(parametro) for parametro in f.params], [(1, 0), (1, 1)])
+        self.assertEqual(coordenada(c), (1, 2))
+        self.assertEqual(coordenada(c.inicializador.esquerda), (1, 1))
+        self.assertEqual(coordenada(c.inicializador.direita), (0, 1))
+        self.assertEqual(coordenada(declaracao_a), (2, 0))
+        self.assertEqual(coordenada(declaracao_a.inicializador), (1, 0))
+        self.assertEqual(coordenada(atribuicao_a.expressao), (2, 0))
+        self.assertEqual(coordenada(atribuicao_a.expressao.valor), (1, 2))
+        self.assertEqual(coordenada(atribuicao_b.expressao), (0, 1))
+        self.assertEqual(coordenada(atribuicao_b.expressao.valor), NAO_DECLARADA)
+        self.assertEqual(coordenada(retorno.valor.chamado), (0, 2))
+        self.assertEqual([coordenada(argumento) for argumento in retorno.valor.argumentos], [(1, 0), (1, 1)])
+        self.assertEqual(coordenada(atire.expressao), (0, 0))
+        
+        self.assertEqual((resolvedor.total_slots_globais, f.total_slots, bloco.total_slots), (3, 3, 1))
+    
+    def teste_o_inicializador_ve_a_declaracao_de_fora(self):
+        _, (a, bloco) = resolve("xerife a: int = 1; { xerife a: int = a; }")
+        
+        self.assertEqual(coordenada(bloco.statements[0]), (1, 0))
+        self.assertEqual(coordenada(bloco.statements[0].inicializador), (0, 0))
+    
+    def teste_nos_compartilhados(self):
+        fonte = self.FONTE + "{ atire a + b; { atire a + b; xerife a: int = 2; atire a + b; } }"
+        _, declaracoes = resolve(fonte)
+        _, compartilhadas = resolve(fonte, ParserCompartilhado)
+        
+        *_, bloco = declaracoes
+        *_, bloco_compartilhado = compartilhadas
+        soma, interno = bloco.statements
+        soma_compartilhada, interno_compartilhado = bloco_compartilhado.statements
+        
+        self.assertIs(soma_compartilhada.expressao, interno_compartilhado.statements[0].expressao)
+        
+        for esperado, obtido in [
+            (soma, soma_compartilhada),
+            (interno.statements[0], interno_compartilhado.statements[0]),
+            (interno.statements[2], interno_compartilhado.statements[2]),
+        ]:
+            self.assertEqual(coordenada(esperado.expressao.esquerda), coordenada(obtido.expressao.esquerda))
+            self.assertEqual(coordenada(esperado.expressao.direita), coordenada(obtido.expressao.direita))
+        
+        self.assertEqual(coordenada(interno_compartilhado.statements[2].expressao.esquerda), (2, 0))
+    
+    def teste_blocos_profundos(self):
+        n = 5000
+        resolvedor, (bloco,) = resolve("{" * n + "xerife a: int = 1; a = 2;" + "}" * n, ParserIterativo)
+        
+        for _ in range(n - 1):
+            self.assertEqual(bloco.total_slots, 0)
+            bloco = bloco.statements[0]
+        
+        declaracao, atribuicao = bloco.statements
+        
+        self.assertEqual(coordenada(declaracao), (n, 0))
+        self.assertEqual(coordenada(atribuicao.expressao), (n, 0))
+        self.assertEqual(bloco.total_slots, 1)
+        self.assertEqual(resolvedor.declarados, [[]])
+
+class AnaliseParalelaTests(unittest.TestCase):
+    FONTE = """
+        xerife a: int = 1;
+        procurado f(x: int): float { vorta x + a; }
+        xerife b: float = 2.0;
+        procurado g(y: float): float { bang (y < b) { vorta f(1); } vorta y; }
+        atire g(b);
+        procurado h(): int { vorta 1; }
+    """
+    
+    # Analisa fonte com a AnaliseParalela, com dois processos mesmo para poucas funcoes.
+    def analisa(self, fonte: str) -> AnaliseParalela:
+        lexer = LexerTabela(fonte)
+        lexer.lex()
+        parser = Parser(lexer.tokens)
+        parser.parse()
+        
+        analisador = AnaliseParalela(lexer.simbolos, trabalhadores = 2, minimo_funcoes = 1)
+        
+        try:
+            analisador.analisar(parser.declaracoes)
+        except Exception:
+            pass
+        
+        return analisador
+    
+    def teste_mesmo_resultado(self):
+        analisador = self.analisa(self.FONTE)
+        
+        self.assertEqual(analisador.erros, [])
+        self.assertEqual(analisador.tabela_simbolos.escopos, analisa(self.FONTE).tabela_simbolos.escopos)
+    
+    def teste_erros_na_ordem_do_codigo(self):
+        fonte = """
+            procurado f(): int { vorta "texto"; }
+            procurado g(): int { vorta 1; }
+            procurado h(): int { vorta z; }
+            xerife a: int = 1.0;
+            procurado k(): int { vorta 2.0; }
+        """
+        analisador = self.analisa(fonte)
+        
+        self.assertEqual([str(erro).split(".")[0] for erro in analisador.erros], [
+            "Erro: Tipo de retorno incompatível",
+            "Erro: Variável 'z' não declarada",
+            "Erro: Tipo incompatível na declaração da variável 'a'",
+        ])
+        
+        with self.assertRaisesRegex(Exception, "Tipo de retorno incompatível"):
+            AnaliseParalela(Simbolos()).analisar(analisa_declaracoes(fonte))
+    
+    def teste_funcao_so_ve_as_globais_de_antes(self):
+        analisador = self.analisa("procurado f(): int { vorta g; } xerife g: int = 1; procurado h(): int { vorta g; }")
+        
+        self.assertEqual([str(erro) for erro in analisador.erros], ["Erro: Variável 'g' não declarada."])
+    
+    def teste_bloco_global_nao_declara_globais(self):
+        analisador = self.analisa("bang (1 < 2) { xerife a: int = 1; } procurado f(): int { vorta a; }")
+        
+        self.assertEqual([str(erro) for erro in analisador.erros], ["Erro: Variável 'a' não declarada."])
+
+class AnaliseIncrementalTests(unittest.TestCase):
+    NOMES = ["a", "b", "f", "g"]
+    TIPOS = ["int", "float"]
+    
+    def expressao(self, aleatorio: random.Random, nomes: list[str]) -> str:
+        nome = aleatorio.choice(nomes)
+        
+        argumentos = ", ".join(aleatorio.choices(["1", "1.0"], k=aleatorio.randint(0, 2)))
+        
+        return aleatorio.choice(["1", "1.0", nome, f"{nome} + 1.0", f"{nome}({argumentos})", f"-{nome}"])
+    
+    # Uma declaracao do nivel mais externo que le e declara alguns nomes globais.
+    def declaracao(self, aleatorio: random.Random) -> str:
+        nome, tipo = aleatorio.choice(self.NOMES), aleatorio.choice(self.TIPOS)
+        
+        return aleatorio.choice([
+            lambda: f"xerife {nome}: {tipo} = {self.expressao(aleatorio, self.NOMES)};",
+            lambda: f"procurado {nome}(p: {aleatorio.choice(self.TIPOS)}): {tipo} {{ vorta {self.expressao(aleatorio, self.NOMES + ['p'])}; }}",
+            lambda: f"procurado {nome}(): {tipo} {{ vorta {self.expressao(aleatorio, self.NOMES)}; }}",
+            lambda: f"atire {self.expressao(aleatorio, self.NOMES)};",
+            lambda: f"{nome} = {self.expressao(aleatorio, self.NOMES)};",
+        ])()
+    
+    def parse(self, fonte: str, simbolos: Simbolos, anterior = None) -> ParserIncremental:
+        lexer = LexerTabela(fonte, simbolos)
+        lexer.lex()
+        parser = ParserIncremental(lexer.tokens, anterior)
+        parser.parse()
+        
+        return parser
+    
+    # Os erros e o escopo global depois de analisar as declaracoes.
+    def resultado(self, analisador: AnaliseIncremental, declaracoes: list) -> tuple[list[str], list]:
+        try:
+            analisador.analisar(declaracoes)
+        except Exception:
+            pass
+        
+        return [str(erro) for erro in analisador.erros], analisador.tabela_simbolos.escopos
+    
+    def teste_reanalisa_so_o_que_mudou(self):
+        simbolos = Simbolos()
+        fonte = """
+            xerife a: int = 1;
+            procurado f(p: int): int { vorta a; }
+            procurado g(p: int): float { vorta p + 1; }
+            atire f(1);
+        """
+        analisador = AnaliseIncremental(simbolos)
+        parser = self.parse(fonte, simbolos)
+        analisador.analisar(parser.declaracoes)
+        
+        self.assertEqual(analisador.reanalisadas, 4)
+        # A declaracao de a depende de a nao estar declarado antes.
+        self.assertEqual(analisador.dependentes(simbolos.interna("a")), parser.declaracoes[:2])
+        
+        # Mudar o corpo de g so reanalisa g.
+        fonte = fonte.replace("p + 1", "p + 2")
+        parser = self.parse(fonte, simbolos, parser)
+        analisador.analisar(parser.declaracoes)
+        
+        self.assertEqual((analisador.reaproveitadas, analisador.reanalisadas), (3, 1))
+        
+        # Mudar o tipo de a reanalisa a e f, que le a, mas nao g nem o atire, que so le f.
+        parser = self.parse(fonte.replace("a: int = 1", "a: float = 1.0"), simbolos, parser)
+        
+        with self.assertRaisesRegex(Exception, "Tipo de retorno incompatível"):
+            analisador.analisar(parser.declaracoes)
+        
+        self.assertEqual((analisador.reaproveitadas, analisador.reanalisadas), (2, 2))
+        self.assertEqual(len(analisador.erros), 1)
+    
+    def teste_linha_duplicada(self):
+        simbolos = Simbolos()
+        fonte = "xerife a: int = 1;\natire a;\n"
+        analisador = AnaliseIncremental(simbolos)
+        parser = self.parse(fonte, simbolos)
+        analisador.analisar(parser.declaracoes)
+        
+        # A segunda copia de 'atire a;' eh analisada de novo, como um objeto novo.
+        parser = self.parse(fonte + "atire a;\n", simbolos, parser)
+        analisador.analisar(parser.declaracoes)
+        
+        self.assertEqual((analisador.reaproveitadas, analisador.reanalisadas), (2, 1))
+        self.assertEqual(len(analisador.resultados), 3)
+        
+        # Duplicando a declaracao de a, o parser reaproveita a segunda copia (a
+        # primeira tem outro token depois), que agora depende de a ja declarado.
+        parser = self.parse("xerife a: int = 1;\n" + fonte + "atire a;\n", simbolos, parser)
+        
+        with self.assertRaisesRegex(Exception, "já declarada"):
+            analisador.analisar(parser.declaracoes)
+        
+        self.assertEqual((analisador.reaproveitadas, analisador.reanalisadas), (2, 2))
+        self.assertEqual(len(analisador.erros), 1)
+        
+        with self.assertRaises(ValueError):
+            analisador.analisar(parser.declaracoes[:1] * 2)
+    
+    def teste_igual_a_analise_completa_em_edicoes_aleatorias(self):
+        aleatorio = random.Random(23)
+        
+        for _ in range(60):
+            simbolos = Simbolos()
+            declaracoes = [self.declaracao(aleatorio) for _ in range(aleatorio.randint(1, 8))]
+            analisador = AnaliseIncremental(simbolos)
+            parser = None
+            
+            for _ in range(8):
+                posicao = aleatorio.randint(0, len(declaracoes))
+                edicao = aleatorio.choice(["troca", "insere", "remove"])
+                
+                if edicao == "insere" or not declaracoes:
+                    declaracoes.insert(posicao, self.declaracao(aleatorio))
+                elif edicao == "troca":
+                    declaracoes[min(posicao, len(declaracoes) - 1)] = self.declaracao(aleatorio)
+                else:
+                    del declaracoes[min(posicao, len(declaracoes) - 1)]
+                
+                fonte = "\n".join(declaracoes) + "\n"
+                parser = self.parse(fonte, simbolos, parser)
+                
+                with self.subTest(fonte=fonte):
+                    obtido = self.resultado(analisador, parser.declaracoes)
+                    
+                    self.assertEqual(obtido, self.resultado(AnaliseIncremental(simbolos), parser.declaracoes))
+                    
+                    # O primeiro erro eh o da analise completa.
+                    try:
+                        AnaliseSemantica(simbolos).analisar(parser.declaracoes)
+                        esperado = None
+                    except Exception as e:
+                        esperado = str(e)
+                    
+                    self.assertEqual(obtido[0][0] if obtido[0] else None, esperado)
@@ -1,74 +1,170 @@
 from arvores_sintaticas.declaracao import *
 from arvores_sintaticas.expressao import *
+from arvores_sintaticas.visitante import Visitante
 from lexer.lex_token import TokenType
+from lexer.simbolos import Simbolos
+from typing import Optional
 
+# Os nomes sao guardados pelo seu simbolo (veja lexer.simbolos), e so
+# convertidos de volta para texto nas mensagens de erro.
+#
+# Cada simbolo tem uma pilha com as suas declaracoes visiveis, a mais interna
+# no topo, como (nivel do escopo, tipo); buscar so olha o topo, qualquer que seja
+# a profundidade dos escopos. Cada escopo aberto guarda os simbolos declarados
+# nele, na ordem, e remover_escopo desempilha so as declaracoes deles.
+#
+# Na pilha, uma funcao tem o tipo de retorno. A assinatura dela fica em
+# assinaturas, pela declaracao (simbolo e nivel do escopo), e sai quando o
+# escopo da funcao fecha; a pilha funcoes guarda essas chaves na ordem.
 class TabelaSimbolos:
-    def __init__(self):
-        self.escopos = [{}]  # Uma pilha de dicionários.
+    def __init__(self, simbolos: Simbolos):
+        self.simbolos = simbolos
+        self.declaracoes: dict[int, list[tuple[int, Tipo]]] = {}
+        self.declarados: list[list[int]] = [[]]  # Os simbolos de cada escopo aberto.
+        self.assinaturas: dict[tuple[int, int], TipoFuncao] = {}
+        self.funcoes: list[tuple[int, int]] = []
     
-    def inserir(self, nome: str, tipo: Tipo):
-        if nome in self.escopos[-1]:
-            raise Exception(f"Erro: Variável '{nome}' já declarada neste escopo.")
-        self.escopos[-1][nome] = tipo
+    def inserir(self, simbolo: int, tipo: Tipo):
+        pilha = self.declaracoes.get(simbolo)
+        nivel = len(self.declarados) - 1
+        
+        if pilha is None:
+            self.declaracoes[simbolo] = [(nivel, tipo)]
+        elif pilha[-1][0] == nivel:
+            raise Exception(f"Erro: Variável '{self.simbolos.nome(simbolo)}' já declarada neste escopo.")
+        else:
+            pilha.append((nivel, tipo))
+        
+        self.declarados[-1].append(simbolo)
+
+    def inserir_funcao(self, simbolo: int, assinatura: TipoFuncao):
+        self.inserir(simbolo, assinatura.retorno)
+        
+        chave = (simbolo, len(self.declarados) - 1)
+        self.assinaturas[chave] = assinatura
+        self.funcoes.append(chave)
+
+    # A assinatura da funcao visivel com esse nome, ou None se o nome eh de uma variavel.
+    def assinatura(self, simbolo: int) -> Optional[TipoFuncao]:
+        pilha = self.declaracoes.get(simbolo)
+        
+        if pilha is None:
+            raise Exception(f"Erro: Variável '{self.simbolos.nome(simbolo)}' não declarada.")
+        
+        return self.assinaturas.get((simbolo, pilha[-1][0])) if self.assinaturas else None
+
+    # O que a declaracao visivel do nome declara: a assinatura, se for uma
+    # funcao, ou o tipo. inserir_ligacao declara outro nome igual.
+    def ligacao(self, simbolo: int) -> Tipo | TipoFuncao:
+        return self.assinatura(simbolo) or self.buscar(simbolo)
+
+    def inserir_ligacao(self, simbolo: int, ligacao: Tipo | TipoFuncao):
+        if isinstance(ligacao, TipoFuncao):
+            self.inserir_funcao(simbolo, ligacao)
+        else:
+            self.inserir(simbolo, ligacao)
 
-    def buscar(self, nome: str) -> Tipo:
-        for escopo in reversed(self.escopos):
-            if nome in escopo:
-                return escopo[nome]
-        raise Exception(f"Erro: Variável '{nome}' não declarada.")
+    def buscar(self, simbolo: int) -> Tipo:
+        pilha = self.declaracoes.get(simbolo)
+        
+        if pilha is None:
+            raise Exception(f"Erro: Variável '{self.simbolos.nome(simbolo)}' não declarada.")
+        
+        return pilha[-1][1]
 
     def novo_escopo(self):
-        self.escopos.append({})
+        self.declarados.append([])
 
     def remover_escopo(self):
-        self.escopos.pop()
+        declaracoes = self.declaracoes
+        nivel = len(self.declarados) - 1
+        
+        for simbolo in self.declarados.pop():
+            pilha = declaracoes[simbolo]
+            pilha.pop()
+            
+            if not pilha:
+                del declaracoes[simbolo]
+        
+        funcoes = self.funcoes
+        
+        while funcoes and funcoes[-1][1] == nivel:
+            del self.assinaturas[funcoes.pop()]
+    
+    # Copia dos escopos abertos, do mais externo ao mais interno, cada um com
+    # o tipo de cada simbolo declarado nele, na ordem das declaracoes.
+    @property
+    def escopos(self) -> list[dict[int, Tipo]]:
+        escopos: list[dict[int, Tipo]] = []
+        
+        for nivel, simbolos in enumerate(self.declarados):
+            escopo = {}
+            
+            for simbolo in simbolos:
+                escopo[simbolo] = next(tipo for n, tipo in self.declaracoes[simbolo] if n == nivel)
+            
+            escopos.append(escopo)
+        
+        return escopos
+
+# O tipo de uma ListaCompacta pelo codigo do array dela.
+TIPOS_LISTAS_COMPACTAS: dict[str, TipoLista] = {
+    'q': TipoLista(TipoPrimitivo.INT),
+    'd': TipoLista(TipoPrimitivo.FLOAT),
+}
 
-class AnaliseSemantica:
-    def __init__(self):
-        self.tabela_simbolos = TabelaSimbolos()
+# Os tipos dos parametros e o de retorno da funcao, como uma assinatura so.
+def assinatura(funcao: Funcao) -> TipoFuncao:
+    return TipoFuncao(tuple([parametro.tipo for parametro in funcao.params]), funcao.tipo_retorno)
+
+# Cada no eh visitado pelo metodo visitar_<classe> dele, escolhido pela tabela
+# do Visitante (veja arvores_sintaticas.visitante).
+class AnaliseSemantica(Visitante):
+    def __init__(self, simbolos: Simbolos):
+        self.tabela_simbolos = TabelaSimbolos(simbolos)
         self.tipo_retorno_atual = None
+        # Expressoes que aparecem em mais de um lugar da arvore (veja
+        # arvores_sintaticas.compartilhamento) e o tipo ja calculado delas.
+        self.compartilhados: set[Expressao] = set()
+        self.tipos: dict[Expressao, Tipo] = {}
 
     def analisar(self, declaracoes: list[Declaracao]):
         for declaracao in declaracoes:
             #try:
-            self.visitar_declaracao(declaracao)
+            self.visitar(declaracao)
             """ except Exception as e:
                 print("\033[91mErro na analise semantica:\033[0m")
                 print(e)
                 exit(1) """
 
     def visitar_declaracao(self, declaracao: Declaracao):
-        if isinstance(declaracao, Var):
-            self.visitar_var(declaracao)
-        elif isinstance(declaracao, Funcao):
-            self.visitar_funcao(declaracao)
-        elif isinstance(declaracao, Bloco):
-            self.visitar_bloco(declaracao)
-        elif isinstance(declaracao, If):
-            self.visitar_if(declaracao)
-        elif isinstance(declaracao, While):
-            self.visitar_while(declaracao)
-        elif isinstance(declaracao, Return):
-            self.visitar_return(declaracao)
-        elif isinstance(declaracao, Print):
-            self.visitar_print(declaracao)
-        elif isinstance(declaracao, Expr):
-            self.visitar_expressao(declaracao.expressao)
-        else:
-            raise Exception(f"Tipo de declaracao desconhecido: {type(declaracao)}")
+        self.visitar(declaracao)
+
+    def desconhecido(self, no):
+        if isinstance(no, Declaracao):
+            raise Exception(f"Tipo de declaracao desconhecido: {type(no)}")
+        
+        raise Exception(f"Expressão desconhecida: {type(no).__name__}")
+
+    def visitar_expr(self, expr: Expr):
+        self.visitar_expressao(expr.expressao)
 
     def visitar_var(self, var: Var):
         # Verificar o tipo do inicializador.
         if var.inicializador:
             tipo_inicializador = self.visitar_expressao(var.inicializador)
             
-            if tipo_inicializador != var.tipo:
+            if tipo_inicializador is not var.tipo:
                 raise Exception(f"Erro: Tipo incompatível na declaração da variável '{var.nome.lexema}'. "
                                 f"Esperado: {var.tipo}, encontrado: {tipo_inicializador}")
-        self.tabela_simbolos.inserir(var.nome.lexema, var.tipo)
+        self.tabela_simbolos.inserir(var.simbolo, var.tipo)
 
     def visitar_funcao(self, funcao: Funcao):
-        self.tabela_simbolos.inserir(funcao.nome.lexema, funcao.tipo_retorno)
+        self.tabela_simbolos.inserir_funcao(funcao.simbolo, assinatura(funcao))
+        self.visitar_corpo(funcao)
+    
+    # Os parametros e o corpo de uma funcao ja declarada, num escopo novo.
+    def visitar_corpo(self, funcao: Funcao):
         self.tabela_simbolos.novo_escopo()
 
         # Definir o tipo de retorno atual
@@ -76,9 +172,9 @@ class AnaliseSemantica:
         self.tipo_retorno_atual = funcao.tipo_retorno
 
         for parametro in funcao.params:
-            self.tabela_simbolos.inserir(parametro.nome.lexema, parametro.tipo)
+            self.tabela_simbolos.inserir(parametro.simbolo, parametro.tipo)
         for declaracao in funcao.corpo:
-            self.visitar_declaracao(declaracao)
+            self.visitar(declaracao)
 
         # Restaurar o tipo de retorno ao final
         self.tipo_retorno_atual = tipo_retorno_anterior
@@ -87,24 +183,24 @@ class AnaliseSemantica:
     def visitar_bloco(self, bloco: Bloco):
         self.tabela_simbolos.novo_escopo()
         for declaracao in bloco.statements:
-            self.visitar_declaracao(declaracao)
+            self.visitar(declaracao)
         self.tabela_simbolos.remover_escopo()
 
     def visitar_if(self, if_stmt: If):
         tipo_condicao = self.visitar_expressao(if_stmt.condicao)
-        if tipo_condicao != TipoPrimitivo.BOOL:
+        if tipo_condicao is not TipoPrimitivo.BOOL:
             raise Exception("Erro: A condição de um 'if' deve ser do tipo BOOL.")
-        self.visitar_declaracao(if_stmt.then_branch)
+        self.visitar(if_stmt.then_branch)
         if if_stmt.else_branch:
-            self.visitar_declaracao(if_stmt.else_branch)
+            self.visitar(if_stmt.else_branch)
 
     def visitar_while(self, while_stmt: While):
         tipo_condicao = self.visitar_expressao(while_stmt.condicao)
-        if tipo_condicao != TipoPrimitivo.BOOL:
+        if tipo_condicao is not TipoPrimitivo.BOOL:
             raise Exception("Erro: A condição de um 'while' deve ser do tipo BOOL.")
         
         if while_stmt.corpo is not None:
-            self.visitar_declaracao(while_stmt.corpo)
+            self.visitar(while_stmt.corpo)
 
     def visitar_return(self, retorno: Return):
         assert self.tipo_retorno_atual is not None
@@ -114,13 +210,13 @@ class AnaliseSemantica:
             tipo_valor = self.visitar_expressao(retorno.valor)
             
             # Verificar compatibilidade
-            if tipo_valor != self.tipo_retorno_atual:
+            if tipo_valor is not self.tipo_retorno_atual:
                 raise Exception(
                     f"Erro: Tipo de retorno incompatível. Esperado: {self.tipo_retorno_atual}, encontrado: {tipo_valor}."
                 )
         else:
             # Caso seja um 'return;' sem valor, o tipo esperado deve ser NULL
-            if self.tipo_retorno_atual != TipoPrimitivo.NULL:
+            if self.tipo_retorno_atual is not TipoPrimitivo.NULL:
                 raise Exception(
                     "Erro: Retorno vazio em uma função que espera um valor."
                 )
@@ -129,26 +225,15 @@ class AnaliseSemantica:
         self.visitar_expressao(print_stmt.expressao)
 
     def visitar_expressao(self, expressao: Expressao) -> Tipo:
-        if isinstance(expressao, Literal):
-            return self.visitar_literal(expressao)
-        elif isinstance(expressao, Variavel):
-            return self.visitar_variavel(expressao)
-        elif isinstance(expressao, Binaria):
-            return self.visitar_binaria(expressao)
-        elif isinstance(expressao, Unaria):
-            return self.visitar_unaria(expressao)
-        elif isinstance(expressao, Logica):
-            return self.visitar_logica(expressao)
-        elif isinstance(expressao, Lista):
-            return self.visitar_lista(expressao)
-        elif isinstance(expressao, Agrupamento):
-            return self.visitar_agrupamento(expressao)
-        elif isinstance(expressao, Atribuicao):
-            return self.visitar_atribuicao(expressao)
-        elif isinstance(expressao, Chamada):
-            return self.visitar_chamada(expressao)
-        else:
-            raise Exception(f"Expressão desconhecida: {type(expressao).__name__}")
+        if self.compartilhados and expressao in self.compartilhados:
+            tipo = self.tipos.get(expressao)
+            
+            if tipo is None:
+                tipo = self.tipos[expressao] = self.visitar(expressao)
+            
+            return tipo
+        
+        return self.visitar(expressao)
 
     def visitar_literal(self, literal: Literal) -> Tipo:
         # Retorna o tipo literal correspondente
@@ -167,7 +252,7 @@ class AnaliseSemantica:
 
     def visitar_variavel(self, variavel: Variavel) -> Tipo:
         # Busca o tipo da variável na tabela de símbolos
-        tipo = self.tabela_simbolos.buscar(variavel.nome.lexema)
+        tipo = self.tabela_simbolos.buscar(variavel.simbolo)
         if tipo is None:
             raise Exception(f"Erro: Variável '{variavel.nome.lexema}' não declarada.")
         return tipo
@@ -176,7 +261,7 @@ class AnaliseSemantica:
         tipo_esquerda = self.visitar_expressao(binaria.esquerda)
         tipo_direita = self.visitar_expressao(binaria.direita)
         
-        if tipo_esquerda != tipo_direita:
+        if tipo_esquerda is not tipo_direita:
             raise Exception(f"Erro: Tipos incompatíveis na operação binária: {tipo_esquerda} e {tipo_direita}.")
         
         # Exemplo simplificado: as operações aritméticas retornam o mesmo tipo
@@ -190,7 +275,7 @@ class AnaliseSemantica:
                 TokenType.AND,
                 TokenType.OR,
             }:
-            if tipo_esquerda != TipoPrimitivo.BOOL:
+            if tipo_esquerda is not TipoPrimitivo.BOOL:
                 raise Exception("Erro: Operação lógica requer operandos do tipo BOOL.")
             return TipoPrimitivo.BOOL
         
@@ -202,7 +287,7 @@ class AnaliseSemantica:
             TokenType.DIFERENTE, 
             TokenType.IGUAL_IGUAL
         }: 
-            if tipo_esquerda != TipoPrimitivo.INT and tipo_esquerda != TipoPrimitivo.FLOAT:
+            if tipo_esquerda is not TipoPrimitivo.INT and tipo_esquerda is not TipoPrimitivo.FLOAT:
                 raise Exception("Erro: Comparacoes requerem operandos numericos.")
             return TipoPrimitivo.BOOL
         
@@ -219,7 +304,7 @@ class AnaliseSemantica:
         
         # Exemplo: operador '!' só é válido para BOOL
         if unaria.operador.tipo == TokenType.EXCLAMACAO:
-            if tipo_direita != TipoPrimitivo.BOOL:
+            if tipo_direita is not TipoPrimitivo.BOOL:
                 raise Exception(f"Erro: Operador '!' inválido para tipo {tipo_direita}.")
             return TipoPrimitivo.BOOL
         
@@ -229,7 +314,7 @@ class AnaliseSemantica:
         tipo_esquerda = self.visitar_expressao(logica.esquerda)
         tipo_direita = self.visitar_expressao(logica.direita)
         
-        if tipo_esquerda != TipoPrimitivo.BOOL or tipo_direita != TipoPrimitivo.BOOL:
+        if tipo_esquerda is not TipoPrimitivo.BOOL or tipo_direita is not TipoPrimitivo.BOOL:
             raise Exception("Erro: Operação lógica requer operandos do tipo BOOL.")
         
         return TipoPrimitivo.BOOL
@@ -240,7 +325,7 @@ class AnaliseSemantica:
         # Garantir que todos os elementos têm o mesmo tipo
         primeiro_tipo = tipos_elementos[0] if tipos_elementos else TipoPrimitivo.NULL
         for tipo in tipos_elementos:
-            if tipo != primeiro_tipo:
+            if tipo is not primeiro_tipo:
                 raise Exception("Erro: Lista contem elementos de tipos diferentes.")
         
         if isinstance(primeiro_tipo, TipoLista):
@@ -248,21 +333,43 @@ class AnaliseSemantica:
         
         return TipoLista(primeiro_tipo)
 
+    # O tipo vem do codigo do array, sem olhar os elementos.
+    def visitar_listacompacta(self, lista: ListaCompacta) -> Tipo:
+        return TIPOS_LISTAS_COMPACTAS[lista.valores.typecode]
+
     def visitar_agrupamento(self, agrupamento: Agrupamento) -> Tipo:
         return self.visitar_expressao(agrupamento.expressao)
 
     def visitar_atribuicao(self, atribuicao: Atribuicao) -> Tipo:
         tipo_valor = self.visitar_expressao(atribuicao.valor)
-        tipo_variavel = self.visitar_variavel(self.tabela_simbolos.buscar(atribuicao.nome))
+        tipo_variavel = self.tabela_simbolos.buscar(atribuicao.simbolo)
         
-        if tipo_valor != tipo_variavel:
+        if tipo_valor is not tipo_variavel:
             raise Exception(f"Erro: Atribuição incompatível. Esperado: {tipo_variavel}, encontrado: {tipo_valor}.")
         
         return tipo_variavel
 
+    # Os tipos dos argumentos sao comparados com a tupla da assinatura de uma vez.
     def visitar_chamada(self, chamada: Chamada) -> Tipo:
-        tipo_funcao = self.visitar_expressao(chamada.chamado)
+        chamado = chamada.chamado
+        
+        if not isinstance(chamado, Variavel):
+            raise Exception("Erro: Só funções podem ser chamadas.")
         
-        # aqui, deveriam ser validados o numero e tipo dos argumentos, se a funcao existe...
+        assinatura = self.tabela_simbolos.assinatura(chamado.simbolo)
+        
+        if assinatura is None:
+            raise Exception(f"Erro: '{chamado.nome.lexema}' não é uma função.")
+        
+        tipos = tuple(map(self.visitar_expressao, chamada.argumentos))
+        
+        if tipos != assinatura.parametros:
+            if len(tipos) != len(assinatura.parametros):
+                raise Exception(f"Erro: A função '{chamado.nome.lexema}' espera {len(assinatura.parametros)} "
+                                f"argumento(s), mas recebeu {len(tipos)}.")
+            
+            raise Exception(f"Erro: Argumentos incompatíveis na chamada de '{chamado.nome.lexema}'. "
+                            f"Esperado: ({', '.join(map(str, assinatura.parametros))}), "
+                            f"encontrado: ({', '.join(map(str, tipos))}).")
         
-        return tipo_funcao
+        return assinatura.retorno
@@ -0,0 +1,314 @@
+from lexer.lex_token import Token
+from .expressao import *
+from .declaracao import *
+from array import array
+from typing import Callable, Optional
+
+# Arvore sintatica guardada em arrays paralelos, sem um objeto por no.
+#
+# Cada no eh um indice, e os campos de todos os nos ficam em arrays: o tipo do
+# no (um codigo por classe de Expressao, Declaracao ou Parametro), o indice do
+# token do no na lista de tokens (o operador de uma Binaria, o nome de uma Var,
+# ...) e o indice de uma constante numa tabela compartilhada (o valor e o tipo
+# de um Literal, o tipo de uma Var, ...), em que cada constante distinta aparece
+# uma vez so. Os filhos de cada no ficam seguidos num unico array de filhos, a
+# partir de inicios[no], ate inicios[no + 1]; um filho opcional ausente eh -1.
+#
+# Um no so eh adicionado depois dos seus filhos, entao os filhos sempre tem
+# indices menores que o pai. Os nos que o parser descarta (a Variavel do lado
+# esquerdo de uma atribuicao e os nos de declaracoes com erro) continuam nos
+# arrays, mas nenhuma raiz chega a eles.
+#
+# CAMPOS descreve, para cada classe, os argumentos do construtor dela (que tem
+# os mesmos nomes dos atributos) e onde cada um fica na arena. Com ele:
+#   - ConstrutorArena.no(classe, *argumentos) recebe os mesmos argumentos que a
+#     classe, com indices no lugar dos nos filhos, e eh o que o ParserArena usa;
+#   - de_objetos e para_objetos convertem entre a arena e as classes;
+#   - Arena.visao(no) retorna um objeto somente leitura de uma subclasse da
+#     classe do no, cujos atributos sao lidos da arena. A AnaliseSemantica (e
+#     qualquer codigo que use isinstance e os atributos) funciona com ela.
+
+# Onde cada argumento do construtor fica na arena.
+FILHO = 0           # um filho
+FILHO_OPCIONAL = 1  # um filho ou None (-1 na arena)
+FILHOS = 2          # lista de filhos, ate o fim dos filhos do no
+PARAMETROS = 3      # lista de filhos Parametro, antes de uma lista FILHOS
+TOKEN = 4           # o token do no
+CONSTANTE = 5       # parte da constante do no (uma tupla, com um item para cada CONSTANTE)
+
+CAMPOS: dict[type, tuple[tuple[str, int], ...]] = {
+    Atribuicao: (("nome", TOKEN), ("valor", FILHO)),
+    Binaria: (("esquerda", FILHO), ("operador", TOKEN), ("direita", FILHO)),
+    Unaria: (("operador", TOKEN), ("direita", FILHO)),
+    Logica: (("esquerda", FILHO), ("operador", TOKEN), ("direita", FILHO)),
+    Literal: (("valor", CONSTANTE), ("tipo", CONSTANTE)),
+    Lista: (("valores", FILHOS),),
+    ListaCompacta: (("valores", CONSTANTE),),
+    Chamada: (("chamado", FILHO), ("paren", TOKEN), ("argumentos", FILHOS)),
+    Agrupamento: (("expressao", FILHO),),
+    Variavel: (("nome", TOKEN),),
+    Bloco: (("statements", FILHOS),),
+    Expr: (("expressao", FILHO),),
+    If: (("condicao", FILHO), ("then_branch", FILHO), ("else_branch", FILHO_OPCIONAL)),
+    Print: (("expressao", FILHO),),
+    Return: (("token", TOKEN), ("valor", FILHO_OPCIONAL)),
+    Funcao: (("nome", TOKEN), ("params", PARAMETROS), ("corpo", FILHOS), ("tipo_retorno", CONSTANTE)),
+    Var: (("nome", TOKEN), ("inicializador", FILHO_OPCIONAL), ("tipo", CONSTANTE)),
+    While: (("condicao", FILHO), ("corpo", FILHO_OPCIONAL)),
+    Parametro: (("nome", TOKEN), ("tipo", CONSTANTE)),
+}
+
+# Codigo de cada classe no array de tipos, e o caminho de volta.
+CLASSES: list[type] = list(CAMPOS)
+CODIGOS: dict[type, int] = {classe: codigo for codigo, classe in enumerate(CLASSES)}
+
+# Onde fica cada argumento do construtor, pelo codigo da classe.
+_CAMPOS_CODIGO = [tuple(campo for _, campo in CAMPOS[classe]) for classe in CLASSES]
+
+PARAMETRO = CODIGOS[Parametro]
+VARIAVEL = CODIGOS[Variavel]
+
+# Chave de uma constante na tabela. O tipo do valor entra na chave para que
+# 1, 1.0 e True nao virem a mesma constante; um array (de uma ListaCompacta),
+# que nao tem hash, entra pelo codigo e pelos bytes.
+def chave_constante(constante: tuple) -> tuple:
+    return tuple(
+        (array, valor.typecode, valor.tobytes()) if type(valor) is array else (type(valor), valor)
+        for valor in constante
+    )
+
+class Arena:
+    def __init__(self, tokens: list[Token]) -> None:
+        self.tokens = tokens
+        self.tipos = array('B')
+        self.token = array('i')
+        self.constante = array('i')
+        self.inicios = array('I', [0])
+        self.filhos = array('i')
+        self.constantes: list[tuple] = []
+        # Declaracoes do nivel mais externo.
+        self.raizes = array('i')
+
+    def __len__(self) -> int:
+        return len(self.tipos)
+
+    def classe(self, no: int) -> type:
+        return CLASSES[self.tipos[no]]
+
+    def filhos_de(self, no: int) -> array:
+        return self.filhos[self.inicios[no]:self.inicios[no + 1]]
+
+    def visao(self, no: int):
+        if no == -1:
+            return None
+
+        visao = VISOES[self.tipos[no]].__new__(VISOES[self.tipos[no]])
+        visao.arena = self
+        visao.indice = no
+
+        return visao
+
+    # As declaracoes do nivel mais externo, como visoes.
+    def declaracoes(self) -> list[Declaracao]:
+        return [self.visao(raiz) for raiz in self.raizes]
+
+# Monta uma Arena no por no, sempre os filhos antes dos pais.
+class ConstrutorArena:
+    def __init__(self, tokens: list[Token]) -> None:
+        self.arena = Arena(tokens)
+        # Indice de cada token da lista, pela identidade do objeto.
+        self.indices_tokens = {id(token): i for i, token in enumerate(tokens)}
+        self.indices_constantes: dict[tuple, int] = {}
+
+    # Adiciona um no com os argumentos do construtor de classe, com os indices
+    # dos filhos no lugar dos nos, e retorna o indice dele.
+    def no(self, classe: type, *argumentos) -> int:
+        arena = self.arena
+        filhos = arena.filhos
+        codigo = CODIGOS[classe]
+        token = -1
+        constante = []
+
+        for argumento, campo in zip(argumentos, _CAMPOS_CODIGO[codigo]):
+            if campo == FILHO:
+                filhos.append(argumento)
+            elif campo == TOKEN:
+                token = self.indices_tokens[id(argumento)]
+            elif campo == CONSTANTE:
+                constante.append(argumento)
+            elif campo == FILHO_OPCIONAL:
+                filhos.append(-1 if argumento is None else argumento)
+            else:
+                # O corpo adiado do ParserPreguicoso eh analisado aqui.
+                filhos.extend(argumento() if callable(argumento) else argumento)
+
+        arena.tipos.append(codigo)
+        arena.token.append(token)
+        arena.constante.append(self.indice_constante(tuple(constante)) if constante else -1)
+        arena.inicios.append(len(filhos))
+
+        return len(arena.tipos) - 1
+
+    def indice_constante(self, constante: tuple) -> int:
+        chave = chave_constante(constante)
+        indice = self.indices_constantes.get(chave)
+
+        if indice is None:
+            indice = self.indices_constantes[chave] = len(self.arena.constantes)
+            self.arena.constantes.append(constante)
+
+        return indice
+
+    def termina(self, raizes: list[int]) -> Arena:
+        self.arena.raizes.extend(raizes)
+
+        return self.arena
+
+# Converte arvores de objetos numa Arena sobre tokens, que precisa ter os
+# mesmos objetos Token das arvores. Em pre-ordem, cada no vem antes dos seus
+# descendentes, entao de tras para frente ele vem depois deles: os nos sao
+# adicionados nessa ordem. Usa uma pilha explicita, entao a profundidade das
+# arvores nao tem limite.
+def de_objetos(declaracoes: list[Declaracao], tokens: list[Token]) -> Arena:
+    construtor = ConstrutorArena(tokens)
+    ordem = []
+    pilha = list(declaracoes)
+
+    while pilha:
+        objeto = pilha.pop()
+        ordem.append(objeto)
+
+        for nome, campo in CAMPOS[type(objeto)]:
+            if campo == FILHO or campo == FILHO_OPCIONAL:
+                filho = getattr(objeto, nome)
+
+                if filho is not None:
+                    pilha.append(filho)
+            elif campo == FILHOS or campo == PARAMETROS:
+                pilha.extend(getattr(objeto, nome))
+
+    indices: dict[int, int] = {}
+
+    for objeto in reversed(ordem):
+        argumentos = []
+
+        for nome, campo in CAMPOS[type(objeto)]:
+            valor = getattr(objeto, nome)
+
+            if campo == FILHO:
+                valor = indices[id(valor)]
+            elif campo == FILHO_OPCIONAL:
+                valor = None if valor is None else indices[id(valor)]
+            elif campo == FILHOS or campo == PARAMETROS:
+                valor = [indices[id(filho)] for filho in valor]
+
+            argumentos.append(valor)
+
+        indices[id(objeto)] = construtor.no(type(objeto), *argumentos)
+
+    return construtor.termina([indices[id(declaracao)] for declaracao in declaracoes])
+
+# Converte a arena de volta em objetos das classes da arvore, com os mesmos tokens.
+def para_objetos(arena: Arena) -> list[Declaracao]:
+    objetos: list = []
+    adiciona = objetos.append
+
+    for no in range(len(arena)):
+        adiciona(CLASSES[arena.tipos[no]](*argumentos(arena, no, objetos)))
+
+    return [objetos[raiz] for raiz in arena.raizes]
+
+# Argumentos do construtor da classe do no, com objetos[filho] no lugar de cada filho.
+def argumentos(arena: Arena, no: int, objetos: list) -> list:
+    filhos = arena.filhos
+    inicio, fim = arena.inicios[no], arena.inicios[no + 1]
+    constante = arena.constante[no]
+    constante = arena.constantes[constante] if constante != -1 else ()
+    resultado = []
+    adiciona = resultado.append
+    k = 0
+
+    for campo in _CAMPOS_CODIGO[arena.tipos[no]]:
+        if campo == FILHO:
+            adiciona(objetos[filhos[inicio]])
+            inicio += 1
+        elif campo == TOKEN:
+            adiciona(arena.tokens[arena.token[no]])
+        elif campo == CONSTANTE:
+            adiciona(constante[k])
+            k += 1
+        elif campo == FILHOS:
+            adiciona([objetos[filho] for filho in filhos[inicio:fim]])
+        elif campo == FILHO_OPCIONAL:
+            adiciona(None if filhos[inicio] == -1 else objetos[filhos[inicio]])
+            inicio += 1
+        else:
+            fim_parametros = inicio
+
+            while fim_parametros < fim and arena.tipos[filhos[fim_parametros]] == PARAMETRO:
+                fim_parametros += 1
+
+            adiciona([objetos[filho] for filho in filhos[inicio:fim_parametros]])
+            inicio = fim_parametros
+
+    return resultado
+
+# Funcao que le o atributo nome de um no da classe na arena. Os filhos voltam como visoes.
+def leitor(classe: type, nome: str) -> Callable[[Arena, int], object]:
+    deslocamento = 0      # filhos antes do campo
+    k = 0                 # itens da constante antes do campo
+    depois_de_parametros = False
+
+    for nome_campo, campo in CAMPOS[classe]:
+        if nome_campo == nome:
+            break
+
+        if campo == FILHO or campo == FILHO_OPCIONAL:
+            deslocamento += 1
+        elif campo == PARAMETROS:
+            depois_de_parametros = True
+        elif campo == CONSTANTE:
+            k += 1
+
+    if campo == FILHO or campo == FILHO_OPCIONAL:
+        return lambda arena, no: arena.visao(arena.filhos[arena.inicios[no] + deslocamento])
+
+    if campo == TOKEN:
+        return lambda arena, no: arena.tokens[arena.token[no]]
+
+    if campo == CONSTANTE:
+        return lambda arena, no: arena.constantes[arena.constante[no]][k]
+
+    def lista(arena: Arena, no: int) -> list:
+        filhos = arena.filhos
+        inicio, fim = arena.inicios[no] + deslocamento, arena.inicios[no + 1]
+        parametros = inicio
+
+        if campo == PARAMETROS or depois_de_parametros:
+            while parametros < fim and arena.tipos[filhos[parametros]] == PARAMETRO:
+                parametros += 1
+
+        if campo == PARAMETROS:
+            fim = parametros
+        else:
+            inicio = parametros
+
+        return [arena.visao(filho) for filho in filhos[inicio:fim]]
+
+    return lista
+
+# Subclasse somente leitura de classe cujos atributos sao lidos da arena.
+def cria_visao(classe: type) -> type:
+    atributos = {"__slots__": ("arena", "indice")}
+
+    for nome, _ in CAMPOS[classe]:
+        le = leitor(classe, nome)
+        atributos[nome] = property(lambda self, le = le: le(self.arena, self.indice))
+
+    if "simbolo" in classe.__slots__:
+        atributos["simbolo"] = property(lambda self: self.arena.tokens[self.arena.token[self.indice]].simbolo)
+
+    return type("Visao" + classe.__name__, (classe,), atributos)
+
+# Classe das visoes de cada codigo.
+VISOES: list[type] = [cria_visao(classe) for classe in CLASSES]
@@ -0,0 +1,126 @@
+from .expressao import *
+from .declaracao import Parametro, Var
+from typing import Hashable, Optional
+
+# Hash-consing das expressoes: uma fabrica de nos que devolve o mesmo objeto
+# para subarvores iguais.
+#
+# So sao compartilhadas as expressoes sem efeitos colaterais (literais,
+# variaveis, operadores, agrupamentos e listas delas, e listas compactas);
+# Atribuicao e Chamada sempre sao nos novos, e nenhuma expressao que as contenha
+# eh compartilhada.
+# A chave de um no eh a classe, os tokens que importam (o tipo do operador,
+# o valor do literal) e os filhos, que ja sao os objetos canonicos, entao uma
+# subarvore igual a outra ja existente nem chega a ser construida.
+#
+# Uma Variavel so eh igual a outra com o mesmo simbolo que se refere a mesma
+# declaracao: a fabrica acompanha os escopos como a AnaliseSemantica (o parser
+# avisa quando um bloco ou uma funcao abre e fecha) e da a cada declaracao (Var,
+# Parametro e o nome da Funcao) uma ligacao nova, desfeita quando o escopo
+# dela fecha. Assim o tipo de qualquer expressao compartilhada eh o mesmo em
+# todos os lugares onde ela aparece, e a AnaliseSemantica calcula esse tipo uma
+# vez so para os nos em compartilhados.
+#
+# Um no compartilhado guarda os tokens da primeira vez em que apareceu, entao
+# os erros nele apontam para essa posicao. A tabela de nos so eh necessaria
+# durante a analise sintatica, e termina() a descarta.
+
+class FabricaCompartilhada:
+    def __init__(self) -> None:
+        self.nos: dict[Hashable, Expressao] = {}
+        # Os ids dos nos da tabela, que continuam vivos enquanto estao nela.
+        self.ids: set[int] = set()
+        # Nos devolvidos mais de uma vez.
+        self.compartilhados: set[Expressao] = set()
+        self.pedidos = 0
+        self.construidos = 0
+        # A declaracao visivel de cada simbolo e, para cada escopo aberto, as
+        # ligacoes que ele trocou, com o valor anterior.
+        self.ligacoes: dict[int, int] = {}
+        self.desfazer: list[list[tuple[int, Optional[int]]]] = [[]]
+        self.proxima_ligacao = 1
+
+    def no(self, classe: type, *argumentos):
+        chave = self.chave(classe, argumentos)
+
+        if chave is None:
+            no = classe(*argumentos)
+
+            if classe is Var or classe is Parametro:
+                self.declara(no.simbolo)
+
+            return no
+
+        self.pedidos += 1
+        no = self.nos.get(chave)
+
+        if no is None:
+            no = self.nos[chave] = classe(*argumentos)
+            self.ids.add(id(no))
+            self.construidos += 1
+        else:
+            self.compartilhados.add(no)
+
+        return no
+
+    # A chave de hash-consing do no, ou None se ele nao pode ser compartilhado.
+    def chave(self, classe: type, argumentos: tuple) -> Optional[Hashable]:
+        if classe is Literal:
+            valor, tipo = argumentos
+            return (Literal, tipo, valor)
+
+        if classe is Variavel:
+            simbolo = argumentos[0].simbolo
+            return (Variavel, simbolo, self.ligacoes.get(simbolo, 0))
+
+        if classe is Binaria or classe is Logica:
+            esquerda, operador, direita = argumentos
+
+            if self.canonico(esquerda) and self.canonico(direita):
+                return (classe, id(esquerda), operador.tipo, id(direita))
+        elif classe is Unaria:
+            operador, direita = argumentos
+
+            if self.canonico(direita):
+                return (Unaria, operador.tipo, id(direita))
+        elif classe is Agrupamento:
+            if self.canonico(argumentos[0]):
+                return (Agrupamento, id(argumentos[0]))
+        elif classe is Lista:
+            valores = argumentos[0]
+
+            if all(self.canonico(valor) for valor in valores):
+                return (Lista, tuple(id(valor) for valor in valores))
+        elif classe is ListaCompacta:
+            valores = argumentos[0]
+            return (ListaCompacta, valores.typecode, valores.tobytes())
+
+        return None
+
+    # Se o no esta na tabela, isto eh, se ele e todos os seus filhos podem ser compartilhados.
+    def canonico(self, no: Expressao) -> bool:
+        return id(no) in self.ids
+
+    def declara(self, simbolo: int) -> None:
+        self.desfazer[-1].append((simbolo, self.ligacoes.get(simbolo)))
+        self.ligacoes[simbolo] = self.proxima_ligacao
+        self.proxima_ligacao += 1
+
+    def abre_escopo(self) -> None:
+        self.desfazer.append([])
+
+    def fecha_escopo(self) -> None:
+        for simbolo, anterior in reversed(self.desfazer.pop()):
+            if anterior is None:
+                del self.ligacoes[simbolo]
+            else:
+                self.ligacoes[simbolo] = anterior
+
+    # Descarta a tabela de nos; os nos construidos continuam na arvore.
+    def termina(self) -> None:
+        self.nos = {}
+        self.ids = set()
+
+    # Quantos nos foram pedidos para cada no construido.
+    def razao(self) -> float:
+        return self.pedidos / self.construidos if self.construidos else 1.0
@@ -1,8 +1,8 @@
 from lexer.lex_token import Token
 from .expressao import *
-from typing import Optional
+from typing import Callable, Optional
 from enum import Enum, auto
-from dataclasses import dataclass
+from dataclasses import dataclass, field, fields
 
 # TODO: Melhorar a representacao das declaracoes.
 
@@ -13,21 +13,72 @@ class TipoPrimitivo(Enum):
     BOOL = auto()
     NULL = auto()
     
-@dataclass
-class TipoLista:
+# Tipos formados por outros tipos, com uma instancia so para cada combinacao
+# de componentes: TipoLista(TipoPrimitivo.INT) sempre retorna o mesmo objeto.
+# Como os membros de TipoPrimitivo tambem sao unicos, dois tipos sao iguais
+# se e somente se sao o mesmo objeto, entao eles sao comparados com is e
+# servem de chave em dicionarios pela identidade.
+#
+# Uma subclasse eh uma dataclass(slots=True, eq=False) cujos campos, na ordem,
+# sao os componentes, passados por posicao. Eles precisam ser tipos (ou tuplas
+# de tipos), que ja sao canonicos, entao um tipo de funcao ou uma lista de
+# listas entram no mesmo esquema.
+class TipoComposto:
+    __slots__ = ()
+    
+    instancias: dict[tuple, "TipoComposto"] = {}
+    
+    def __new__(cls, *componentes):
+        chave = (cls, *componentes)
+        tipo = TipoComposto.instancias.get(chave)
+        
+        if tipo is None:
+            tipo = TipoComposto.instancias[chave] = super().__new__(cls)
+        
+        return tipo
+    
+    # Com pickle e copy, o tipo tambem volta a ser a instancia canonica.
+    def __reduce__(self):
+        return (type(self), tuple(getattr(self, campo.name) for campo in fields(self)))
+
+@dataclass(slots=True, eq=False)
+class TipoLista(TipoComposto):
     interno: TipoPrimitivo
     
 Tipo = TipoLista | TipoPrimitivo
 
-@dataclass(repr=True)
+# A assinatura de uma funcao: os tipos dos parametros, na ordem, e o de retorno.
+# A tupla dos parametros tambem eh compartilhada por todas as funcoes com os
+# mesmos tipos. Nao eh o tipo de nenhuma variavel: a TabelaSimbolos guarda as
+# assinaturas a parte (veja analise_semantica.validator).
+@dataclass(slots=True, eq=False)
+class TipoFuncao(TipoComposto):
+    parametros: tuple[Tipo, ...]
+    retorno: Tipo
+    
+    tuplas = {}  # A tupla canonica de cada combinacao de parametros.
+    
+    def __post_init__(self) -> None:
+        self.parametros = TipoFuncao.tuplas.setdefault(self.parametros, self.parametros)
+
+@dataclass(repr=True, slots=True)
 class Parametro:
     nome: Token
     tipo: Tipo
+    simbolo: int = field(init=False, repr=False, compare=False)
+    profundidade: int = field(init=False, repr=False, compare=False)
+    slot: int = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self) -> None:
+        self.simbolo = self.nome.simbolo
 
+# Como as expressoes, as declaracoes guardam os atributos em __slots__.
 class Declaracao:
-    pass
+    __slots__ = ()
 
 class Bloco(Declaracao):
+    __slots__ = ("statements", "total_slots")
+    
     def __init__(self, statements: list[Declaracao]) -> None:
         self.statements = statements
         
@@ -35,6 +86,8 @@ class Bloco(Declaracao):
         return f"Bloco(statements=[{', '.join(repr(stmt) for stmt in self.statements)}])"
 
 class Expr(Declaracao):
+    __slots__ = ("expressao",)
+    
     def __init__(self, expressao: Expressao) -> None:
        self.expressao = expressao
     
@@ -42,6 +95,8 @@ class Expr(Declaracao):
         return f"Expr(expressao={self.expressao.to_str()})"
 
 class If(Declaracao):
+    __slots__ = ("condicao", "then_branch", "else_branch")
+    
     def __init__(self, condicao: Expressao, then_branch: Declaracao, else_branch: Optional[Declaracao]):
         self.condicao = condicao
         self.then_branch = then_branch
@@ -54,6 +109,8 @@ class If(Declaracao):
                 f"else_branch={else_branch_repr})")
 
 class Print(Declaracao):
+    __slots__ = ("expressao",)
+    
     def __init__(self, expressao: Expressao) -> None:
        self.expressao = expressao
        
@@ -61,6 +118,8 @@ class Print(Declaracao):
         return f"Print(expressao={self.expressao.to_str()})"
 
 class Return(Declaracao):
+    __slots__ = ("token", "valor")
+    
     def __init__(self, token: Token, valor: Optional[Expressao]):
         self.token = token
         self.valor = valor
@@ -69,12 +128,38 @@ class Return(Declaracao):
         valor_repr = repr(self.valor) if self.valor else 'None'
         return f"Return(token={repr(self.token)}, valor={valor_repr})"
 
+# O corpo pode ser uma funcao que o analisa (ver parser/parser_preguicoso.py):
+# nesse caso, ele so eh analisado no primeiro acesso a corpo.
 class Funcao(Declaracao):
-    def __init__(self, nome: Token, params: list[Parametro], corpo: list[Declaracao], tipo_retorno: Tipo):
+    __slots__ = ("nome", "simbolo", "params", "corpo", "analisa_corpo", "tipo_retorno", "profundidade", "slot", "total_slots")
+    
+    def __init__(
+        self,
+        nome: Token,
+        params: list[Parametro],
+        corpo: list[Declaracao] | Callable[[], list[Declaracao]],
+        tipo_retorno: Tipo,
+    ):
         self.nome = nome
+        self.simbolo = nome.simbolo
         self.params = params
-        self.corpo = corpo
+        
+        if callable(corpo):
+            self.analisa_corpo = corpo
+        else:
+            self.corpo = corpo
+        
         self.tipo_retorno = tipo_retorno
+    
+    # So eh chamado enquanto corpo ainda nao existe. Sem analisa_corpo, o
+    # acesso a self.analisa_corpo tambem cai aqui e lanca AttributeError.
+    def __getattr__(self, nome: str):
+        if nome != "corpo":
+            raise AttributeError(nome)
+        
+        self.corpo = self.analisa_corpo()
+        del self.analisa_corpo
+        return self.corpo
         
     def __repr__(self):
         params_repr = ', '.join(repr(param) for param in self.params)
@@ -83,8 +168,11 @@ class Funcao(Declaracao):
                 f"corpo=[{corpo_repr}], tipo_retorno={repr(self.tipo_retorno)})")
 
 class Var(Declaracao):
+    __slots__ = ("nome", "simbolo", "inicializador", "tipo", "profundidade", "slot")
+    
     def __init__(self, nome: Token, inicializador: Optional[Expressao], tipo: Tipo) -> None:
        self.nome = nome
+       self.simbolo = nome.simbolo
        self.inicializador = inicializador
        self.tipo = tipo
        
@@ -93,6 +181,8 @@ class Var(Declaracao):
         return f"Var(nome={repr(self.nome)}, inicializador={inicializador_repr}, tipo={repr(self.tipo)})"
        
 class While(Declaracao):
+    __slots__ = ("condicao", "corpo")
+    
     def __init__(self, condicao: Expressao, corpo: Optional[Declaracao]) -> None:
         self.condicao = condicao
         self.corpo = corpo
@@ -1,11 +1,18 @@
 from __future__ import annotations
 from lexer.lex_token import Token, TokenType
+from array import array
 
 # Crafting Interpreters, Robert Nystrom - Cap. 5.
 
 TipoLiteral = int | float | str | bool | None
 
+# Os nos guardam os atributos em __slots__, sem um __dict__ por objeto.
+#
+# profundidade e slot, nas variaveis e declaracoes, e total_slots, nos blocos e
+# funcoes, so existem depois do Resolvedor (veja analise_semantica.resolvedor).
 class Expressao:
+    __slots__ = ()
+    
     # Como essa eh uma classe abstrata, esse metodo nunca deve ser usado diretamente.
     def to_str(self) -> str:
         return ""
@@ -22,14 +29,19 @@ class Expressao:
         return resultado
 
 class Atribuicao(Expressao):
+    __slots__ = ("nome", "simbolo", "valor", "profundidade", "slot")
+    
     def __init__(self, nome: Token, valor: Expressao) -> None:
         self.nome = nome
+        self.simbolo = nome.simbolo
         self.valor = valor
         
     def to_str(self):
         return self.coloca_parenteses("atribuicao " + self.nome.lexema, self.valor)
 
 class Binaria(Expressao):
+    __slots__ = ("esquerda", "operador", "direita")
+    
     def __init__(self, esquerda: Expressao, operador: Token, direita: Expressao) -> None:
         self.esquerda = esquerda
         self.operador = operador
@@ -39,6 +51,8 @@ class Binaria(Expressao):
         return self.coloca_parenteses(self.operador.lexema, self.esquerda, self.direita)
 
 class Unaria(Expressao):
+    __slots__ = ("operador", "direita")
+    
     def __init__(self, operador: Token, direita: Expressao) -> None:
         self.operador = operador
         self.direita = direita
@@ -47,6 +61,8 @@ class Unaria(Expressao):
         return self.coloca_parenteses(self.operador.lexema, self.direita)
 
 class Logica(Expressao):
+    __slots__ = ("esquerda", "operador", "direita")
+    
     def __init__(self, esquerda: Expressao, operador: Token, direita: Expressao) -> None:
         self.esquerda = esquerda
         self.operador = operador
@@ -56,6 +72,8 @@ class Logica(Expressao):
         return self.coloca_parenteses(self.operador.lexema, self.esquerda, self.direita)
 
 class Literal(Expressao):
+    __slots__ = ("valor", "tipo")
+    
     def __init__(self, valor: TipoLiteral, tipo: TokenType) -> None:
         self.valor = valor
         self.tipo = tipo
@@ -64,6 +82,8 @@ class Literal(Expressao):
         return str(self.valor)
 
 class Lista(Expressao):
+    __slots__ = ("valores",)
+    
     def __init__(self, valores: list[Expressao]) -> None:
         self.valores = valores
         
@@ -79,7 +99,25 @@ class Lista(Expressao):
         
         return contents
 
+# Lista de numeros literais do mesmo tipo, guardados num array: 'q' para os
+# inteiros e 'd' para os floats. O parser monta uma ListaCompacta em vez de uma
+# Lista com um Literal para cada elemento; um numero com '-' na frente entra
+# negativo. Os elementos nao sao nos, entao ela nao tem filhos.
+class ListaCompacta(Expressao):
+    __slots__ = ("valores",)
+    
+    def __init__(self, valores: array) -> None:
+        self.valores = valores
+    
+    # Igual ao to_str da Lista equivalente: um negativo aparece como a Unaria (- n).
+    def to_str(self) -> str:
+        textos = [str(valor) for valor in self.valores]
+        
+        return "[" + ", ".join(f"(- {texto[1:]})" if texto[0] == "-" else texto for texto in textos) + "]"
+
 class Chamada(Expressao):
+    __slots__ = ("chamado", "paren", "argumentos")
+    
     def __init__(self, chamado: Expressao, paren: Token, argumentos: list[Expressao]):
         self.chamado = chamado
         self.paren = paren
@@ -89,6 +127,8 @@ class Chamada(Expressao):
         return self.coloca_parenteses("chamada", self.chamado)
 
 class Agrupamento(Expressao):
+    __slots__ = ("expressao",)
+    
     def __init__(self, expressao: Expressao) -> None:
         self.expressao = expressao
         
@@ -96,8 +136,11 @@ class Agrupamento(Expressao):
         return self.coloca_parenteses("grupo", self.expressao)
     
 class Variavel(Expressao):
+    __slots__ = ("nome", "simbolo", "profundidade", "slot")
+    
     def __init__(self, nome: Token) -> None:
         self.nome = nome
+        self.simbolo = nome.simbolo
         
     def to_str(self):
         return self.nome.lexema
\ No newline at end of file
@@ -0,0 +1,143 @@
+from .expressao import *
+from .declaracao import *
+from .visitante import Visitante, filhos, pre_ordem, pos_ordem, percorre
+from lexer.lex_tabela import LexerTabela
+from parser.parser import Parser
+from parser.parser_arena import ParserArena
+from parser.parser_preguicoso import ParserPreguicoso
+
+import copy
+import pickle
+import unittest
+
+FONTE = """
+xerife a: int = 1 + 2;
+procurado f(x: int): int { vorta -x; }
+bang (a < 3) atire [a, f(a)]; miss { a = 2; }
+"""
+
+def parse(fonte: str, classe: type[Parser] = Parser) -> Parser:
+    lexer = LexerTabela(fonte)
+    lexer.lex()
+    
+    parser = classe(lexer.tokens)
+    parser.parse()
+    
+    return parser
+
+# Nome da classe de cada no, ou o texto dele se for uma expressao.
+def nomes(nos) -> list[str]:
+    return [no.to_str() if isinstance(no, Expressao) else type(no).__name__ for no in nos]
+
+class Contador(Visitante):
+    def __init__(self) -> None:
+        self.visitados: list[str] = []
+    
+    def visitar_binaria(self, binaria: Binaria):
+        self.visitados.append("binaria")
+        self.visitar(binaria.esquerda)
+        self.visitar(binaria.direita)
+    
+    def visitar_literal(self, literal: Literal):
+        self.visitados.append(f"literal {literal.valor}")
+    
+    def visitar_var(self, var: Var):
+        self.visitados.append("var")
+        self.visitar(var.inicializador)
+
+class VisitanteTests(unittest.TestCase):
+    def teste_metodo_pela_classe(self):
+        contador = Contador()
+        contador.visitar(parse(FONTE).declaracoes[0])
+        
+        self.assertEqual(contador.visitados, ["var", "binaria", "literal 1", "literal 2"])
+        self.assertIs(Contador.metodos[Binaria], Contador.visitar_binaria)
+    
+    def teste_visoes_usam_o_metodo_da_classe(self):
+        parser = parse(FONTE, ParserArena)
+        contador = Contador()
+        contador.visitar(parser.arena.declaracoes()[0])
+        
+        self.assertEqual(contador.visitados, ["var", "binaria", "literal 1", "literal 2"])
+        self.assertIn(type(parser.arena.declaracoes()[0]), Contador.metodos)
+    
+    def teste_no_sem_metodo(self):
+        with self.assertRaisesRegex(TypeError, "Contador nao sabe visitar Funcao"):
+            Contador().visitar(parse(FONTE).declaracoes[1])
+
+class PercursoTests(unittest.TestCase):
+    def teste_pre_ordem(self):
+        declaracoes = parse(FONTE).declaracoes
+        
+        self.assertEqual(nomes(pre_ordem(declaracoes)), [
+            "Var", "(+ 1 2)", "1", "2",
+            "Funcao", "Parametro", "Return", "(- x)", "x",
+            "If", "(< a 3)", "a", "3", "Print", "[a, (chamada f)]", "a", "(chamada f)", "f", "a",
+            "Bloco", "Expr", "(atribuicao a 2)", "2",
+        ])
+    
+    def teste_pos_ordem(self):
+        declaracoes = parse(FONTE).declaracoes[:2]
+        
+        self.assertEqual(nomes(pos_ordem(declaracoes)), [
+            "1", "2", "(+ 1 2)", "Var",
+            "Parametro", "x", "(- x)", "Return", "Funcao",
+        ])
+    
+    def teste_percorre(self):
+        declaracao = parse(FONTE).declaracoes[0]
+        passos = [(nomes([no])[0], entrando) for no, entrando in percorre([declaracao])]
+        
+        self.assertEqual(passos, [
+            ("Var", True), ("(+ 1 2)", True), ("1", True), ("1", False),
+            ("2", True), ("2", False), ("(+ 1 2)", False), ("Var", False),
+        ])
+    
+    def teste_corpo_preguicoso(self):
+        declaracoes = parse(FONTE, ParserPreguicoso).declaracoes
+        
+        self.assertEqual(nomes(filhos(declaracoes[1])), ["Parametro", "Return"])
+        self.assertEqual(nomes(pre_ordem(declaracoes)), nomes(pre_ordem(parse(FONTE).declaracoes)))
+    
+    def teste_arvore_profunda(self):
+        n = 100_000
+        expressao = parse("a;").declaracoes[0].expressao
+        
+        for _ in range(n):
+            expressao = Agrupamento(expressao)
+        
+        self.assertEqual(sum(1 for _ in pre_ordem([expressao])), n + 1)
+        self.assertEqual(sum(1 for _ in percorre([expressao])), 2 * (n + 1))
+
+class TiposTests(unittest.TestCase):
+    def teste_uma_instancia_por_tipo(self):
+        lista = TipoLista(TipoPrimitivo.INT)
+        
+        self.assertIs(lista, TipoLista(TipoPrimitivo.INT))
+        self.assertIsNot(lista, TipoLista(TipoPrimitivo.FLOAT))
+        self.assertNotEqual(lista, TipoLista(TipoPrimitivo.FLOAT))
+        self.assertEqual({lista: 1}[TipoLista(TipoPrimitivo.INT)], 1)
+        self.assertIs(TipoLista(lista), TipoLista(TipoLista(TipoPrimitivo.INT)))
+        self.assertEqual(repr(lista), "TipoLista(interno=<TipoPrimitivo.INT: 1>)")
+    
+    def teste_pickle_e_copia(self):
+        lista = TipoLista(TipoPrimitivo.STRING)
+        
+        self.assertIs(pickle.loads(pickle.dumps(lista)), lista)
+        self.assertIs(copy.deepcopy(lista), lista)
+    
+    def teste_tipos_compostos_novos(self):
+        funcao = TipoFuncao((TipoPrimitivo.INT, TipoLista(TipoPrimitivo.BOOL)), TipoPrimitivo.FLOAT)
+        
+        self.assertIs(funcao, TipoFuncao((TipoPrimitivo.INT, TipoLista(TipoPrimitivo.BOOL)), TipoPrimitivo.FLOAT))
+        self.assertIsNot(funcao, TipoFuncao((TipoPrimitivo.INT,), TipoPrimitivo.FLOAT))
+        self.assertIs(pickle.loads(pickle.dumps(funcao)), funcao)
+        # A tupla dos parametros eh a mesma para outro tipo de retorno.
+        self.assertIs(TipoFuncao((TipoPrimitivo.INT, TipoLista(TipoPrimitivo.BOOL)), TipoPrimitivo.INT).parametros, funcao.parametros)
+    
+    def teste_parser_usa_os_tipos_canonicos(self):
+        var, funcao = parse("xerife l: lista[int] = [1]; procurado f(x: lista[int]): lista[int] { vorta x; }").declaracoes
+        
+        self.assertIs(var.tipo, TipoLista(TipoPrimitivo.INT))
+        self.assertIs(funcao.params[0].tipo, var.tipo)
+        self.assertIs(funcao.tipo_retorno, var.tipo)
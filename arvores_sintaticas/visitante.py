@@ -0,0 +1,124 @@
+from .expressao import *
+from .declaracao import *
+from .arena import CAMPOS, FILHO, FILHO_OPCIONAL, FILHOS, PARAMETROS
+from typing import Callable, Iterable, Iterator
+
+# Visitantes e percursos das arvores sintaticas.
+#
+# Um Visitante escolhe o metodo de cada no por uma tabela indexada pela classe
+# do no, em vez de uma sequencia de isinstance: visitar(no) chama
+# visitar_<classe em minusculas>(no), por exemplo visitar_binaria para uma
+# Binaria. A tabela de cada subclasse de Visitante eh montada quando a subclasse
+# eh criada; subclasses das classes de nos (como as visoes da Arena) usam o
+# metodo da classe de no de que derivam e entram na tabela na primeira visita.
+# Um no sem metodo vai para desconhecido.
+#
+# pre_ordem, pos_ordem e percorre andam pela arvore com uma pilha propria, sem
+# recursao, entao servem para arvores de qualquer profundidade. Os filhos de
+# cada no sao os campos que a Arena guarda como filhos (veja CAMPOS em
+# arvores_sintaticas.arena), na ordem do construtor; o corpo de uma Funcao do
+# ParserPreguicoso eh analisado quando o percurso chega nele.
+
+# Nome do metodo que visita os nos da classe.
+def nome_metodo(classe: type) -> str:
+    return "visitar_" + classe.__name__.lower()
+
+class Visitante:
+    metodos: dict[type, Callable] = {}
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        cls.metodos = {}
+
+        for classe in CAMPOS:
+            metodo = getattr(cls, nome_metodo(classe), None)
+
+            if metodo is not None:
+                cls.metodos[classe] = metodo
+
+    def visitar(self, no):
+        try:
+            metodo = self.metodos[type(no)]
+        except KeyError:
+            metodo = self.registra(type(no))
+
+        return metodo(self, no)
+
+    # Poe na tabela o metodo de uma classe que ainda nao esta nela.
+    @classmethod
+    def registra(cls, classe: type) -> Callable:
+        metodo = cls.desconhecido
+
+        for base in classe.__mro__:
+            if base in CAMPOS:
+                metodo = cls.metodos.get(base, cls.desconhecido)
+                break
+
+        cls.metodos[classe] = metodo
+        return metodo
+
+    def desconhecido(self, no):
+        raise TypeError(f"{type(self).__name__} nao sabe visitar {type(no).__name__}")
+
+# Nomes dos campos com filhos de cada classe de no.
+CAMPOS_FILHOS: dict[type, tuple[str, ...]] = {
+    classe: tuple(nome for nome, campo in campos if campo in (FILHO, FILHO_OPCIONAL, FILHOS, PARAMETROS))
+    for classe, campos in CAMPOS.items()
+}
+
+def campos_filhos(classe: type) -> tuple[str, ...]:
+    campos = CAMPOS_FILHOS.get(classe)
+
+    if campos is None:
+        campos = CAMPOS_FILHOS[classe] = next(
+            (CAMPOS_FILHOS[base] for base in classe.__mro__ if base in CAMPOS), ()
+        )
+
+    return campos
+
+# Os filhos do no, na ordem dos campos.
+def filhos(no) -> list:
+    resultado = []
+
+    for nome in campos_filhos(type(no)):
+        valor = getattr(no, nome)
+
+        if isinstance(valor, list):
+            resultado.extend(valor)
+        elif valor is not None:
+            resultado.append(valor)
+
+    return resultado
+
+# Cada no, antes dos seus filhos.
+def pre_ordem(raizes: Iterable) -> Iterator:
+    pilha = list(raizes)
+    pilha.reverse()
+
+    while pilha:
+        no = pilha.pop()
+        yield no
+
+        proximos = filhos(no)
+        proximos.reverse()
+        pilha.extend(proximos)
+
+# Cada no, depois dos seus filhos.
+def pos_ordem(raizes: Iterable) -> Iterator:
+    for no, entrando in percorre(raizes):
+        if not entrando:
+            yield no
+
+# Gera (no, True) ao entrar em cada no e (no, False) ao sair dele, depois dos
+# filhos, para passadas que precisam fazer algo dos dois lados (como abrir e
+# fechar um escopo).
+def percorre(raizes: Iterable) -> Iterator[tuple[object, bool]]:
+    pilha = [(no, True) for no in reversed(list(raizes))]
+
+    while pilha:
+        no, entrando = pilha.pop()
+        yield no, entrando
+
+        if entrando:
+            pilha.append((no, False))
+            pilha.extend((filho, True) for filho in reversed(filhos(no)))
@@ -0,0 +1,52 @@
+# Mede quanto custa analisar de novo um programa depois de editar o corpo de
+# uma funcao: a AnaliseSemantica, que analisa tudo, contra a AnaliseIncremental,
+# que so reanalisa a funcao editada, sobre as declaracoes do ParserIncremental.
+#
+# Uso: python -m benchmarks.analise_incremental [numero de funcoes]
+
+from lexer.lex_tabela import LexerTabela
+from lexer.simbolos import Simbolos
+from parser.parser_incremental import ParserIncremental
+from analise_semantica.analise_incremental import AnaliseIncremental
+from analise_semantica.validator import AnaliseSemantica
+from .fontes import funcao
+from .visitante import mede
+import sys
+import time
+
+def parse(fonte: str, simbolos: Simbolos, anterior = None) -> ParserIncremental:
+    lexer = LexerTabela(fonte, simbolos)
+    lexer.lex()
+    parser = ParserIncremental(lexer.tokens, anterior)
+    parser.parse()
+
+    return parser
+
+if __name__ == "__main__":
+    funcoes = int(sys.argv[1]) if len(sys.argv) > 1 else 4000
+
+    partes = [funcao(i) for i in range(funcoes)]
+    simbolos = Simbolos()
+    anterior = parse("".join(partes), simbolos)
+
+    partes[funcoes // 2] = partes[funcoes // 2].replace("2.5", "3.5")
+    parser = parse("".join(partes), simbolos, anterior)
+
+    completa = mede(lambda: AnaliseSemantica(simbolos).analisar(parser.declaracoes))
+    incremental = float("inf")
+
+    for _ in range(5):
+        analisador = AnaliseIncremental(simbolos)
+        analisador.analisar(anterior.declaracoes)
+
+        inicio = time.perf_counter()
+        analisador.analisar(parser.declaracoes)
+        incremental = min(incremental, time.perf_counter() - inicio)
+
+    primeira = mede(lambda: AnaliseIncremental(simbolos).analisar(parser.declaracoes))
+
+    print(f"{funcoes} funcoes, 1 editada")
+    print(f"AnaliseSemantica:                 {completa:.4f}s")
+    print(f"AnaliseIncremental, 1a versao:    {primeira:.4f}s")
+    print(f"AnaliseIncremental, depois:       {incremental:.4f}s ({completa / incremental:.0f}x, "
+          f"{analisador.reanalisadas} reanalisada(s), {analisador.reaproveitadas} reaproveitada(s))")
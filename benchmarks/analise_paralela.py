@@ -0,0 +1,32 @@
+# Compara a AnaliseSemantica com a AnaliseParalela, que checa os corpos das
+# funcoes em varios processos, com 1, 2 e 4 processos. O ganho depende dos
+# nucleos da maquina: com um nucleo so, aparece so o custo de criar os processos.
+#
+# Uso: python -m benchmarks.analise_paralela [numero de funcoes]
+
+from lexer.lex_tabela import LexerTabela
+from parser.parser import Parser
+from analise_semantica.analise_paralela import AnaliseParalela
+from analise_semantica.validator import AnaliseSemantica
+from .fontes import programa_funcoes
+from .visitante import mede
+import os
+import sys
+
+if __name__ == "__main__":
+    funcoes = int(sys.argv[1]) if len(sys.argv) > 1 else 4000
+
+    lexer = LexerTabela(programa_funcoes(funcoes))
+    lexer.lex()
+    parser = Parser(lexer.tokens)
+    parser.parse()
+    declaracoes = parser.declaracoes
+
+    serial = mede(lambda: AnaliseSemantica(lexer.simbolos).analisar(declaracoes))
+
+    print(f"{funcoes} funcoes, {os.cpu_count()} nucleos")
+    print(f"AnaliseSemantica:             {serial:.3f}s")
+
+    for trabalhadores in (1, 2, 4):
+        tempo = mede(lambda: AnaliseParalela(lexer.simbolos, trabalhadores, minimo_funcoes = 1).analisar(declaracoes))
+        print(f"AnaliseParalela, {trabalhadores} processos: {tempo:.3f}s ({serial / tempo:.2f}x)")
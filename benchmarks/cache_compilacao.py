@@ -0,0 +1,51 @@
+# Compara a analise lexica e sintatica de um codigo (execucao fria) com a
+# leitura dos tokens e da arvore do cache em disco (execucao quente), e mede
+# quanto custa gravar a entrada.
+#
+# Uso: python -m benchmarks.cache_compilacao [numero de funcoes]
+
+from lexer.lex_tabela import LexerTabela
+from lexer.simbolos import Simbolos
+from parser.parser import Parser
+from cache.cache_compilacao import CacheCompilacao
+from .fontes import programa_funcoes
+import os
+import sys
+import tempfile
+import time
+
+def compila(fonte: str):
+    lexer = LexerTabela(fonte, Simbolos())
+    lexer.lex()
+    parser = Parser(lexer.tokens)
+    parser.parse()
+
+    return lexer.tokens, parser.declaracoes
+
+def mede(funcao, repeticoes: int = 3):
+    melhor = float("inf")
+
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+
+    return melhor, resultado
+
+if __name__ == "__main__":
+    funcoes = int(sys.argv[1]) if len(sys.argv) > 1 else 4000
+    fonte = programa_funcoes(funcoes)
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        cache = CacheCompilacao(diretorio)
+
+        fria, (tokens, declaracoes) = mede(lambda: compila(fonte))
+        gravacao, _ = mede(lambda: cache.guarda(fonte, tokens, declaracoes))
+        quente, _ = mede(lambda: cache.carrega(fonte, Simbolos()))
+        tamanho = os.path.getsize(cache.caminho(fonte))
+
+    print(f"{funcoes} funcoes, {len(fonte)} caracteres, {len(tokens)} tokens")
+    print(f"lexer e parser (fria):     {fria:.3f}s")
+    print(f"leitura do cache (quente): {quente:.3f}s ({fria / quente:.2f}x)")
+    print(f"gravacao da entrada:       {gravacao:.3f}s, {tamanho / 2**20:.1f} MiB")
+    print(f"acertos: {cache.acertos}, falhas: {cache.falhas}")
@@ -0,0 +1,56 @@
+# Mede chamadas checadas por segundo na AnaliseSemantica, que compara a tupla
+# dos tipos dos argumentos com a da assinatura da funcao de uma vez, contra a
+# mesma checagem argumento por argumento e contra a analise sem checagem dos
+# argumentos, como era antes.
+#
+# Uso: python -m benchmarks.chamadas [numero de chamadas]
+
+from lexer.lex_tabela import LexerTabela
+from parser.parser import Parser
+from analise_semantica.validator import AnaliseSemantica
+from arvores_sintaticas.expressao import Chamada, Variavel
+from arvores_sintaticas.declaracao import Tipo
+from arvores_sintaticas.visitante import pre_ordem
+from .fontes import chamadas
+from .visitante import mede
+import sys
+
+# Checa cada argumento contra o parametro na mesma posicao.
+class AnalisePorArgumento(AnaliseSemantica):
+    def visitar_chamada(self, chamada: Chamada) -> Tipo:
+        chamado = chamada.chamado
+        assinatura = self.tabela_simbolos.assinatura(chamado.simbolo)
+        parametros = assinatura.parametros
+
+        if len(chamada.argumentos) != len(parametros):
+            raise Exception(f"Erro: A função '{chamado.nome.lexema}' espera {len(parametros)} argumento(s).")
+
+        for argumento, parametro in zip(chamada.argumentos, parametros):
+            if self.visitar_expressao(argumento) is not parametro:
+                raise Exception(f"Erro: Argumentos incompatíveis na chamada de '{chamado.nome.lexema}'.")
+
+        return assinatura.retorno
+
+# O visitar_chamada de antes, que nem visitava os argumentos.
+class AnaliseSemChecagem(AnaliseSemantica):
+    def visitar_chamada(self, chamada: Chamada) -> Tipo:
+        return self.visitar_expressao(chamada.chamado)
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+
+    lexer = LexerTabela(chamadas(n))
+    lexer.lex()
+    parser = Parser(lexer.tokens)
+    parser.parse()
+    declaracoes = parser.declaracoes
+
+    total = sum(1 for no in pre_ordem(declaracoes) if isinstance(no, Chamada))
+
+    print(f"{total} chamadas")
+
+    for nome, classe in [("Sem checar os argumentos", AnaliseSemChecagem),
+                         ("Argumento por argumento", AnalisePorArgumento),
+                         ("Tupla da assinatura", AnaliseSemantica)]:
+        tempo = mede(lambda: classe(lexer.simbolos).analisar(declaracoes))
+        print(f"{nome + ':':26}{tempo:.3f}s ({total / tempo:,.0f} chamadas/s)")
@@ -0,0 +1,55 @@
+# Mede o hash-consing das expressoes (ParserCompartilhado): quantos nos de
+# expressao o parser pediu para cada no construido, a memoria da arvore com e
+# sem compartilhamento e o tempo da analise semantica, que calcula o tipo de
+# cada no compartilhado uma vez so.
+#
+# Uso: python -m benchmarks.compartilhamento [numero de funcoes] [numero de declaracoes repetidas]
+
+from lexer.lex_tabela import LexerTabela
+from parser.parser import Parser
+from parser.parser_compartilhado import ParserCompartilhado
+from analise_semantica.validator import AnaliseSemantica
+from .fontes import programa_funcoes, repetidas
+from .memoria_arvore import aloca
+import sys
+import time
+
+def analisa(parser: Parser) -> Parser:
+    parser.parse()
+
+    return parser
+
+def semantica(lexer: LexerTabela, parser: Parser) -> float:
+    analisador = AnaliseSemantica(lexer.simbolos)
+
+    if isinstance(parser, ParserCompartilhado):
+        analisador.compartilhados = parser.fabrica.compartilhados
+
+    inicio = time.perf_counter()
+    analisador.analisar(parser.declaracoes)
+
+    return time.perf_counter() - inicio
+
+def compara(nome: str, fonte: str) -> None:
+    lexer = LexerTabela(fonte)
+    lexer.lex()
+
+    memoria, parser = aloca(lambda: analisa(Parser(lexer.tokens)))
+    memoria_compartilhada, compartilhado = aloca(lambda: analisa(ParserCompartilhado(lexer.tokens)))
+    fabrica = compartilhado.fabrica
+
+    tempo = min(semantica(lexer, parser) for _ in range(3))
+    tempo_compartilhado = min(semantica(lexer, compartilhado) for _ in range(3))
+
+    print(f"{nome}: {len(lexer.tokens)} tokens")
+    print(f"  expressoes sem efeitos colaterais: {fabrica.pedidos} pedidas, {fabrica.construidos} construidas ({fabrica.razao():.2f}x)")
+    print(f"  arvore: {memoria / 2**20:.1f} MiB -> {memoria_compartilhada / 2**20:.1f} MiB "
+          f"({(memoria - memoria_compartilhada) / 2**20:.1f} MiB a menos, {memoria_compartilhada / memoria:.0%})")
+    print(f"  analise semantica: {tempo:.3f}s -> {tempo_compartilhado:.3f}s ({tempo / tempo_compartilhado:.2f}x)")
+
+if __name__ == "__main__":
+    funcoes = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    declaracoes = int(sys.argv[2]) if len(sys.argv) > 2 else 20000
+
+    compara(f"{funcoes} funcoes", programa_funcoes(funcoes))
+    compara(f"{declaracoes} declaracoes repetidas", repetidas(declaracoes))
@@ -0,0 +1,73 @@
+# Geradores de codigo-fonte sintetico para os benchmarks.
+
+# Uma funcao tipica de codigo gerado, com o indice i embutido nos nomes.
+def funcao(i: int) -> str:
+    return (
+        f"// funcao gerada numero {i}\n"
+        f"procurado f{i}(a: int, b: float, nome: string): float {{\n"
+        f"    xerife total{i}: float = b * 2.5 + 1.0;\n"
+        f"    xerife valores: lista[int] = [1, 2, 3, {i}];\n"
+        f"    bang (a >= {i} && a != 0 || b < 3.25) {{\n"
+        f"        atire \"valor de f{i}: \";\n"
+        f"        total{i} = total{i} - b / 4.0;\n"
+        f"    }} miss {{\n"
+        f"        atire nome;\n"
+        f"    }}\n"
+        f"    cavalgando (b > 0.0) {{\n"
+        f"        b = b - 1.0;\n"
+        f"    }}\n"
+        f"    vorta total{i};\n"
+        f"}}\n\n"
+    )
+
+# Concatena funcoes geradas ate o codigo ter pelo menos tamanho caracteres.
+def programa(tamanho: int) -> str:
+    partes = []
+    total = 0
+    i = 0
+
+    while total < tamanho:
+        parte = funcao(i)
+        partes.append(parte)
+        total += len(parte)
+        i += 1
+
+    return "".join(partes)
+
+# Programa com n funcoes independentes.
+def programa_funcoes(n: int) -> str:
+    return "".join(funcao(i) for i in range(n))
+
+# Declaracoes com expressoes longas, que misturam todos os niveis de precedencia.
+def expressoes(n: int) -> str:
+    return "".join(
+        f"xerife e{i}: bool = (a + b * {i}.5 - c / 4.0) * -d >= f(a, b + 1, [1, 2, {i}]) "
+        f"&& !(x{i} == 3 || y != \"texto\") || a < b && mocinho;\n"
+        for i in range(n)
+    )
+
+# Codigo gerado que repete as mesmas subexpressoes em n declaracoes.
+def repetidas(n: int) -> str:
+    return "xerife a: float = 1.0; xerife b: float = 2.0; xerife c: float = 3.0; xerife d: float = 4.0;\n" + "".join(
+        f"xerife e{i}: bool = (a + b * 2.5 - c / 4.0) * -d >= a && !(b == 3.0 || c != 1.0);\n"
+        for i in range(n)
+    )
+
+# Codigo gerado com muitas chamadas: algumas funcoes e n chamadas a elas, com
+# de zero a quatro argumentos.
+def chamadas(n: int) -> str:
+    funcoes = (
+        "procurado zero(): int { vorta 1; }\n"
+        "procurado um(a: int): int { vorta a; }\n"
+        "procurado dois(a: int, b: float): float { vorta b; }\n"
+        "procurado quatro(a: int, b: float, c: string, d: lista[int]): bool { vorta a < 2; }\n"
+        "xerife x: int = 1; xerife y: float = 2.0;\n"
+    )
+    modelos = [
+        "atire zero();\n",
+        "atire um(x);\n",
+        "atire dois(um({i}), y);\n",
+        "atire quatro(x, {i}.5, \"texto\", [1, 2]);\n",
+    ]
+
+    return funcoes + "".join(modelos[i % len(modelos)].format(i=i) for i in range(n))
@@ -0,0 +1,38 @@
+# Compara a vazao (tokens por segundo) do Lexer classico com a do LexerTabela.
+#
+# Uso: python -m benchmarks.lexer [tamanho em MB]
+
+from lexer.lex import Lexer
+from lexer.lex_tabela import LexerTabela
+from .fontes import programa
+import sys
+import time
+
+def mede(classe, fonte: str, repeticoes: int = 3) -> tuple[int, float]:
+    melhor = float("inf")
+    num_tokens = 0
+
+    for _ in range(repeticoes):
+        lexer = classe(fonte)
+
+        inicio = time.perf_counter()
+        lexer.lex()
+        melhor = min(melhor, time.perf_counter() - inicio)
+
+        num_tokens = len(lexer.tokens)
+
+    return num_tokens, melhor
+
+if __name__ == "__main__":
+    megabytes = float(sys.argv[1]) if len(sys.argv) > 1 else 2.0
+    fonte = programa(int(megabytes * 1024 * 1024))
+
+    print(f"Codigo-fonte: {len(fonte)} caracteres")
+
+    resultados = {}
+    for nome, classe in [("classico", Lexer), ("tabela", LexerTabela)]:
+        num_tokens, tempo = mede(classe, fonte)
+        resultados[nome] = tempo
+        print(f"{nome:>10}: {num_tokens} tokens em {tempo:.3f}s ({num_tokens / tempo:,.0f} tokens/s)")
+
+    print(f"Aceleracao: {resultados['classico'] / resultados['tabela']:.1f}x")
@@ -0,0 +1,46 @@
+# Mede como a analise lexica paralela escala com o numero de processos.
+#
+# Com 1 trabalhador o codigo-fonte eh analisado no proprio processo, sem
+# dividir, entao essa linha eh a referencia da aceleracao.
+#
+# Uso: python -m benchmarks.lexer_paralelo [tamanho em MB] [classico|tabela]
+
+from lexer.lex import Lexer
+from lexer.lex_tabela import LexerTabela
+from lexer.lex_paralelo import LexerParalelo
+from .fontes import programa
+import os
+import sys
+import time
+
+def mede(fonte: str, trabalhadores: int, classe, repeticoes: int = 3) -> tuple[int, float]:
+    melhor = float("inf")
+    num_tokens = 0
+
+    for _ in range(repeticoes):
+        lexer = LexerParalelo(fonte, trabalhadores = trabalhadores, classe = classe)
+
+        inicio = time.perf_counter()
+        lexer.lex()
+        melhor = min(melhor, time.perf_counter() - inicio)
+
+        num_tokens = len(lexer.tokens)
+
+    return num_tokens, melhor
+
+if __name__ == "__main__":
+    megabytes = float(sys.argv[1]) if len(sys.argv) > 1 else 8.0
+    classe = LexerTabela if len(sys.argv) > 2 and sys.argv[2] == "tabela" else Lexer
+    fonte = programa(int(megabytes * 1024 * 1024))
+
+    print(f"Codigo-fonte: {len(fonte)} caracteres, lexer {classe.__name__}, {os.cpu_count()} CPUs")
+
+    referencia = None
+    for trabalhadores in [1, 2, 4, 8]:
+        num_tokens, tempo = mede(fonte, trabalhadores, classe)
+
+        if referencia is None:
+            referencia = tempo
+
+        print(f"{trabalhadores} trabalhador(es): {num_tokens} tokens em {tempo:.3f}s "
+              f"({num_tokens / tempo:,.0f} tokens/s, {referencia / tempo:.2f}x)")
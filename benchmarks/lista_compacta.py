@@ -0,0 +1,67 @@
+# Mede, para listas de 10^4 a 10^7 numeros, a memoria da arvore (com o
+# tracemalloc) e o tempo da analise sintatica e da checagem de tipos de uma
+# ListaCompacta, contra a Lista com um Literal por elemento que o parser
+# montava antes. Os tokens ficam num TokenBuffer, que eh analisado pelo
+# ParserBuffer; a analise lexica nao entra nas medidas.
+#
+# Uso: python -m benchmarks.lista_compacta [maior expoente] [int|float]
+
+from lexer.token_buffer import LexerBuffer
+from parser.parser_buffer import ParserBuffer
+from analise_semantica.validator import AnaliseSemantica
+from lexer.simbolos import Simbolos
+from .memoria_arvore import aloca
+import gc
+import sys
+import time
+
+# O ParserBuffer montando uma Lista com um Literal por elemento, como antes.
+class ParserBufferSemCompactas(ParserBuffer):
+    def lista_compacta(self):
+        return []
+
+def fonte_lista(n: int, tipo: str) -> str:
+    if tipo == "int":
+        valores = (str(i * 7919 % 1000003 - 500000) for i in range(n))
+    else:
+        valores = (f"{i * 7919 % 1000003 - 500000}.25" for i in range(n))
+
+    return f"xerife l: lista[{tipo}] = [" + ", ".join(valores) + "];"
+
+def parse(classe: type[ParserBuffer], tokens):
+    parser = classe(tokens)
+    parser.parse()
+
+    return parser.declaracoes
+
+def cronometra(funcao) -> tuple[float, object]:
+    inicio = time.perf_counter()
+    resultado = funcao()
+
+    return time.perf_counter() - inicio, resultado
+
+if __name__ == "__main__":
+    maior = int(sys.argv[1]) if len(sys.argv) > 1 else 7
+    tipo = sys.argv[2] if len(sys.argv) > 2 else "int"
+
+    print(f"lista[{tipo}]: memoria da arvore, analise sintatica e checagem de tipos")
+
+    for expoente in range(4, maior + 1):
+        n = 10 ** expoente
+        lexer = LexerBuffer(fonte_lista(n, tipo))
+        lexer.lex()
+        tokens = lexer.tokens
+
+        for nome, classe in [("Lista", ParserBufferSemCompactas), ("ListaCompacta", ParserBuffer)]:
+            gc.collect()
+            memoria, declaracoes = aloca(lambda: parse(classe, tokens))
+            del declaracoes
+            gc.collect()
+
+            tempo_parse, declaracoes = cronometra(lambda: parse(classe, tokens))
+            analisador = AnaliseSemantica(Simbolos())
+            tempo_tipos, _ = cronometra(lambda: analisador.visitar_expressao(declaracoes[0].inicializador))
+            del declaracoes
+
+            print(f"10^{expoente} {nome + ':':15}{memoria / n:7.1f} bytes/elemento ({memoria / 2 ** 20:8.1f} MiB), "
+                  f"parse {tempo_parse:8.3f}s, tipos {tempo_tipos * 1e3:9.3f}ms")
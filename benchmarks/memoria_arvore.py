@@ -0,0 +1,99 @@
+# Mede a memoria por token (lista de Token do LexerTabela) e por no da arvore
+# sintatica, em objetos (Parser) e numa Arena (ParserArena), com o tracemalloc.
+#
+# Os bytes por token incluem o lexema; os bytes por no incluem as listas
+# (corpos, argumentos, elementos) que os nos guardam. Com --limite, termina
+# com erro se algum valor passar do limite, para pegar regressoes.
+#
+# Uso: python -m benchmarks.memoria_arvore [numero de funcoes] [--limite BYTES_TOKEN BYTES_NO]
+
+from lexer.lex_tabela import LexerTabela
+from parser.parser import Parser
+from parser.parser_arena import ParserArena
+from arvores_sintaticas.expressao import Expressao
+from arvores_sintaticas.declaracao import Declaracao, Parametro
+from .fontes import programa_funcoes
+import sys
+import tracemalloc
+
+# Valores dos atributos de um no, que guarda tudo em __slots__.
+def atributos(no) -> list:
+    return [
+        getattr(no, nome)
+        for classe in type(no).__mro__
+        for nome in getattr(classe, "__slots__", ())
+        if hasattr(no, nome)
+    ]
+
+# Conta os nos da arvore, sem recursao.
+def conta_nos(declaracoes: list[Declaracao]) -> int:
+    pendentes = list(declaracoes)
+    total = 0
+
+    while pendentes:
+        valor = pendentes.pop()
+
+        if isinstance(valor, list):
+            pendentes.extend(valor)
+        elif isinstance(valor, (Expressao, Declaracao, Parametro)):
+            total += 1
+            pendentes.extend(atributos(valor))
+
+    return total
+
+# Retorna os bytes alocados enquanto funcao roda e o que ela retornou.
+def aloca(funcao):
+    tracemalloc.start()
+    resultado = funcao()
+    memoria, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return memoria, resultado
+
+def lexa(fonte: str) -> list:
+    lexer = LexerTabela(fonte)
+    lexer.lex()
+
+    return lexer.tokens
+
+def analisa(tokens) -> list[Declaracao]:
+    parser = Parser(tokens)
+    parser.parse()
+
+    return parser.declaracoes
+
+def analisa_arena(tokens):
+    parser = ParserArena(tokens)
+    parser.parse()
+
+    return parser.arena
+
+if __name__ == "__main__":
+    argumentos = sys.argv[1:]
+    limites = None
+
+    if "--limite" in argumentos:
+        i = argumentos.index("--limite")
+        limites = (float(argumentos[i + 1]), float(argumentos[i + 2]))
+        del argumentos[i:i + 3]
+
+    funcoes = int(argumentos[0]) if argumentos else 2000
+    fonte = programa_funcoes(funcoes)
+
+    memoria_tokens, tokens = aloca(lambda: lexa(fonte))
+    memoria_arvore, declaracoes = aloca(lambda: analisa(tokens))
+    nos = conta_nos(declaracoes)
+    memoria_arena, arena = aloca(lambda: analisa_arena(tokens))
+
+    por_token = memoria_tokens / len(tokens)
+    por_no = memoria_arvore / nos
+
+    print(f"Codigo-fonte: {len(fonte)} caracteres ({funcoes} funcoes)")
+    print(f"tokens: {len(tokens)}, {memoria_tokens / 2**20:.1f} MiB ({por_token:.1f} bytes/token)")
+    print(f"arvore: {nos} nos, {memoria_arvore / 2**20:.1f} MiB ({por_no:.1f} bytes/no)")
+    print(f"arena:  {len(arena)} nos, {memoria_arena / 2**20:.1f} MiB ({memoria_arena / len(arena):.1f} bytes/no)")
+    print(f"tokens e arvore: {(memoria_tokens + memoria_arvore) / len(fonte):.1f} bytes por caractere do codigo")
+
+    if limites is not None and (por_token > limites[0] or por_no > limites[1]):
+        print(f"Acima do limite de {limites[0]:.0f} bytes/token e {limites[1]:.0f} bytes/no")
+        exit(1)
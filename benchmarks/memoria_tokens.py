@@ -0,0 +1,39 @@
+# Compara a memoria ocupada pelos tokens numa lista de Token e num TokenBuffer.
+#
+# Uso: python -m benchmarks.memoria_tokens [tamanho em MB]
+
+from lexer.lex_tabela import LexerTabela
+from lexer.token_buffer import LexerBuffer
+from .fontes import programa
+import sys
+import time
+import tracemalloc
+
+# Retorna o numero de tokens, os bytes alocados pelo lexer (sem contar o
+# codigo-fonte, que ja existia antes) e o tempo da analise lexica.
+# O tempo eh medido numa execucao separada, sem o tracemalloc.
+def mede(classe, fonte: str) -> tuple[int, int, float]:
+    inicio = time.perf_counter()
+    classe(fonte).lex()
+    tempo = time.perf_counter() - inicio
+
+    tracemalloc.start()
+
+    lexer = classe(fonte)
+    lexer.lex()
+
+    memoria, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return len(lexer.tokens), memoria, tempo
+
+if __name__ == "__main__":
+    megabytes = float(sys.argv[1]) if len(sys.argv) > 1 else 1.0
+    fonte = programa(int(megabytes * 1024 * 1024))
+
+    print(f"Codigo-fonte: {len(fonte)} caracteres")
+
+    for nome, classe in [("list[Token]", LexerTabela), ("TokenBuffer", LexerBuffer)]:
+        num_tokens, memoria, tempo = mede(classe, fonte)
+        print(f"{nome:>12}: {num_tokens} tokens, {memoria / 2**20:.1f} MiB "
+              f"({memoria / num_tokens:.1f} bytes/token), {tempo:.3f}s")
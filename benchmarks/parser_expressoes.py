@@ -0,0 +1,152 @@
+# Compara a analise de expressoes por precedencia (Pratt) do Parser com a
+# cascata de regras, uma por nivel de precedencia, que ele usava antes.
+#
+# Uso: python -m benchmarks.parser_expressoes [numero de declaracoes]
+
+from lexer.lex_tabela import LexerTabela
+from lexer.lex_token import Token, TokenType
+from parser.parser import Parser
+from arvores_sintaticas.expressao import *
+from .fontes import expressoes
+import sys
+import time
+
+# O Parser com a analise de expressoes antiga, como referencia.
+class ParserCascata(Parser):
+    def expressao(self) -> Expressao:
+        return self.atribuicao()
+    
+    def atribuicao(self) -> Expressao:
+        expressao: Expressao = self.ou()
+        
+        if self.match(TokenType.IGUAL):
+            igual: Token = self.anterior()
+            valor: Expressao = self.atribuicao()
+            
+            if isinstance(expressao, Variavel):
+                nome: Token = expressao.nome
+                return Atribuicao(nome, valor)
+            
+            self.erro("Isso nao e uma atribuicao valida.", igual)
+            
+        return expressao
+    
+    def ou(self) -> Expressao:
+        expressao: Expressao = self.e()
+        
+        while self.match(TokenType.OR):
+            operador: Token = self.anterior()
+            direita: Expressao = self.e()
+            expressao = Logica(expressao, operador, direita)
+            
+        return expressao
+    
+    def e(self) -> Expressao:
+        expressao: Expressao = self.igualdade()
+        
+        while self.match(TokenType.AND):
+            operador: Token = self.anterior()
+            direita: Expressao = self.igualdade()
+            expressao = Logica(expressao, operador, direita)
+            
+        return expressao
+    
+    def igualdade(self) -> Expressao:
+        expressao = self.comparacao()
+        
+        while self.match(TokenType.DIFERENTE, TokenType.IGUAL_IGUAL):
+            operador = self.anterior()
+            direita = self.comparacao()
+            expressao = Binaria(expressao, operador, direita)
+            
+        return expressao
+    
+    def comparacao(self) -> Expressao:
+        expressao = self.termo()
+        
+        while self.match(
+            TokenType.MAIOR,
+            TokenType.MAIOR_IGUAL,
+            TokenType.MENOR,
+            TokenType.MENOR_IGUAL
+        ):
+            operador = self.anterior()
+            direita = self.termo()
+            expressao = Binaria(expressao, operador, direita)
+            
+        return expressao
+    
+    def termo(self) -> Expressao:
+        expressao = self.fator()
+        
+        while self.match(
+            TokenType.MENOS,
+            TokenType.MAIS
+        ):
+            operador = self.anterior()
+            direita = self.fator()
+            expressao = Binaria(expressao, operador, direita)
+            
+        return expressao
+    
+    def fator(self) -> Expressao:
+        expressao = self.unaria()
+        
+        while self.match(
+            TokenType.ASTERISCO,
+            TokenType.BARRA
+        ):
+            operador = self.anterior()
+            direita = self.unaria()
+            expressao = Binaria(expressao, operador, direita)
+            
+        return expressao
+    
+    def unaria(self) -> Expressao:
+        if self.match(TokenType.EXCLAMACAO, TokenType.MENOS):
+            operador = self.anterior()
+            direita = self.unaria()
+            return Unaria(operador, direita)
+        
+        return self.chamada()
+    
+    def primaria(self) -> Expressao:
+        if self.match(TokenType.BANDIDO): return Literal(False, TokenType.BANDIDO)
+        if self.match(TokenType.MOCINHO): return Literal(True, TokenType.MOCINHO)
+        if self.match(TokenType.DESERTO): return Literal(None, TokenType.DESERTO)
+        if self.match(TokenType.STRING): return Literal(self.anterior().lexema, TokenType.STRING)
+        
+        if self.match(TokenType.INT): 
+            return Literal(int(self.anterior().lexema), TokenType.INT)
+        if self.match(TokenType.FLOAT): 
+            return Literal(float(self.anterior().lexema), TokenType.FLOAT)
+        
+        return super().primaria()
+
+def mede(classe, tokens: list[Token], repeticoes: int = 3) -> float:
+    melhor = float("inf")
+
+    for _ in range(repeticoes):
+        parser = classe(tokens)
+
+        inicio = time.perf_counter()
+        parser.parse()
+        melhor = min(melhor, time.perf_counter() - inicio)
+
+    return melhor
+
+if __name__ == "__main__":
+    declaracoes = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+
+    lexer = LexerTabela(expressoes(declaracoes))
+    lexer.lex()
+
+    print(f"{declaracoes} declaracoes, {len(lexer.tokens)} tokens")
+
+    resultados = {}
+    for nome, classe in [("cascata", ParserCascata), ("pratt", Parser)]:
+        tempo = mede(classe, lexer.tokens)
+        resultados[nome] = tempo
+        print(f"{nome:>8}: {tempo:.3f}s ({len(lexer.tokens) / tempo:,.0f} tokens/s)")
+
+    print(f"Aceleracao: {resultados['cascata'] / resultados['pratt']:.1f}x")
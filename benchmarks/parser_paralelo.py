@@ -0,0 +1,43 @@
+# Mede como a analise sintatica paralela escala com o numero de funcoes e de
+# processos.
+#
+# Com 1 trabalhador os tokens sao analisados no proprio processo, sem dividir,
+# entao essa coluna eh a referencia da aceleracao.
+#
+# Uso: python -m benchmarks.parser_paralelo [numeros de funcoes...]
+
+from lexer.lex_tabela import LexerTabela
+from parser.parser_paralelo import ParserParalelo
+from .fontes import programa_funcoes
+import os
+import sys
+import time
+
+TRABALHADORES = [1, 2, 4, 8]
+
+def mede(tokens, trabalhadores: int, repeticoes: int = 3) -> float:
+    melhor = float("inf")
+
+    for _ in range(repeticoes):
+        parser = ParserParalelo(tokens, trabalhadores)
+
+        inicio = time.perf_counter()
+        parser.parse()
+        melhor = min(melhor, time.perf_counter() - inicio)
+
+    return melhor
+
+if __name__ == "__main__":
+    numeros = [int(arg) for arg in sys.argv[1:]] or [1000, 4000, 16000]
+
+    print(f"{os.cpu_count()} CPUs")
+    print(f"{'funcoes':>8} {'tokens':>9} " + " ".join(f"{f'{t} proc.':>16}" for t in TRABALHADORES))
+
+    for funcoes in numeros:
+        lexer = LexerTabela(programa_funcoes(funcoes))
+        lexer.lex()
+
+        tempos = [mede(lexer.tokens, trabalhadores) for trabalhadores in TRABALHADORES]
+        colunas = [f"{tempo:.3f}s ({tempos[0] / tempo:.2f}x)" for tempo in tempos]
+
+        print(f"{funcoes:>8} {len(lexer.tokens):>9} " + " ".join(f"{coluna:>16}" for coluna in colunas))
@@ -0,0 +1,51 @@
+# Compara uma passada que so le as assinaturas das funcoes com o
+# ParserPreguicoso (que pula os corpos) e com o Parser (que analisa tudo), e
+# mede quanto custa analisar depois todos os corpos adiados.
+#
+# Uso: python -m benchmarks.parser_preguicoso [numero de funcoes]
+
+from lexer.lex_tabela import LexerTabela
+from parser.parser import Parser
+from parser.parser_preguicoso import ParserPreguicoso
+from .fontes import programa_funcoes
+import sys
+import time
+
+def assinaturas(parser: Parser) -> int:
+    parser.parse()
+
+    return sum(len(funcao.params) for funcao in parser.declaracoes)
+
+def mede(funcao, repeticoes: int = 3) -> float:
+    melhor = float("inf")
+
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+
+    return melhor
+
+def completo(tokens) -> None:
+    parser = ParserPreguicoso(tokens)
+    parser.parse()
+
+    for funcao in parser.declaracoes:
+        funcao.corpo
+
+if __name__ == "__main__":
+    funcoes = int(sys.argv[1]) if len(sys.argv) > 1 else 4000
+
+    lexer = LexerTabela(programa_funcoes(funcoes))
+    lexer.lex()
+    tokens = lexer.tokens
+
+    print(f"{funcoes} funcoes, {len(tokens)} tokens")
+
+    referencia = mede(lambda: assinaturas(Parser(tokens)))
+    preguicoso = mede(lambda: assinaturas(ParserPreguicoso(tokens)))
+    tudo = mede(lambda: completo(tokens))
+
+    print(f"assinaturas com Parser:            {referencia:.3f}s ({len(tokens) / referencia:,.0f} tokens/s)")
+    print(f"assinaturas com ParserPreguicoso:  {preguicoso:.3f}s ({len(tokens) / preguicoso:,.0f} tokens/s, {referencia / preguicoso:.2f}x)")
+    print(f"ParserPreguicoso e todos os corpos: {tudo:.3f}s ({referencia / tudo:.2f}x)")
@@ -0,0 +1,31 @@
+# Mede o Resolvedor, que da a cada nome a coordenada (profundidade, slot) da
+# declaracao dele, em nos por segundo, e o compara com a AnaliseSemantica sobre
+# a mesma arvore.
+#
+# Uso: python -m benchmarks.resolvedor [numero de funcoes]
+
+from lexer.lex_tabela import LexerTabela
+from parser.parser import Parser
+from analise_semantica.resolvedor import Resolvedor
+from analise_semantica.validator import AnaliseSemantica
+from arvores_sintaticas.visitante import pre_ordem
+from .fontes import programa_funcoes
+from .visitante import mede
+import sys
+
+if __name__ == "__main__":
+    funcoes = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+    lexer = LexerTabela(programa_funcoes(funcoes))
+    lexer.lex()
+    parser = Parser(lexer.tokens)
+    parser.parse()
+    declaracoes = parser.declaracoes
+
+    nos = sum(1 for _ in pre_ordem(declaracoes))
+    resolvedor = mede(lambda: Resolvedor().resolver(declaracoes))
+    semantica = mede(lambda: AnaliseSemantica(lexer.simbolos).analisar(declaracoes))
+
+    print(f"{funcoes} funcoes, {nos} nos")
+    print(f"Resolvedor:       {resolvedor:.3f}s ({nos / resolvedor:,.0f} nos/s)")
+    print(f"AnaliseSemantica: {semantica:.3f}s ({nos / semantica:,.0f} nos/s)")
@@ -0,0 +1,71 @@
+# Compara a TabelaSimbolos, com uma pilha de declaracoes por simbolo, com a
+# tabela anterior, uma pilha de dicionarios em que buscar olha do escopo mais
+# interno ao mais externo. Cada rodada abre profundidade escopos, declara uma
+# variavel em cada um, busca as variaveis do escopo mais externo (o pior caso
+# da tabela anterior) e fecha os escopos.
+#
+# Uso: python -m benchmarks.tabela_simbolos [buscas por rodada]
+
+from analise_semantica.validator import TabelaSimbolos
+from arvores_sintaticas.declaracao import Tipo, TipoPrimitivo
+from lexer.simbolos import Simbolos
+import sys
+import time
+
+# A tabela anterior.
+class TabelaDicionarios:
+    def __init__(self, simbolos: Simbolos):
+        self.simbolos = simbolos
+        self.escopos: list[dict[int, Tipo]] = [{}]
+
+    def inserir(self, simbolo: int, tipo: Tipo):
+        if simbolo in self.escopos[-1]:
+            raise Exception(f"Erro: Variável '{self.simbolos.nome(simbolo)}' já declarada neste escopo.")
+        self.escopos[-1][simbolo] = tipo
+
+    def buscar(self, simbolo: int) -> Tipo:
+        for escopo in reversed(self.escopos):
+            if simbolo in escopo:
+                return escopo[simbolo]
+        raise Exception(f"Erro: Variável '{self.simbolos.nome(simbolo)}' não declarada.")
+
+    def novo_escopo(self):
+        self.escopos.append({})
+
+    def remover_escopo(self):
+        self.escopos.pop()
+
+def rodada(classe: type, simbolos: Simbolos, profundidade: int, buscas: int) -> float:
+    tabela = classe(simbolos)
+    inicio = time.perf_counter()
+
+    tabela.inserir(0, TipoPrimitivo.INT)
+
+    for nivel in range(1, profundidade + 1):
+        tabela.novo_escopo()
+        tabela.inserir(nivel, TipoPrimitivo.FLOAT)
+
+    for _ in range(buscas):
+        tabela.buscar(0)
+
+    for _ in range(profundidade):
+        tabela.remover_escopo()
+
+    return time.perf_counter() - inicio
+
+if __name__ == "__main__":
+    buscas = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+    simbolos = Simbolos()
+
+    for i in range(1001):
+        simbolos.interna(f"v{i}")
+
+    print(f"{buscas} buscas por rodada")
+
+    for profundidade in [1, 10, 100, 1000]:
+        antiga = min(rodada(TabelaDicionarios, simbolos, profundidade, buscas) for _ in range(3))
+        nova = min(rodada(TabelaSimbolos, simbolos, profundidade, buscas) for _ in range(3))
+
+        print(f"profundidade {profundidade:4}: dicionarios {buscas / antiga:12,.0f} buscas/s, "
+              f"pilhas por simbolo {buscas / nova:12,.0f} buscas/s ({antiga / nova:.1f}x)")
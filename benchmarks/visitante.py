@@ -0,0 +1,100 @@
+# Mede visitas por segundo da AnaliseSemantica, que escolhe o metodo de cada no
+# pela tabela do Visitante, contra a mesma analise escolhendo pela sequencia de
+# isinstance que ela usava antes, e a velocidade dos percursos com pilha
+# propria (pre_ordem e percorre).
+#
+# Uso: python -m benchmarks.visitante [numero de funcoes]
+
+from lexer.lex_tabela import LexerTabela
+from parser.parser import Parser
+from analise_semantica.validator import AnaliseSemantica
+from arvores_sintaticas.expressao import *
+from arvores_sintaticas.declaracao import *
+from arvores_sintaticas.visitante import pre_ordem, percorre
+from .fontes import programa_funcoes
+import sys
+import time
+
+# A AnaliseSemantica com a escolha do metodo por isinstance, na ordem antiga.
+class AnaliseIsinstance(AnaliseSemantica):
+    def visitar(self, no):
+        if isinstance(no, Declaracao):
+            if isinstance(no, Var):
+                return self.visitar_var(no)
+            elif isinstance(no, Funcao):
+                return self.visitar_funcao(no)
+            elif isinstance(no, Bloco):
+                return self.visitar_bloco(no)
+            elif isinstance(no, If):
+                return self.visitar_if(no)
+            elif isinstance(no, While):
+                return self.visitar_while(no)
+            elif isinstance(no, Return):
+                return self.visitar_return(no)
+            elif isinstance(no, Print):
+                return self.visitar_print(no)
+            elif isinstance(no, Expr):
+                return self.visitar_expr(no)
+        elif isinstance(no, Literal):
+            return self.visitar_literal(no)
+        elif isinstance(no, Variavel):
+            return self.visitar_variavel(no)
+        elif isinstance(no, Binaria):
+            return self.visitar_binaria(no)
+        elif isinstance(no, Unaria):
+            return self.visitar_unaria(no)
+        elif isinstance(no, Logica):
+            return self.visitar_logica(no)
+        elif isinstance(no, Lista):
+            return self.visitar_lista(no)
+        elif isinstance(no, ListaCompacta):
+            return self.visitar_listacompacta(no)
+        elif isinstance(no, Agrupamento):
+            return self.visitar_agrupamento(no)
+        elif isinstance(no, Atribuicao):
+            return self.visitar_atribuicao(no)
+        elif isinstance(no, Chamada):
+            return self.visitar_chamada(no)
+
+        return self.desconhecido(no)
+
+def mede(funcao, repeticoes: int = 5) -> float:
+    melhor = float("inf")
+
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+
+    return melhor
+
+def analisa(classe: type[AnaliseSemantica], lexer: LexerTabela, declaracoes: list[Declaracao]) -> None:
+    classe(lexer.simbolos).analisar(declaracoes)
+
+def esvazia(iterador) -> None:
+    for _ in iterador:
+        pass
+
+if __name__ == "__main__":
+    funcoes = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+    lexer = LexerTabela(programa_funcoes(funcoes))
+    lexer.lex()
+    parser = Parser(lexer.tokens)
+    parser.parse()
+    declaracoes = parser.declaracoes
+
+    # A analise visita todos os nos menos os parametros.
+    nos = sum(1 for no in pre_ordem(declaracoes))
+    visitas = sum(1 for no in pre_ordem(declaracoes) if not isinstance(no, Parametro))
+
+    isinstance_ = mede(lambda: analisa(AnaliseIsinstance, lexer, declaracoes))
+    tabela = mede(lambda: analisa(AnaliseSemantica, lexer, declaracoes))
+    pre = mede(lambda: esvazia(pre_ordem(declaracoes)))
+    entrada_saida = mede(lambda: esvazia(percorre(declaracoes)))
+
+    print(f"{funcoes} funcoes, {nos} nos")
+    print(f"AnaliseSemantica com isinstance: {isinstance_:.3f}s ({visitas / isinstance_:,.0f} visitas/s)")
+    print(f"AnaliseSemantica com a tabela:   {tabela:.3f}s ({visitas / tabela:,.0f} visitas/s, {isinstance_ / tabela:.2f}x)")
+    print(f"pre_ordem:                       {pre:.3f}s ({nos / pre:,.0f} nos/s)")
+    print(f"percorre (entrada e saida):      {entrada_saida:.3f}s ({nos / entrada_saida:,.0f} nos/s)")
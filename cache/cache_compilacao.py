@@ -0,0 +1,385 @@
+from lexer.lex_token import Token, TokenType
+from lexer.linhas import IndiceLinhas
+from lexer.simbolos import Simbolos
+from lexer.token_buffer import CODIGOS, TIPOS
+from arvores_sintaticas.declaracao import Declaracao, TipoLista, TipoPrimitivo
+from arvores_sintaticas.arena import Arena, de_objetos, para_objetos
+from array import array
+from typing import Optional
+import hashlib
+import os
+import struct
+import sys
+import tempfile
+
+# Cache em disco dos tokens e das arvores sintaticas de cada codigo-fonte.
+#
+# Cada entrada eh um arquivo no diretorio do cache, com o nome dado pelo
+# SHA-256 da versao do compilador e do codigo-fonte: um codigo igual, compilado
+# pela mesma versao, tem os mesmos tokens e a mesma arvore. A versao do
+# compilador eh o hash dos arquivos .py do lexer, do parser e das arvores, entao
+# qualquer mudanca neles invalida o cache inteiro.
+#
+# O conteudo eh um formato binario proprio, com um cabecalho com a versao do
+# formato: os tokens (tipo, posicao e lexema, numa tabela de lexemas distintos,
+# com a marca de quais sao identificadores)
+# e a arvore como uma Arena (veja arvores_sintaticas.arena), cujos arrays sao
+# gravados direto. Os simbolos dos identificadores nao sao gravados: internar
+# os lexemas dos identificadores na ordem em que aparecem da os mesmos
+# simbolos que a analise lexica daria. As linhas vem do proprio codigo-fonte.
+#
+# Uma entrada eh escrita num arquivo temporario no mesmo diretorio e depois
+# renomeada (os.replace eh atomico), entao processos que gravam a mesma entrada
+# ao mesmo tempo nao deixam arquivos pela metade. Cada acerto atualiza a data
+# de modificacao do arquivo; quando o diretorio passa de tamanho_maximo bytes,
+# as entradas usadas ha mais tempo sao apagadas. Uma entrada que nao pode ser
+# lida (corrompida ou de outro formato) conta como falha e eh apagada.
+#
+# So compilacoes sem erros sao guardadas.
+
+MAGICO = b"OESTE"
+FORMATO = 2
+EXTENSAO = ".ast"
+
+# Arquivos que definem os tokens e as arvores, e portanto o que fica no cache.
+PACOTES = ["lexer", "parser", "arvores_sintaticas"]
+
+_versao: Optional[bytes] = None
+
+def versao_compilador() -> bytes:
+    global _versao
+
+    if _versao is None:
+        raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        hash = hashlib.sha256()
+
+        for pacote in PACOTES:
+            for nome in sorted(os.listdir(os.path.join(raiz, pacote))):
+                if nome.endswith(".py"):
+                    with open(os.path.join(raiz, pacote, nome), "rb") as arquivo:
+                        hash.update(nome.encode() + b"\0" + arquivo.read())
+
+        _versao = hash.digest()
+
+    return _versao
+
+# Etiquetas dos valores guardados nas constantes da arena.
+NULO, BOOL, INT, FLOAT, STR, TIPO_TOKEN, TIPO_PRIMITIVO, TIPO_LISTA, ARRAY = range(9)
+
+# Monta o conteudo de um arquivo do cache em partes, cada uma com o tamanho na frente.
+class Escritor:
+    def __init__(self) -> None:
+        self.partes: list[bytes] = [MAGICO, struct.pack("<H", FORMATO)]
+
+    def inteiro(self, valor: int) -> None:
+        self.partes.append(struct.pack("<q", valor))
+
+    def bytes(self, dados: bytes) -> None:
+        self.partes.append(struct.pack("<I", len(dados)))
+        self.partes.append(dados)
+
+    def array(self, valores: array) -> None:
+        if sys.byteorder == "big":
+            valores = array(valores.typecode, valores)
+            valores.byteswap()
+
+        self.bytes(valores.tobytes())
+
+    def textos(self, textos: list[str]) -> None:
+        codificados = [texto.encode("utf-8", "surrogatepass") for texto in textos]
+
+        self.array(array('I', [len(texto) for texto in codificados]))
+        self.bytes(b"".join(codificados))
+
+    def valor(self, valor) -> None:
+        if valor is None:
+            self.partes.append(bytes([NULO]))
+        elif isinstance(valor, bool):
+            self.partes.append(bytes([BOOL, valor]))
+        elif isinstance(valor, int):
+            # Os literais inteiros nao tem limite de tamanho.
+            self.partes.append(bytes([INT]))
+            self.bytes(str(valor).encode())
+        elif isinstance(valor, float):
+            self.partes.append(bytes([FLOAT]) + struct.pack("<d", valor))
+        elif isinstance(valor, str):
+            self.partes.append(bytes([STR]))
+            self.bytes(valor.encode("utf-8", "surrogatepass"))
+        elif isinstance(valor, TokenType):
+            self.partes.append(bytes([TIPO_TOKEN, CODIGOS[valor]]))
+        elif isinstance(valor, TipoPrimitivo):
+            self.partes.append(bytes([TIPO_PRIMITIVO, valor.value]))
+        elif isinstance(valor, TipoLista):
+            self.partes.append(bytes([TIPO_LISTA, valor.interno.value]))
+        elif isinstance(valor, array):
+            # Os valores de uma ListaCompacta.
+            self.partes.append(bytes([ARRAY]) + valor.typecode.encode())
+            self.array(valor)
+        else:
+            raise ValueError(f"Valor que nao pode ir para o cache: {valor!r}")
+
+    def conteudo(self) -> bytes:
+        return b"".join(self.partes)
+
+# Le, na mesma ordem, o que o Escritor gravou. Dados truncados ou invalidos
+# lancam ValueError.
+class Leitor:
+    def __init__(self, dados: bytes) -> None:
+        self.dados = memoryview(dados)
+        self.posicao = 0
+
+        if bytes(self.le(len(MAGICO))) != MAGICO or struct.unpack("<H", self.le(2))[0] != FORMATO:
+            raise ValueError("Arquivo de cache de outro formato.")
+
+    def le(self, tamanho: int) -> memoryview:
+        fim = self.posicao + tamanho
+
+        if fim > len(self.dados):
+            raise ValueError("Arquivo de cache truncado.")
+
+        trecho = self.dados[self.posicao:fim]
+        self.posicao = fim
+
+        return trecho
+
+    def inteiro(self) -> int:
+        return struct.unpack("<q", self.le(8))[0]
+
+    def bytes(self) -> memoryview:
+        return self.le(struct.unpack("<I", self.le(4))[0])
+
+    def array(self, tipo: str) -> array:
+        valores = array(tipo)
+        dados = self.bytes()
+
+        if len(dados) % valores.itemsize:
+            raise ValueError("Array de tamanho invalido no arquivo de cache.")
+
+        valores.frombytes(dados)
+
+        if sys.byteorder == "big":
+            valores.byteswap()
+
+        return valores
+
+    def textos(self) -> list[str]:
+        tamanhos = self.array('I')
+        dados = self.bytes()
+        textos = []
+        pos = 0
+
+        for tamanho in tamanhos:
+            textos.append(str(dados[pos:pos + tamanho], "utf-8", "surrogatepass"))
+            pos += tamanho
+
+        if pos != len(dados):
+            raise ValueError("Tabela de textos invalida no arquivo de cache.")
+
+        return textos
+
+    def valor(self):
+        etiqueta = self.le(1)[0]
+
+        if etiqueta == NULO:
+            return None
+        if etiqueta == BOOL:
+            return bool(self.le(1)[0])
+        if etiqueta == INT:
+            return int(bytes(self.bytes()))
+        if etiqueta == FLOAT:
+            return struct.unpack("<d", self.le(8))[0]
+        if etiqueta == STR:
+            return bytes(self.bytes()).decode("utf-8", "surrogatepass")
+        if etiqueta == TIPO_TOKEN:
+            return TIPOS[self.le(1)[0]]
+        if etiqueta == TIPO_PRIMITIVO:
+            return TipoPrimitivo(self.le(1)[0])
+        if etiqueta == TIPO_LISTA:
+            return TipoLista(TipoPrimitivo(self.le(1)[0]))
+        if etiqueta == ARRAY:
+            codigo = bytes(self.le(1)).decode()
+
+            if codigo not in ('q', 'd'):
+                raise ValueError(f"Array de codigo invalido no arquivo de cache: {codigo!r}")
+
+            return self.array(codigo)
+
+        raise ValueError(f"Etiqueta desconhecida no arquivo de cache: {etiqueta}")
+
+    def termina(self) -> None:
+        if self.posicao != len(self.dados):
+            raise ValueError("Dados sobrando no arquivo de cache.")
+
+# Conteudo de uma entrada do cache com os tokens e a arena.
+def codifica(tokens: list[Token], arena: Arena) -> bytes:
+    escritor = Escritor()
+
+    # Um lexema que aparece como identificador e como outro token (o texto de
+    # uma string, por exemplo) ocupa duas entradas da tabela.
+    indices: dict[tuple[str, bool], int] = {}
+    tabela: list[str] = []
+    identificadores = array('B')
+    lexemas = array('I')
+
+    for token in tokens:
+        chave = (token.lexema, token.tipo is TokenType.IDENTIFICADOR)
+        indice = indices.get(chave)
+
+        if indice is None:
+            indice = indices[chave] = len(tabela)
+            tabela.append(token.lexema)
+            identificadores.append(chave[1])
+
+        lexemas.append(indice)
+
+    escritor.bytes(bytes([CODIGOS[token.tipo] for token in tokens]))
+    escritor.array(array('I', [token.posicao for token in tokens]))
+    escritor.array(lexemas)
+    escritor.textos(tabela)
+    escritor.array(identificadores)
+
+    for campo in [arena.tipos, arena.token, arena.constante, arena.inicios, arena.filhos, arena.raizes]:
+        escritor.array(campo)
+
+    escritor.inteiro(len(arena.constantes))
+
+    for constante in arena.constantes:
+        escritor.inteiro(len(constante))
+
+        for valor in constante:
+            escritor.valor(valor)
+
+    return escritor.conteudo()
+
+# Tokens e arena de uma entrada do cache. Os identificadores sao internados em simbolos.
+def decodifica(dados: bytes, fonte: str, simbolos: Simbolos) -> tuple[list[Token], Arena]:
+    leitor = Leitor(dados)
+
+    tipos = leitor.bytes()
+    posicoes = leitor.array('I')
+    lexemas = leitor.array('I')
+    tabela = leitor.textos()
+    identificadores = leitor.array('B')
+
+    if not (len(tipos) == len(posicoes) == len(lexemas)) or len(identificadores) != len(tabela):
+        raise ValueError("Tokens inconsistentes no arquivo de cache.")
+
+    # Na ordem da tabela, que eh a ordem em que os lexemas aparecem.
+    simbolos_tabela = [simbolos.interna(lexema) if identificador else -1 for lexema, identificador in zip(tabela, identificadores)]
+    linhas = IndiceLinhas(fonte)
+
+    tokens = [
+        Token(TIPOS[tipo], tabela[lexema], simbolo = simbolos_tabela[lexema], posicao = posicao, linhas = linhas)
+        for tipo, posicao, lexema in zip(tipos, posicoes, lexemas)
+    ]
+
+    arena = Arena(tokens)
+    arena.tipos = leitor.array('B')
+    arena.token = leitor.array('i')
+    arena.constante = leitor.array('i')
+    arena.inicios = leitor.array('I')
+    arena.filhos = leitor.array('i')
+    arena.raizes = leitor.array('i')
+    arena.constantes = [
+        tuple(leitor.valor() for _ in range(leitor.inteiro()))
+        for _ in range(leitor.inteiro())
+    ]
+
+    leitor.termina()
+
+    return tokens, arena
+
+class CacheCompilacao:
+    def __init__(self, diretorio: str, tamanho_maximo: int = 64 << 20) -> None:
+        self.diretorio = diretorio
+        self.tamanho_maximo = tamanho_maximo
+        self.acertos = 0
+        self.falhas = 0
+        os.makedirs(diretorio, exist_ok = True)
+
+    def caminho(self, fonte: str) -> str:
+        hash = hashlib.sha256(versao_compilador())
+        hash.update(fonte.encode("utf-8", "surrogatepass"))
+
+        return os.path.join(self.diretorio, hash.hexdigest() + EXTENSAO)
+
+    # Retorna os tokens e as declaracoes guardados para fonte, ou None.
+    def carrega(self, fonte: str, simbolos: Simbolos) -> Optional[tuple[list[Token], list[Declaracao]]]:
+        caminho = self.caminho(fonte)
+
+        try:
+            with open(caminho, "rb") as arquivo:
+                dados = arquivo.read()
+        except OSError:
+            self.falhas += 1
+            return None
+
+        # Os simbolos so sao internados se a entrada inteira for valida.
+        copia = Simbolos()
+        copia.nomes, copia.ids = list(simbolos.nomes), dict(simbolos.ids)
+
+        try:
+            tokens, arena = decodifica(dados, fonte, copia)
+            declaracoes = para_objetos(arena)
+        except (ValueError, IndexError, KeyError, struct.error):
+            self.falhas += 1
+            self.apaga(caminho)
+            return None
+
+        for nome in copia.nomes[len(simbolos.nomes):]:
+            simbolos.interna(nome)
+
+        self.acertos += 1
+
+        try:
+            os.utime(caminho)
+        except OSError:
+            pass
+
+        return tokens, declaracoes
+
+    # Guarda os tokens e as declaracoes de fonte, que precisam ter sido
+    # analisados sem erros, e apaga as entradas mais antigas se precisar.
+    def guarda(self, fonte: str, tokens: list[Token], declaracoes: list[Declaracao]) -> None:
+        dados = codifica(tokens, de_objetos(declaracoes, tokens))
+
+        descritor, temporario = tempfile.mkstemp(dir = self.diretorio, suffix = ".tmp")
+
+        try:
+            with os.fdopen(descritor, "wb") as arquivo:
+                arquivo.write(dados)
+
+            os.replace(temporario, self.caminho(fonte))
+        except BaseException:
+            self.apaga(temporario)
+            raise
+
+        self.despeja()
+
+    # Apaga as entradas usadas ha mais tempo ate o diretorio caber em tamanho_maximo.
+    def despeja(self) -> None:
+        entradas = []
+
+        for entrada in os.scandir(self.diretorio):
+            if entrada.name.endswith(EXTENSAO):
+                try:
+                    estado = entrada.stat()
+                except OSError:
+                    continue
+
+                entradas.append((estado.st_mtime_ns, estado.st_size, entrada.path))
+
+        total = sum(tamanho for _, tamanho, _ in entradas)
+
+        for _, tamanho, caminho in sorted(entradas):
+            if total <= self.tamanho_maximo:
+                break
+
+            self.apaga(caminho)
+            total -= tamanho
+
+    def apaga(self, caminho: str) -> None:
+        try:
+            os.remove(caminho)
+        except OSError:
+            pass
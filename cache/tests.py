@@ -0,0 +1,168 @@
+from .cache_compilacao import CacheCompilacao, EXTENSAO
+from lexer.lex_tabela import LexerTabela
+from lexer.simbolos import Simbolos
+from parser.parser import Parser
+from parser.tests import estrutura
+
+import os
+import tempfile
+import unittest
+
+FONTE = """
+xerife grande: int = 123456789012345678901234567890;
+xerife taxa: float = 0.1;
+xerife nome: string = "pistoleiro ção ☠";
+xerife l: lista[float] = [1.0, 0.5];
+xerife m: lista[int] = [3, -9223372036854775808, 7];
+procurado soma(x: int, ys: lista[int]): lista[int] {
+    xerife r: int = x + grande * (2 - x);
+    bang (r > 0 && !(r == 3)) { vorta [r, x]; } miss vorta ys;
+}
+cavalgando (taxa < 100.0) { taxa = taxa + 1.0; atire [nome, "a"]; }
+"""
+
+# Tokens e declaracoes de fonte, analisados do zero.
+def compila(fonte: str, simbolos: Simbolos):
+    lexer = LexerTabela(fonte, simbolos)
+    lexer.lex()
+    parser = Parser(lexer.tokens)
+    parser.parse()
+    
+    return lexer.tokens, parser.declaracoes
+
+def entradas(diretorio: str) -> list[str]:
+    return sorted(nome for nome in os.listdir(diretorio) if nome.endswith(EXTENSAO))
+
+class CacheCompilacaoTests(unittest.TestCase):
+    def setUp(self):
+        self.temporario = tempfile.TemporaryDirectory()
+        self.diretorio = self.temporario.name
+    
+    def tearDown(self):
+        self.temporario.cleanup()
+    
+    def guarda(self, cache: CacheCompilacao, fonte: str = FONTE) -> None:
+        cache.guarda(fonte, *compila(fonte, Simbolos()))
+    
+    def teste_carrega_o_que_foi_guardado(self):
+        cache = CacheCompilacao(self.diretorio)
+        self.assertIsNone(cache.carrega(FONTE, Simbolos()))
+        self.guarda(cache)
+        
+        simbolos = Simbolos()
+        tokens, declaracoes = cache.carrega(FONTE, simbolos)
+        
+        referencia = Simbolos()
+        tokens_referencia, declaracoes_referencia = compila(FONTE, referencia)
+        
+        self.assertEqual(estrutura(declaracoes), estrutura(declaracoes_referencia))
+        self.assertEqual(
+            [(t.tipo, t.lexema, t.simbolo, t.posicao, t.linha, t.coluna) for t in tokens],
+            [(t.tipo, t.lexema, t.simbolo, t.posicao, t.linha, t.coluna) for t in tokens_referencia],
+        )
+        self.assertEqual(simbolos.nomes, referencia.nomes)
+        self.assertEqual((cache.acertos, cache.falhas), (1, 1))
+    
+    def teste_simbolos_ja_internados_sao_mantidos(self):
+        cache = CacheCompilacao(self.diretorio)
+        self.guarda(cache)
+        
+        simbolos = Simbolos()
+        outro = simbolos.interna("outro")
+        tokens, _ = cache.carrega(FONTE, simbolos)
+        
+        self.assertEqual(simbolos.nome(outro), "outro")
+        
+        for token in tokens:
+            if token.simbolo >= 0:
+                self.assertEqual(simbolos.nome(token.simbolo), token.lexema)
+    
+    def teste_string_com_o_texto_de_um_identificador(self):
+        fonte = 'atire "x"; xerife x: int = 1; atire x + 1;'
+        cache = CacheCompilacao(self.diretorio)
+        self.guarda(cache, fonte)
+        
+        simbolos = Simbolos()
+        tokens, declaracoes = cache.carrega(fonte, simbolos)
+        
+        referencia = Simbolos()
+        tokens_referencia, declaracoes_referencia = compila(fonte, referencia)
+        
+        self.assertEqual(estrutura(declaracoes), estrutura(declaracoes_referencia))
+        self.assertEqual([(t.tipo, t.lexema, t.simbolo) for t in tokens], [(t.tipo, t.lexema, t.simbolo) for t in tokens_referencia])
+        self.assertEqual(simbolos.nomes, ["x"])
+    
+    def teste_outro_codigo_nao_acerta(self):
+        cache = CacheCompilacao(self.diretorio)
+        self.guarda(cache)
+        
+        self.assertIsNone(cache.carrega(FONTE + " ", Simbolos()))
+        self.assertEqual((cache.acertos, cache.falhas), (0, 1))
+    
+    def teste_outra_versao_do_compilador_nao_acerta(self):
+        cache = CacheCompilacao(self.diretorio)
+        self.guarda(cache)
+        
+        from . import cache_compilacao
+        versao = cache_compilacao._versao
+        
+        try:
+            cache_compilacao._versao = b"outra"
+            self.assertIsNone(cache.carrega(FONTE, Simbolos()))
+        finally:
+            cache_compilacao._versao = versao
+    
+    def teste_entrada_corrompida_conta_como_falha_e_eh_apagada(self):
+        cache = CacheCompilacao(self.diretorio)
+        self.guarda(cache)
+        caminho = cache.caminho(FONTE)
+        
+        with open(caminho, "rb") as arquivo:
+            dados = arquivo.read()
+        
+        for corrompido in [dados[:len(dados) // 2], b"lixo" + dados, dados + b"\0"]:
+            with open(caminho, "wb") as arquivo:
+                arquivo.write(corrompido)
+            
+            simbolos = Simbolos()
+            self.assertIsNone(cache.carrega(FONTE, simbolos))
+            self.assertFalse(os.path.exists(caminho))
+            self.assertEqual(simbolos.nomes, [])
+        
+        self.assertEqual((cache.acertos, cache.falhas), (0, 3))
+    
+    def teste_apaga_as_entradas_usadas_ha_mais_tempo(self):
+        fontes = [FONTE + f"xerife v{i}: int = {i};" for i in range(3)]
+        cache = CacheCompilacao(self.diretorio)
+        
+        for i, fonte in enumerate(fontes):
+            self.guarda(cache, fonte)
+            os.utime(cache.caminho(fonte), ns = (i * 10**9, i * 10**9))
+        
+        # Usar a primeira faz dela a mais recente.
+        self.assertIsNotNone(cache.carrega(fontes[0], Simbolos()))
+        
+        tamanho = os.path.getsize(cache.caminho(fontes[0]))
+        cache.tamanho_maximo = 2 * tamanho + tamanho // 2
+        cache.despeja()
+        
+        self.assertTrue(os.path.exists(cache.caminho(fontes[0])))
+        self.assertFalse(os.path.exists(cache.caminho(fontes[1])))
+        self.assertTrue(os.path.exists(cache.caminho(fontes[2])))
+    
+    def teste_nao_deixa_arquivos_temporarios(self):
+        cache = CacheCompilacao(self.diretorio)
+        
+        for i in range(3):
+            self.guarda(cache)
+            self.guarda(cache, FONTE + "atire 1;")
+        
+        self.assertEqual(sorted(os.listdir(self.diretorio)), entradas(self.diretorio))
+        self.assertEqual(len(entradas(self.diretorio)), 2)
+    
+    def teste_tamanho_maximo_pequeno_nao_guarda_nada(self):
+        cache = CacheCompilacao(self.diretorio, tamanho_maximo = 16)
+        self.guarda(cache)
+        
+        self.assertEqual(os.listdir(self.diretorio), [])
+        self.assertIsNone(cache.carrega(FONTE, Simbolos()))
@@ -1,16 +1,21 @@
 from .lex_token import TokenType, Token, PALAVRAS_RESERVADAS
 from .lex_error import LexErrorType, LexError
+from .simbolos import Simbolos
+from .linhas import IndiceLinhas
 from typing import Optional
 
 # Classe que vai fazer a análise lexica a partir do codigo-fonte.
 # Crafting Interpreters, Robert Nystrom - Cap. 4.
 
 class Lexer:
-    def __init__(self, source: str) -> None:
+    def __init__(self, source: str, simbolos: Optional[Simbolos] = None) -> None:
         self.source = source
+        self.simbolos = simbolos if simbolos is not None else Simbolos()
         self.tokens: list[Token] = []
+        self.erros: list[LexError] = []
         self.ocorreu_erro: bool = False
-        self.linha = 1
+        # As linhas sao calculadas a partir das posicoes (veja lexer.linhas).
+        self.linhas = IndiceLinhas(source)
         self.posicao = 0
         self.inicio = 0
     
@@ -23,7 +28,7 @@ class Lexer:
         if self.ocorreu_erro:
             exit(1)
 
-        self.tokens.append(Token(TokenType.EOF, "", self.linha))
+        self.tokens.append(Token(TokenType.EOF, "", posicao = self.posicao, linhas = self.linhas))
 
     # Caso o proximo lexema seja um token valido, o adiciona na lista de tokens.
     # Caso contrario, adiciona um erro lexico na lista de erros.
@@ -91,11 +96,8 @@ class Lexer:
             case c if c.isalnum():
                 self.lex_palavra()
 
-            case '\n':
-                self.linha += 1
-
             # Ignorando whitespace
-            case ' ' | '\r' | '\t':
+            case ' ' | '\r' | '\t' | '\n':
                 pass
 
             case _:
@@ -107,15 +109,11 @@ class Lexer:
     # adiciona o token da string caso seja válida.
     # Se a string nao foi fechada, adiciona um erro a lista de erros.
     def lex_string(self) -> None:
-        linha_inicio_string = self.linha
-        
         while self.peek() != '"' and not self.fim_codigo():
-            if self.peek() == '\n': self.linha += 1
-            
             self.avanca()
         
         if self.fim_codigo():
-            self.add_error(LexErrorType.STRING_INTERMINADA, linha = linha_inicio_string)
+            self.add_error(LexErrorType.STRING_INTERMINADA)
             return
         
         self.avanca()
@@ -127,8 +125,8 @@ class Lexer:
     # adiciona o token como float, adiciona como int caso contrario.
     #
     # Exemplos:
-    # "123" -> Token(INT, "123", linha = 1)
-    # "123.5" -> Token(FLOAT, "123.5", linha = 1)
+    # "123" -> Token(INT, "123", posicao = 0)
+    # "123.5" -> Token(FLOAT, "123.5", posicao = 0)
     def lex_numero(self) -> None:  
         self.consome_seq_digitos()
             
@@ -171,7 +169,11 @@ class Lexer:
                       if lexema in PALAVRAS_RESERVADAS 
                       else TokenType.IDENTIFICADOR)
         
-        self.add_token(tipo_token)
+        if tipo_token == TokenType.IDENTIFICADOR:
+            self.tokens.append(Token(tipo_token, lexema, simbolo = self.simbolos.interna(lexema),
+                                     posicao = self.inicio, linhas = self.linhas))
+        else:
+            self.add_token(tipo_token)
     
     # Consome caracteres do codigo-fonte enquanto eles
     # forem numericos
@@ -186,15 +188,14 @@ class Lexer:
         if lexema is None:
             lexema = self.source[self.inicio : self.posicao]
 
-        self.tokens.append(Token(tipo, lexema, self.linha))
+        self.tokens.append(Token(tipo, lexema, posicao = self.inicio, linhas = self.linhas))
 
-    def add_error(self, tipo: LexErrorType, lexema: Optional[str] = None, linha: Optional[int] = None):
-        if linha is None:
-            linha = self.linha
-                        
-        erro = LexError(tipo, lexema, linha)
+    # O erro fica na posicao do lexema atual.
+    def add_error(self, tipo: LexErrorType, lexema: Optional[str] = None):
+        erro = LexError(tipo, lexema, posicao = self.inicio, linhas = self.linhas)
         erro.report()
         
+        self.erros.append(erro)
         self.ocorreu_erro = True
 
     # Consome um caracter do codigo-fonte e o retorna.
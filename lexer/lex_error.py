@@ -1,3 +1,4 @@
+from .linhas import IndiceLinhas
 from enum import Enum, auto
 from typing import Optional
 
@@ -7,11 +8,35 @@ class LexErrorType(Enum):
     OU_INESPERADO = auto()
     STRING_INTERMINADA = auto()
     
+# Como Token, guarda a posicao do erro e calcula a linha e a coluna quando pedidas.
 class LexError:
-    def __init__(self, tipo: LexErrorType, lexema: Optional[str], linha: int) -> None:
+    def __init__(
+        self,
+        tipo: LexErrorType,
+        lexema: Optional[str],
+        linha: Optional[int] = None,
+        posicao: int = -1,
+        linhas: Optional[IndiceLinhas] = None,
+    ) -> None:
         self.tipo = tipo
         self.lexema = lexema
-        self.linha = linha
+        self.posicao = posicao
+        self.linhas = linhas
+        self._linha = linha
+    
+    @property
+    def linha(self) -> int:
+        if self.linhas is None:
+            return self._linha
+        
+        return self.linhas.linha(self.posicao)
+    
+    @property
+    def coluna(self) -> Optional[int]:
+        if self.linhas is None:
+            return None
+        
+        return self.linhas.coluna(self.posicao)
     
     def __eq__(self, other) -> bool:
         if isinstance(other, LexError):
@@ -22,7 +47,10 @@ class LexError:
     # Printa uma mensagem customizada a partir do tipo do erro
     def report(self) -> None:
         print("\033[91mErro na analise lexica:\033[0m")
-        print("Linha " + str(self.linha))
+        if self.coluna is None:
+            print("Linha " + str(self.linha))
+        else:
+            print("Linha " + str(self.linha) + ", coluna " + str(self.coluna))
         
         match self.tipo:
             case LexErrorType.STRING_INTERMINADA:
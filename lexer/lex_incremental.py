@@ -0,0 +1,102 @@
+from .lex_token import TokenType
+from .token_buffer import TokenBuffer, LexerBuffer
+from .linhas import junta, reais
+from bisect import bisect_left
+
+# Analise lexica incremental de um codigo-fonte editado.
+#
+# Dado o TokenBuffer de uma versao anterior do codigo e uma edicao (o trecho
+# [inicio, fim) da versao anterior trocado por texto), so a regiao afetada
+# eh analisada de novo:
+#
+# - Os tokens que terminam antes da edicao (com folga para o caracter de
+#   lookahead depois deles) sao mantidos. A analise recomeca logo depois do
+#   ultimo deles, onde o lexer estava no estado inicial.
+# - A analise para assim que um token novo comeca depois da edicao na mesma
+#   posicao relativa em que um token antigo comecava. Dali em diante o texto eh
+#   o mesmo, entao os tokens antigos restantes sao reaproveitados, deslocados
+#   pela diferenca de tamanho.
+#
+# Nem as posicoes dos tokens reaproveitados nem o indice de linhas sao refeitos
+# a cada edicao: o indice eh o da versao anterior, editado (IndiceLinhas.edita),
+# e o deslocamento das posicoes depois da edicao fica pendente num
+# PosicoesDeslocadas (veja lexer.linhas). Assim, fora as copias dos arrays, o
+# trabalho de cada edicao eh proporcional a regiao analisada de novo e a
+# distancia ate a edicao anterior, e nao ao tamanho do codigo-fonte.
+#
+# O resultado eh igual ao de analisar a nova versao inteira, inclusive nos
+# erros: como a versao anterior nao tinha erros, eles so podem estar na regiao
+# analisada de novo.
+
+class _Sincronizado(Exception):
+    pass
+
+class _LexerRelexa(LexerBuffer):
+    def __init__(self, source: str, tokens: TokenBuffer, antigo: TokenBuffer, fim_edicao: int, delta: int) -> None:
+        super().__init__(source, antigo.simbolos, tokens.linhas)
+        self.tokens = tokens
+        self.antigo = antigo
+        self.fim_edicao = fim_edicao
+        self.delta = delta
+        # Indice do primeiro token antigo que comeca depois da edicao.
+        self.proximo_antigo = bisect_left(antigo.inicios, fim_edicao - delta)
+        # Token antigo em que os dois fluxos se alinharam.
+        self.sincronia = -1
+
+    def emite(self, tipo: TokenType, inicio: int, fim: int, lexema: str, simbolo: int = -1) -> None:
+        if inicio >= self.fim_edicao:
+            inicios = self.antigo.inicios
+            alvo = inicio - self.delta
+
+            while self.proximo_antigo < len(inicios) and inicios[self.proximo_antigo] < alvo:
+                self.proximo_antigo += 1
+
+            if self.proximo_antigo < len(inicios) and inicios[self.proximo_antigo] == alvo:
+                self.sincronia = self.proximo_antigo
+                raise _Sincronizado()
+
+        super().emite(tipo, inicio, fim, lexema, simbolo)
+
+# Retorna os tokens do codigo-fonte de antigo depois de trocar o trecho
+# [inicio, fim) por texto.
+def relexa(antigo: TokenBuffer, inicio: int, fim: int, texto: str) -> TokenBuffer:
+    fonte = antigo.fonte[:inicio] + texto + antigo.fonte[fim:]
+    delta = len(texto) - (fim - inicio)
+
+    # Tokens mantidos: os que terminam antes de inicio - 1.
+    mantidos = bisect_left(antigo.fins, inicio - 1)
+    # O ultimo token eh sempre o EOF, que precisa ser refeito.
+    mantidos = min(mantidos, len(antigo) - 1)
+
+    novo = TokenBuffer(fonte, antigo.simbolos, antigo.linhas.edita(inicio, fim, texto))
+    # A tabela de lexemas so cresce, entao pode ser compartilhada.
+    novo.tabela = antigo.tabela
+    novo.indices = antigo.indices
+    novo.simbolos_tabela = antigo.simbolos_tabela
+
+    novo.tipos.extend(antigo.tipos[:mantidos])
+    novo.lexemas.extend(antigo.lexemas[:mantidos])
+    novo.inicios = reais(antigo.inicios, mantidos)
+    novo.fins = reais(antigo.fins, mantidos)
+
+    lexer = _LexerRelexa(fonte, novo, antigo, inicio + len(texto), delta)
+
+    if mantidos > 0:
+        lexer.posicao = antigo.fins[mantidos - 1]
+
+    try:
+        lexer.lex()
+    except _Sincronizado:
+        if lexer.ocorreu_erro:
+            exit(1)
+    else:
+        return novo
+
+    j = lexer.sincronia
+
+    novo.tipos.extend(antigo.tipos[j:])
+    novo.lexemas.extend(antigo.lexemas[j:])
+    novo.inicios = junta(novo.inicios, antigo.inicios, j, delta)
+    novo.fins = junta(novo.fins, antigo.fins, j, delta)
+
+    return novo
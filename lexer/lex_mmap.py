@@ -0,0 +1,276 @@
+from .lex_token import TokenType, PALAVRAS_RESERVADAS
+from .lex_error import LexErrorType, LexError
+from .simbolos import Simbolos
+from .linhas import IndiceLinhasBytes
+from .lex_tabela import (
+    TOKENS_FIXOS, ERROS_PREFIXO, COMENTARIO, ASPAS,
+    ESPACO, LETRA, DIGITO, OPERADOR, BARRA, STRING, OUTRO,
+    _classifica,
+)
+from typing import Optional
+import mmap
+import re
+
+# Analise lexica direto sobre os bytes (UTF-8) de um arquivo mapeado em memoria.
+#
+# O arquivo nao eh lido para uma str: os tokens guardam so o intervalo
+# [inicio, fim) do seu lexema no buffer, e o texto so eh decodificado quando
+# alguem le Token.lexema. Tokens de tamanho fixo e palavras reservadas nao
+# precisam nem disso, o lexema deles eh sempre o mesmo, e cada identificador
+# distinto eh decodificado uma vez so, quando recebe o seu simbolo.
+#
+# Diferente de ler o arquivo em modo texto, as quebras de linha nao sao
+# normalizadas: um '\r' eh so um espaco em branco, e continua dentro de strings.
+# As linhas e colunas vem de um IndiceLinhasBytes sobre o buffer.
+#
+# O mapeamento fica aberto enquanto os tokens sao usados: os lexemas ainda nao
+# lidos e as colunas (inclusive as das mensagens de erro) sao lidos dele. fecha(),
+# ou sair de um bloco with, decodifica os lexemas que faltam e fecha o
+# mapeamento; depois disso os tokens continuam com tipo, lexema, simbolo e
+# linha, mas a coluna nao pode mais ser calculada.
+
+class TokenMapeado:
+    __slots__ = ("tipo", "posicao", "inicio", "fim", "buffer", "_lexema", "simbolo", "linhas")
+
+    def __init__(self, tipo: TokenType, posicao: int, inicio: int, fim: int, buffer: mmap.mmap | bytes,
+                 linhas: IndiceLinhasBytes, lexema: Optional[str] = None, simbolo: int = -1) -> None:
+        self.tipo = tipo
+        # Posicao em que o token comeca, que so difere de inicio nas strings (as aspas).
+        self.posicao = posicao
+        self.inicio = inicio
+        self.fim = fim
+        self.buffer = buffer
+        self.linhas = linhas
+        self._lexema = lexema
+        self.simbolo = simbolo
+
+    @property
+    def linha(self) -> int:
+        return self.linhas.linha(self.posicao)
+
+    @property
+    def coluna(self) -> int:
+        return self.linhas.coluna(self.posicao)
+
+    @property
+    def lexema(self) -> str:
+        if self._lexema is None:
+            self._lexema = self.buffer[self.inicio : self.fim].decode("utf-8", "replace")
+
+        return self._lexema
+
+    # Compara com Token ou TokenMapeado pelos mesmos campos de Token.__eq__.
+    def __eq__(self, other) -> bool:
+        if hasattr(other, "tipo") and hasattr(other, "lexema") and hasattr(other, "linha"):
+            return self.tipo == other.tipo and self.linha == other.linha and self.lexema == other.lexema
+
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"Token(tipo={self.tipo!r}, lexema={self.lexema!r}, linha={self.linha!r})"
+
+_BRANCOS = re.compile(rb'[ \t\r\n]+')
+_ALFANUMERICOS = re.compile(rb'[A-Za-z0-9]*')
+_DECIMAIS = re.compile(rb'[0-9]*')
+_NAO_BRANCOS = re.compile(rb'[^ \n\r\t]*')
+
+PALAVRAS_RESERVADAS_BYTES = {
+    palavra.encode(): tipo for palavra, tipo in PALAVRAS_RESERVADAS.items()
+}
+
+# Lexemas fixos indexados pelo tipo, para nao decodificar nada.
+LEXEMAS_FIXOS = {tipo: lexema for lexema, tipo in TOKENS_FIXOS.items()}
+LEXEMAS_FIXOS.update({tipo: palavra for palavra, tipo in PALAVRAS_RESERVADAS.items()})
+
+def _monta_tabela() -> tuple[list[Optional[int]], dict[int, TokenType], dict[int, dict[int, TokenType]], dict[int, LexErrorType]]:
+    simples: dict[int, TokenType] = {}
+    compostos: dict[int, dict[int, TokenType]] = {}
+
+    for lexema, tipo in TOKENS_FIXOS.items():
+        b = lexema.encode()
+
+        if len(b) == 1:
+            simples[b[0]] = tipo
+        else:
+            compostos.setdefault(b[0], {})[b[1]] = tipo
+
+    # Bytes a partir de 0x80 sao o comeco (ou o meio) de um caracter
+    # de varios bytes e sao classificados depois de decodificados.
+    classes: list[Optional[int]] = [_classifica(chr(b)) for b in range(128)] + [None] * 128
+
+    for c in b' \t\r\n':
+        classes[c] = ESPACO
+    for c in list(simples) + list(compostos):
+        classes[c] = OPERADOR
+    for c in ERROS_PREFIXO:
+        classes[ord(c)] = OPERADOR
+
+    classes[ord(COMENTARIO[0])] = BARRA
+    classes[ord(ASPAS)] = STRING
+
+    erros = {ord(c): tipo for c, tipo in ERROS_PREFIXO.items()}
+
+    return classes, simples, compostos, erros
+
+CLASSES, SIMPLES, COMPOSTOS, ERROS = _monta_tabela()
+
+# Tamanho em bytes do caracter UTF-8 que comeca com o byte b.
+def _tamanho_utf8(b: int) -> int:
+    if b < 0xC0: return 1
+    if b < 0xE0: return 2
+    if b < 0xF0: return 3
+    return 4
+
+class LexerMmap:
+    def __init__(self, caminho: str, simbolos: Optional[Simbolos] = None) -> None:
+        self.simbolos = simbolos if simbolos is not None else Simbolos()
+
+        with open(caminho, 'rb') as arq:
+            try:
+                self.buffer: mmap.mmap | bytes = mmap.mmap(arq.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Nao eh possivel mapear um arquivo vazio.
+                self.buffer = b""
+
+        self.tokens: list[TokenMapeado] = []
+        self.erros: list[LexError] = []
+        self.ocorreu_erro: bool = False
+        self.linhas = IndiceLinhasBytes(self.buffer)
+        self.posicao = 0
+
+    # Gera uma lista de tokens e de erros lexicos a partir do codigo-fonte.
+    def lex(self) -> None:
+        self.varre()
+
+        if self.ocorreu_erro:
+            exit(1)
+
+        self.tokens.append(TokenMapeado(TokenType.EOF, self.posicao, self.posicao, self.posicao, self.buffer, self.linhas, ""))
+
+    # Decodifica os lexemas que ainda nao foram lidos e fecha o mapeamento.
+    def fecha(self) -> None:
+        for token in self.tokens:
+            token.lexema
+
+        if isinstance(self.buffer, mmap.mmap):
+            self.buffer.close()
+
+    def __enter__(self) -> "LexerMmap":
+        return self
+
+    def __exit__(self, *excecao) -> None:
+        self.fecha()
+
+    def varre(self) -> None:
+        buf = self.buffer
+        n = len(buf)
+        pos = self.posicao
+        linhas = self.linhas
+        tokens = self.tokens
+
+        while pos < n:
+            b = buf[pos]
+            classe = CLASSES[b]
+
+            if classe is None:
+                classe = _classifica(self.caracter(pos))
+
+            if classe == ESPACO:
+                pos = _BRANCOS.match(buf, pos).end()
+
+            elif classe == LETRA:
+                fim = self.fim_sequencia(_ALFANUMERICOS, str.isalnum, pos)
+                lexema = buf[pos:fim]
+                tipo = PALAVRAS_RESERVADAS_BYTES.get(lexema)
+
+                if tipo is None:
+                    simbolo = self.simbolos.interna_bytes(lexema)
+                    tokens.append(TokenMapeado(TokenType.IDENTIFICADOR, pos, pos, fim, buf, linhas,
+                                               self.simbolos.nome(simbolo), simbolo))
+                else:
+                    tokens.append(TokenMapeado(tipo, pos, pos, fim, buf, linhas, LEXEMAS_FIXOS[tipo]))
+
+                pos = fim
+
+            elif classe == OPERADOR:
+                tipo = COMPOSTOS.get(b, {}).get(buf[pos + 1]) if pos + 1 < n else None
+
+                if tipo is not None:
+                    tokens.append(TokenMapeado(tipo, pos, pos, pos + 2, buf, linhas, LEXEMAS_FIXOS[tipo]))
+                    pos += 2
+                    continue
+
+                tipo = SIMPLES.get(b)
+
+                if tipo is not None:
+                    tokens.append(TokenMapeado(tipo, pos, pos, pos + 1, buf, linhas, LEXEMAS_FIXOS[tipo]))
+                else:
+                    self.add_error(ERROS[b], pos)
+
+                pos += 1
+
+            elif classe == DIGITO:
+                fim = self.fim_sequencia(_DECIMAIS, str.isdigit, pos)
+                tipo = TokenType.INT
+
+                if fim + 1 < n and buf[fim] == ord('.') and self.caracter(fim + 1).isdigit():
+                    fim = self.fim_sequencia(_DECIMAIS, str.isdigit, fim + 1)
+                    tipo = TokenType.FLOAT
+
+                tokens.append(TokenMapeado(tipo, pos, pos, fim, buf, linhas))
+                pos = fim
+
+            elif classe == STRING:
+                fim = buf.find(b'"', pos + 1)
+
+                if fim == -1:
+                    self.add_error(LexErrorType.STRING_INTERMINADA, pos)
+                    pos = n
+                    continue
+
+                tokens.append(TokenMapeado(TokenType.STRING, pos, pos + 1, fim, buf, linhas))
+                pos = fim + 1
+
+            elif classe == BARRA:
+                if buf[pos : pos + 2] == b'//':
+                    fim = buf.find(b'\n', pos)
+                    pos = n if fim == -1 else fim
+                else:
+                    tokens.append(TokenMapeado(TokenType.BARRA, pos, pos, pos + 1, buf, linhas, LEXEMAS_FIXOS[TokenType.BARRA]))
+                    pos += 1
+
+            else:
+                fim = _NAO_BRANCOS.match(buf, pos).end()
+                self.add_error(LexErrorType.TOKEN_INESPERADO, pos, buf[pos:fim].decode("utf-8", "replace"))
+                pos = fim
+
+        self.posicao = pos
+
+    # Retorna o caracter (decodificado) que comeca no byte pos.
+    def caracter(self, pos: int) -> str:
+        b = self.buffer[pos]
+
+        if b < 0x80:
+            return chr(b)
+
+        return self.buffer[pos : pos + _tamanho_utf8(b)].decode("utf-8", "replace")[0]
+
+    # Consome os bytes ASCII que casam com a expressao ascii e os caracteres
+    # nao-ASCII para os quais predicado eh True, a partir de pos.
+    def fim_sequencia(self, ascii: re.Pattern, predicado, pos: int) -> int:
+        n = len(self.buffer)
+
+        while True:
+            pos = ascii.match(self.buffer, pos).end()
+
+            if pos < n and self.buffer[pos] >= 0x80 and predicado(self.caracter(pos)):
+                pos += _tamanho_utf8(self.buffer[pos])
+            else:
+                return pos
+
+    def add_error(self, tipo: LexErrorType, posicao: int, lexema: Optional[str] = None):
+        erro = LexError(tipo, lexema, posicao = posicao, linhas = self.linhas)
+        erro.report()
+
+        self.erros.append(erro)
+        self.ocorreu_erro = True
@@ -0,0 +1,187 @@
+from .lex import Lexer
+from .lex_token import TokenType, Token
+from .lex_error import LexErrorType, LexError
+from .simbolos import Simbolos
+from .linhas import IndiceLinhas
+from .token_buffer import CODIGOS, TIPOS
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Optional
+import contextlib
+import io
+import os
+import re
+
+# Analise lexica de um codigo-fonte grande dividido em trechos, cada um
+# analisado num processo separado.
+#
+# So strings atravessam quebras de linha, entao o lexer esta no estado inicial
+# logo depois de toda quebra de linha que nao esta dentro de uma string. Uma
+# varredura rapida (que pula strings e comentarios com str.find) escolhe essas
+# quebras de linha como fronteiras dos trechos. Cada processo analisa o seu
+# trecho com o lexer de sempre e devolve os tokens em arrays compactos, com as
+# posicoes ja relativas ao codigo-fonte inteiro; o processo principal monta os
+# Token com o indice de linhas do codigo inteiro, interna os identificadores
+# na ordem em que aparecem e adiciona um unico EOF.
+#
+# Se um trecho do meio terminar dentro de uma string, a fronteira depois dele
+# nao era segura, e o resto do codigo eh analisado de uma vez no processo
+# principal.
+#
+# O resultado (tokens, erros, simbolos e mensagens) eh o mesmo de Lexer.lex().
+
+# Inicio de uma string ou de um comentario.
+_ABRE = re.compile(r'"|//')
+
+# Retorna as posicoes em que o codigo-fonte pode ser dividido: para cada alvo
+# (em ordem crescente), o inicio da primeira linha que comeca depois dele fora
+# de uma string. Pode retornar menos posicoes que alvos.
+def fronteiras(fonte: str, alvos: list[int]) -> list[int]:
+    resultado = []
+    pos = 0
+
+    for alvo in alvos:
+        while True:
+            quebra = fonte.find('\n', max(pos, alvo))
+
+            if quebra == -1 or quebra + 1 == len(fonte):
+                return resultado
+
+            m = _ABRE.search(fonte, pos, quebra)
+
+            if m is None:
+                resultado.append(quebra + 1)
+                pos = quebra + 1
+                break
+
+            if m.group() == '"':
+                fim = fonte.find('"', m.end())
+
+                # String sem fim: nenhuma quebra de linha depois dela eh segura.
+                if fim == -1:
+                    return resultado
+
+                pos = fim + 1
+            else:
+                # O comentario termina antes da proxima quebra de linha.
+                pos = fonte.find('\n', m.end())
+
+    return resultado
+
+# Analisa um trecho num processo separado. Os erros nao sao impressos aqui,
+# e sim pelo processo principal, na ordem certa.
+def _lexa_trecho(classe, trecho: str, deslocamento: int):
+    lexer = classe(trecho)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        try:
+            lexer.lex()
+        except SystemExit:
+            pass
+
+    tokens = lexer.tokens if lexer.ocorreu_erro else lexer.tokens[:-1]
+
+    tipos = bytes([CODIGOS[token.tipo] for token in tokens])
+    posicoes = array('I', [token.posicao + deslocamento for token in tokens])
+    lexemas = [token.lexema for token in tokens]
+    erros = [(erro.tipo, erro.lexema, erro.posicao + deslocamento) for erro in lexer.erros]
+
+    return tipos, posicoes, lexemas, erros
+
+class LexerParalelo:
+    def __init__(
+        self,
+        source: str,
+        simbolos: Optional[Simbolos] = None,
+        trabalhadores: Optional[int] = None,
+        classe = Lexer,
+        tamanho_minimo: int = 1 << 16,
+    ) -> None:
+        self.source = source
+        self.simbolos = simbolos if simbolos is not None else Simbolos()
+        self.tokens: list[Token] = []
+        self.erros: list[LexError] = []
+        self.ocorreu_erro: bool = False
+        self.linhas = IndiceLinhas(source)
+        self.trabalhadores = trabalhadores if trabalhadores is not None else os.cpu_count() or 1
+        # Lexer usado em cada trecho (Lexer ou LexerTabela).
+        self.classe = classe
+        # Trechos menores que isso nao compensam o custo de mandar para outro processo.
+        self.tamanho_minimo = tamanho_minimo
+
+    # Divide o codigo-fonte em ate um trecho por trabalhador.
+    def divide(self) -> list[tuple[str, int]]:
+        n = len(self.source)
+        partes = max(1, min(self.trabalhadores, n // max(1, self.tamanho_minimo)))
+        cortes = [0] + fronteiras(self.source, [n * i // partes for i in range(1, partes)]) + [n]
+
+        return [(self.source[a:b], a) for a, b in zip(cortes, cortes[1:])]
+
+    def lex(self) -> None:
+        trechos = self.divide()
+
+        # Sem divisao, o proprio lexer analisa tudo aqui.
+        if len(trechos) == 1:
+            lexer = self.classe(self.source, self.simbolos)
+            self.tokens, self.erros, self.linhas = lexer.tokens, lexer.erros, lexer.linhas
+
+            try:
+                lexer.lex()
+            finally:
+                self.ocorreu_erro = lexer.ocorreu_erro
+
+            return
+
+        with ProcessPoolExecutor(max_workers = min(self.trabalhadores, len(trechos))) as executor:
+            resultados = executor.map(
+                _lexa_trecho,
+                repeat(self.classe),
+                [trecho for trecho, _ in trechos],
+                [deslocamento for _, deslocamento in trechos],
+            )
+
+            for (_, deslocamento), resultado in zip(trechos[:-1], resultados):
+                erros = resultado[3]
+
+                # Uma string que nao fecha antes do fim de um trecho do meio continua no
+                # proximo: a varredura se enganou (por exemplo, com aspas dentro de uma
+                # sequencia de caracteres invalidos). O resto eh analisado aqui mesmo.
+                if erros and erros[-1][0] == LexErrorType.STRING_INTERMINADA:
+                    executor.shutdown(cancel_futures = True)
+                    self.junta(*_lexa_trecho(self.classe, self.source[deslocamento:], deslocamento))
+                    break
+
+                self.junta(*resultado)
+            else:
+                self.junta(*next(resultados))
+
+        if self.ocorreu_erro:
+            exit(1)
+
+        self.tokens.append(Token(TokenType.EOF, "", posicao = len(self.source), linhas = self.linhas))
+
+    # Adiciona os tokens e os erros de um trecho.
+    def junta(self, tipos: bytes, posicoes: array, lexemas: list[str], erros: list[tuple[LexErrorType, Optional[str], int]]) -> None:
+        tokens = self.tokens
+        linhas = self.linhas
+        interna = self.simbolos.interna
+        identificador = TokenType.IDENTIFICADOR
+
+        for codigo, posicao, lexema in zip(tipos, posicoes, lexemas):
+            tipo = TIPOS[codigo]
+
+            if tipo is identificador:
+                tokens.append(Token(tipo, lexema, simbolo = interna(lexema), posicao = posicao, linhas = linhas))
+            else:
+                tokens.append(Token(tipo, lexema, posicao = posicao, linhas = linhas))
+
+        for tipo, lexema, posicao in erros:
+            self.add_error(tipo, posicao, lexema)
+
+    def add_error(self, tipo: LexErrorType, posicao: int, lexema: Optional[str] = None):
+        erro = LexError(tipo, lexema, posicao = posicao, linhas = self.linhas)
+        erro.report()
+
+        self.erros.append(erro)
+        self.ocorreu_erro = True
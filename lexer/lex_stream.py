@@ -0,0 +1,118 @@
+from .lex_token import TokenType, Token
+from .lex_tabela import LexerTabela, ASPAS, COMENTARIO
+from .lex_error import LexErrorType
+from .simbolos import Simbolos
+from typing import Iterator, Optional, TextIO
+
+# Analise lexica sob demanda de um arquivo lido em trechos.
+#
+# Em vez de guardar todos os tokens em self.tokens, gera cada token assim que
+# ele eh reconhecido. So o final ainda incompleto do trecho atual fica em
+# memoria, entao o consumo nao cresce com o tamanho do arquivo (fora o indice
+# de linhas, com uma posicao por linha).
+#
+# Uma string ou um comentario que continua no proximo trecho nao fica no
+# comeco de self.source para ser varrido de novo: so o fim dele eh procurado em
+# cada trecho novo. O texto de uma string aberta fica numa lista de partes,
+# juntadas quando ela fecha, e o de um comentario eh descartado.
+
+TAMANHO_TRECHO = 1 << 16
+
+class LexerStream(LexerTabela):
+    def __init__(self, arquivo: TextIO, tamanho_trecho: int = TAMANHO_TRECHO,
+                 simbolos: Optional[Simbolos] = None) -> None:
+        super().__init__("", simbolos)
+        self.arquivo = arquivo
+        self.tamanho_trecho = tamanho_trecho
+        # Posicao no arquivo do primeiro caracter de self.source.
+        self.deslocamento = 0
+        # Posicao no arquivo das aspas e o texto ja lido de uma string aberta.
+        self.string_aberta: Optional[tuple[int, list[str]]] = None
+        self.comentario_aberto = False
+
+    # Gera os tokens do arquivo, terminando com o token EOF.
+    # Como no LexerTabela.lex, encerra o programa se houve erro lexico.
+    def gera_tokens(self) -> Iterator[Token]:
+        while True:
+            trecho = self.arquivo.read(self.tamanho_trecho)
+            final = not trecho
+
+            # Mantem so o que sobrou do trecho anterior (um token incompleto).
+            self.deslocamento += self.posicao
+            self.source = self.source[self.posicao:] + trecho
+            self.posicao = 0
+            
+            self.linhas.estende(trecho, self.deslocamento + len(self.source) - len(trecho))
+
+            if self.continua_aberto(final):
+                self.varre(final)
+
+                if not final:
+                    self.guarda_aberto()
+
+            yield from self.tokens
+            self.tokens.clear()
+
+            if final:
+                break
+
+        if self.ocorreu_erro:
+            exit(1)
+
+        yield Token(TokenType.EOF, "", posicao = self.deslocamento + self.posicao, linhas = self.linhas)
+    
+    # Procura no trecho atual o fim da string ou do comentario aberto. Retorna
+    # se ele terminou, e a varredura continua depois dele.
+    def continua_aberto(self, final: bool) -> bool:
+        fonte = self.source
+
+        if self.string_aberta is not None:
+            inicio, partes = self.string_aberta
+            fim = fonte.find(ASPAS)
+
+            if fim == -1:
+                partes.append(fonte)
+                self.posicao = len(fonte)
+
+                if final:
+                    self.add_error(LexErrorType.STRING_INTERMINADA, inicio - self.deslocamento)
+
+                return False
+
+            partes.append(fonte[:fim])
+            self.emite(TokenType.STRING, inicio - self.deslocamento, fim + 1, "".join(partes))
+            self.string_aberta = None
+            self.posicao = fim + 1
+
+        elif self.comentario_aberto:
+            fim = fonte.find('\n')
+
+            if fim == -1:
+                self.posicao = len(fonte)
+                return False
+
+            self.comentario_aberto = False
+            self.posicao = fim
+
+        return True
+
+    # Se a varredura parou numa string ou num comentario que nao termina no
+    # trecho atual, tira ele de self.source.
+    def guarda_aberto(self) -> None:
+        fonte, pos = self.source, self.posicao
+
+        if fonte.startswith(ASPAS, pos):
+            self.string_aberta = (self.deslocamento + pos, [fonte[pos + 1:]])
+        elif fonte.startswith(COMENTARIO, pos):
+            self.comentario_aberto = True
+        else:
+            return
+
+        self.posicao = len(fonte)
+
+    # As posicoes dos tokens e erros sao relativas ao arquivo, nao ao trecho atual.
+    def emite(self, tipo: TokenType, inicio: int, fim: int, lexema: str, simbolo: int = -1) -> None:
+        super().emite(tipo, inicio + self.deslocamento, fim + self.deslocamento, lexema, simbolo)
+    
+    def add_error(self, tipo: LexErrorType, posicao: int, lexema: Optional[str] = None):
+        super().add_error(tipo, posicao + self.deslocamento, lexema)
@@ -0,0 +1,269 @@
+from .lex_token import TokenType, Token, PALAVRAS_RESERVADAS
+from .lex_error import LexErrorType, LexError
+from .simbolos import Simbolos
+from .linhas import IndiceLinhas
+from typing import Optional
+import re
+
+# Analisador lexico dirigido por tabela.
+#
+# Produz exatamente os mesmos tokens e erros que o Lexer classico, mas em vez de
+# consumir um caracter por vez, classifica o caracter inicial de cada token
+# atraves de uma tabela e consome sequencias inteiras (identificadores, digitos,
+# espacos, comentarios e strings) de uma vez, com expressoes regulares e
+# str.find. As quebras de linha nao sao contadas: os tokens guardam a posicao
+# e a linha vem do IndiceLinhas, montado de uma vez so.
+
+# Especificacao declarativa dos tokens de tamanho fixo.
+TOKENS_FIXOS: dict[str, TokenType] = {
+    '(': TokenType.ABRE_PARENTESES,
+    ')': TokenType.FECHA_PARENTESES,
+    '[': TokenType.ABRE_COLCHETE,
+    ']': TokenType.FECHA_COLCHETE,
+    '{': TokenType.ABRE_CHAVE,
+    '}': TokenType.FECHA_CHAVE,
+    ',': TokenType.VIRGULA,
+    '-': TokenType.MENOS,
+    '+': TokenType.MAIS,
+    '*': TokenType.ASTERISCO,
+    ';': TokenType.PONTO_VIRGULA,
+    ':': TokenType.DOIS_PONTOS,
+    '/': TokenType.BARRA,
+    '!': TokenType.EXCLAMACAO,
+    '!=': TokenType.DIFERENTE,
+    '<': TokenType.MENOR,
+    '<=': TokenType.MENOR_IGUAL,
+    '>': TokenType.MAIOR,
+    '>=': TokenType.MAIOR_IGUAL,
+    '=': TokenType.IGUAL,
+    '==': TokenType.IGUAL_IGUAL,
+    '&&': TokenType.AND,
+    '||': TokenType.OR,
+}
+
+# Prefixos de tokens de dois caracteres que nao formam um token sozinhos.
+ERROS_PREFIXO: dict[str, LexErrorType] = {
+    '&': LexErrorType.E_INESPERADO,
+    '|': LexErrorType.OU_INESPERADO,
+}
+
+COMENTARIO = '//'
+ASPAS = '"'
+
+# Classes de caracteres iniciais (os estados de partida do automato).
+ESPACO = 0
+LETRA = 1
+DIGITO = 2
+OPERADOR = 3
+BARRA = 4
+STRING = 5
+OUTRO = 6
+
+# Sequencias consumidas de uma vez so.
+_BRANCOS = re.compile(r'[ \t\r\n]+')
+# [^\W_] casa exatamente os caracteres em que str.isalnum() eh True.
+_ALFANUMERICOS = re.compile(r'[^\W_]*')
+# \d casa os digitos decimais, um subconjunto de str.isdigit().
+_DECIMAIS = re.compile(r'\d*')
+# Mesmo criterio de Lexer.consome_seq_caracteres.
+_NAO_BRANCOS = re.compile(r'[^ \n\r\t]*')
+
+def _monta_tabela() -> tuple[dict[str, int], dict[str, TokenType], dict[str, dict[str, TokenType]]]:
+    simples: dict[str, TokenType] = {}
+    compostos: dict[str, dict[str, TokenType]] = {}
+
+    for lexema, tipo in TOKENS_FIXOS.items():
+        if len(lexema) == 1:
+            simples[lexema] = tipo
+        else:
+            compostos.setdefault(lexema[0], {})[lexema[1]] = tipo
+
+    classes: dict[str, int] = {}
+
+    for c in map(chr, range(128)):
+        classes[c] = _classifica(c)
+
+    for c in ' \t\r\n':
+        classes[c] = ESPACO
+    for c in list(simples) + list(compostos) + list(ERROS_PREFIXO):
+        classes[c] = OPERADOR
+
+    classes[COMENTARIO[0]] = BARRA
+    classes[ASPAS] = STRING
+
+    return classes, simples, compostos
+
+# Classifica um caracter que nao esta na tabela, com os mesmos
+# criterios da ordem dos casos de Lexer.lex_token.
+def _classifica(c: str) -> int:
+    if c.isdigit():
+        return DIGITO
+
+    if c.isalnum():
+        return LETRA
+
+    return OUTRO
+
+CLASSES, SIMPLES, COMPOSTOS = _monta_tabela()
+
+class LexerTabela:
+    # linhas pode ser um indice de linhas de source ja montado.
+    def __init__(self, source: str, simbolos: Optional[Simbolos] = None, linhas: Optional[IndiceLinhas] = None) -> None:
+        self.source = source
+        self.simbolos = simbolos if simbolos is not None else Simbolos()
+        self.tokens: list[Token] = []
+        self.erros: list[LexError] = []
+        self.ocorreu_erro: bool = False
+        self.linhas = linhas if linhas is not None else IndiceLinhas(source)
+        self.posicao = 0
+
+    # Gera uma lista de tokens e de erros lexicos a partir do codigo-fonte.
+    def lex(self) -> None:
+        self.varre()
+
+        if self.ocorreu_erro:
+            exit(1)
+
+        self.emite(TokenType.EOF, self.posicao, self.posicao, "")
+
+    # Consome o codigo-fonte a partir de self.posicao ate o fim.
+    # Se final for False, o codigo-fonte eh so o comeco da entrada: um token
+    # que chega ao fim de self.source pode continuar no proximo trecho, entao
+    # a varredura para no inicio dele e o deixa para a proxima chamada.
+    def varre(self, final: bool = True) -> None:
+        fonte = self.source
+        n = len(fonte)
+        pos = self.posicao
+        emite = self.emite
+        interna = self.simbolos.interna
+        classes = CLASSES
+
+        while pos < n:
+            c = fonte[pos]
+            classe = classes.get(c)
+
+            if classe is None:
+                classe = classes.setdefault(c, _classifica(c))
+
+            if classe == ESPACO:
+                pos = _BRANCOS.match(fonte, pos).end()
+
+            elif classe == LETRA:
+                fim = _ALFANUMERICOS.match(fonte, pos).end()
+
+                if fim == n and not final:
+                    break
+
+                lexema = fonte[pos:fim]
+                tipo = PALAVRAS_RESERVADAS.get(lexema)
+
+                if tipo is None:
+                    emite(TokenType.IDENTIFICADOR, pos, fim, lexema, interna(lexema))
+                else:
+                    emite(tipo, pos, fim, lexema)
+                pos = fim
+
+            elif classe == OPERADOR:
+                if pos + 1 == n and not final:
+                    break
+
+                if pos + 1 < n:
+                    tipo = COMPOSTOS.get(c, {}).get(fonte[pos + 1])
+
+                    if tipo is not None:
+                        emite(tipo, pos, pos + 2, fonte[pos : pos + 2])
+                        pos += 2
+                        continue
+
+                tipo = SIMPLES.get(c)
+
+                if tipo is not None:
+                    emite(tipo, pos, pos + 1, c)
+                else:
+                    self.add_error(ERROS_PREFIXO[c], pos)
+
+                pos += 1
+
+            elif classe == DIGITO:
+                fim = self.fim_digitos(pos)
+                tipo = TokenType.INT
+
+                # Ainda pode vir um '.' ou o digito depois dele.
+                if fim + 1 >= n and not final:
+                    break
+
+                if fim + 1 < n and fonte[fim] == '.' and fonte[fim + 1].isdigit():
+                    fim = self.fim_digitos(fim + 1)
+                    tipo = TokenType.FLOAT
+
+                    if fim == n and not final:
+                        break
+
+                emite(tipo, pos, fim, fonte[pos:fim])
+                pos = fim
+
+            elif classe == STRING:
+                fim = fonte.find(ASPAS, pos + 1)
+
+                if fim == -1:
+                    if not final:
+                        break
+
+                    self.add_error(LexErrorType.STRING_INTERMINADA, pos)
+                    pos = n
+                    continue
+
+                emite(TokenType.STRING, pos, fim + 1, fonte[pos + 1 : fim])
+                pos = fim + 1
+
+            elif classe == BARRA:
+                if pos + 1 == n and not final:
+                    break
+
+                if fonte.startswith(COMENTARIO, pos):
+                    fim = fonte.find('\n', pos)
+
+                    if fim == -1 and not final:
+                        break
+
+                    pos = n if fim == -1 else fim
+                else:
+                    emite(SIMPLES[c], pos, pos + 1, c)
+                    pos += 1
+
+            else:
+                fim = _NAO_BRANCOS.match(fonte, pos).end()
+
+                if fim == n and not final:
+                    break
+
+                self.add_error(LexErrorType.TOKEN_INESPERADO, pos, fonte[pos:fim])
+                pos = fim
+
+        self.posicao = pos
+
+    # Adiciona o token que ocupa [inicio, fim) no codigo-fonte.
+    def emite(self, tipo: TokenType, inicio: int, fim: int, lexema: str, simbolo: int = -1) -> None:
+        self.tokens.append(Token(tipo, lexema, simbolo = simbolo, posicao = inicio, linhas = self.linhas))
+
+    # Retorna a posicao logo apos a sequencia de digitos (segundo str.isdigit)
+    # que comeca em pos.
+    def fim_digitos(self, pos: int) -> int:
+        fonte = self.source
+
+        while True:
+            pos = _DECIMAIS.match(fonte, pos).end()
+
+            # Digitos que nao sao decimais (como '²') sao raros, entao
+            # sao tratados um a um.
+            if pos < len(fonte) and fonte[pos].isdigit():
+                pos += 1
+            else:
+                return pos
+
+    def add_error(self, tipo: LexErrorType, posicao: int, lexema: Optional[str] = None):
+        erro = LexError(tipo, lexema, posicao = posicao, linhas = self.linhas)
+        erro.report()
+
+        self.erros.append(erro)
+        self.ocorreu_erro = True
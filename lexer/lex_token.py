@@ -1,5 +1,6 @@
+from .linhas import IndiceLinhas
 from enum import Enum, auto
-from dataclasses import dataclass
+from typing import Optional
 
 class TokenType(Enum):
     # Tokens de um caracter
@@ -71,8 +72,49 @@ PALAVRAS_RESERVADAS = {
     'bool': TokenType.BOOL
 }
 
-@dataclass(repr=True, eq=True)
+# Um token guarda a posicao em que comeca no codigo-fonte e o indice de
+# linhas desse codigo; a linha e a coluna sao calculadas quando pedidas.
+# Tokens criados a mao (em testes, por exemplo) podem receber a linha direto.
+# Os atributos ficam em __slots__, sem um __dict__ por token.
 class Token:
-    tipo: TokenType
-    lexema: str
-    linha: int
\ No newline at end of file
+    __slots__ = ("tipo", "lexema", "simbolo", "posicao", "linhas", "_linha")
+    
+    def __init__(
+        self,
+        tipo: TokenType,
+        lexema: str,
+        linha: Optional[int] = None,
+        simbolo: int = -1,
+        posicao: int = -1,
+        linhas: Optional[IndiceLinhas] = None,
+    ) -> None:
+        self.tipo = tipo
+        self.lexema = lexema
+        # Simbolo do identificador (veja lexer.simbolos), -1 nos outros tokens.
+        self.simbolo = simbolo
+        self.posicao = posicao
+        self.linhas = linhas
+        self._linha = linha
+    
+    @property
+    def linha(self) -> int:
+        if self.linhas is None:
+            return self._linha
+        
+        return self.linhas.linha(self.posicao)
+    
+    @property
+    def coluna(self) -> Optional[int]:
+        if self.linhas is None:
+            return None
+        
+        return self.linhas.coluna(self.posicao)
+    
+    def __eq__(self, other) -> bool:
+        if isinstance(other, Token):
+            return self.tipo == other.tipo and self.lexema == other.lexema and self.linha == other.linha
+        
+        return NotImplemented
+    
+    def __repr__(self) -> str:
+        return f"Token(tipo={self.tipo!r}, lexema={self.lexema!r}, linha={self.linha!r})"
@@ -0,0 +1,128 @@
+from array import array
+from bisect import bisect_right
+from itertools import accumulate, chain, repeat
+from operator import add
+from typing import Iterator
+import re
+
+# Indice do inicio de cada linha do codigo-fonte.
+#
+# Os tokens e os erros guardam so a posicao (o deslocamento no codigo-fonte)
+# em que comecam. A linha e a coluna sao calculadas quando alguem pede, por
+# busca binaria nesse indice, em vez de o lexer contar as quebras de linha
+# enquanto avanca.
+
+_QUEBRA_BYTES = re.compile(rb'\n')
+
+# Sequencia crescente de posicoes guardada num array em que as de indice a
+# partir de desde estao sem o deslocamento: o valor de cada uma eh o guardado
+# mais deslocamento. Depois de uma edicao que muda o tamanho do texto, as
+# posicoes de depois dela (tokens ou inicios de linha) sao reaproveitadas com
+# uma copia do array, sem somar a diferenca a cada uma. Funciona com bisect.
+class PosicoesDeslocadas:
+    __slots__ = ("valores", "desde", "deslocamento")
+
+    def __init__(self, valores: array, desde: int, deslocamento: int) -> None:
+        self.valores = valores
+        self.desde = desde
+        self.deslocamento = deslocamento
+
+    def __len__(self) -> int:
+        return len(self.valores)
+
+    def __getitem__(self, indice: int) -> int:
+        if indice < 0:
+            indice += len(self.valores)
+
+        return self.valores[indice] + self.deslocamento if indice >= self.desde else self.valores[indice]
+
+    def __iter__(self) -> Iterator[int]:
+        return chain(self.valores[:self.desde], map(self.deslocamento.__add__, self.valores[self.desde:]))
+
+    def __eq__(self, other) -> bool:
+        return list(self) == list(other)
+
+# As posicoes[:fim], com os valores de verdade.
+def reais(posicoes: "array | PosicoesDeslocadas", fim: int) -> array:
+    if isinstance(posicoes, array):
+        return posicoes[:fim]
+
+    resultado = posicoes.valores[:min(fim, posicoes.desde)]
+    resultado.extend(map(posicoes.deslocamento.__add__, posicoes.valores[posicoes.desde:fim]))
+
+    return resultado
+
+# As posicoes de cabeca seguidas das de cauda[inicio:] mais delta. So as da
+# cauda que estao antes do deslocamento dela (que vieram de uma edicao
+# anterior, depois desta) recebem delta uma a uma.
+def junta(cabeca: array, cauda: "array | PosicoesDeslocadas", inicio: int, delta: int) -> "array | PosicoesDeslocadas":
+    if isinstance(cauda, array):
+        valores, desde, deslocamento = cauda, 0, 0
+    else:
+        valores, desde, deslocamento = cauda.valores, cauda.desde, cauda.deslocamento
+
+    meio = max(inicio, desde)
+    resultado = cabeca + array(valores.typecode, map(delta.__add__, valores[inicio:meio]))
+    desde = len(resultado)
+    resultado.extend(valores[meio:])
+    deslocamento += delta
+
+    return resultado if deslocamento == 0 else PosicoesDeslocadas(resultado, desde, deslocamento)
+
+class IndiceLinhas:
+    def __init__(self, fonte: str = "") -> None:
+        # inicios[i] eh a posicao em que comeca a linha i + 1.
+        self.inicios = array('I', [0])
+        
+        if fonte:
+            self.estende(fonte, 0)
+    
+    # Adiciona as linhas que comecam em trecho, que esta na posicao
+    # deslocamento do codigo-fonte.
+    def estende(self, trecho: str, deslocamento: int) -> None:
+        # Cada linha comeca logo depois da anterior e da sua quebra de linha,
+        # entao os inicios sao a soma acumulada dos tamanhos (mais 1) das
+        # partes do split. Tudo isso roda em C, sem um passo em Python por linha.
+        tamanhos = map(add, map(len, trecho.split('\n')), repeat(1))
+        inicios = array('I', accumulate(tamanhos, initial=deslocamento))
+        
+        # O primeiro eh o proprio deslocamento e o ultimo passa do fim do trecho.
+        self.inicios.extend(inicios[1:-1])
+    
+    # Como estende, para o conteudo de um arquivo em bytes (ou mapeado em memoria).
+    def estende_bytes(self, trecho, deslocamento: int) -> None:
+        self.inicios.extend(m.end() + deslocamento for m in _QUEBRA_BYTES.finditer(trecho))
+    
+    # Indice de linhas do codigo-fonte depois de trocar o trecho [inicio, fim)
+    # por texto. As linhas de depois da edicao sao deslocadas (veja junta).
+    def edita(self, inicio: int, fim: int, texto: str) -> "IndiceLinhas":
+        # Uma linha que comeca em p depende do caracter em p - 1.
+        editado = IndiceLinhas()
+        editado.inicios = reais(self.inicios, bisect_right(self.inicios, inicio))
+        editado.estende(texto, inicio)
+        editado.inicios = junta(editado.inicios, self.inicios, bisect_right(self.inicios, fim), len(texto) - (fim - inicio))
+
+        return editado
+    
+    # Linha (a partir de 1) da posicao.
+    def linha(self, posicao: int) -> int:
+        return bisect_right(self.inicios, posicao)
+    
+    # Coluna (a partir de 1) da posicao.
+    def coluna(self, posicao: int) -> int:
+        return posicao - self.inicios[bisect_right(self.inicios, posicao) - 1] + 1
+    
+    def __len__(self) -> int:
+        return len(self.inicios)
+
+# Indice de linhas de um codigo-fonte em bytes (UTF-8), com as posicoes em
+# bytes. A coluna continua contada em caracteres, decodificando o comeco da linha.
+class IndiceLinhasBytes(IndiceLinhas):
+    def __init__(self, buffer) -> None:
+        super().__init__()
+        self.buffer = buffer
+        self.estende_bytes(buffer, 0)
+
+    def coluna(self, posicao: int) -> int:
+        inicio = self.inicios[bisect_right(self.inicios, posicao) - 1]
+        return len(self.buffer[inicio:posicao].decode("utf-8", "replace")) + 1
@@ -0,0 +1,40 @@
+# Tabela de nomes de uma compilacao.
+#
+# Cada identificador distinto recebe um numero pequeno (o seu simbolo) na
+# analise lexica. Os tokens e as arvores sintaticas guardam esse numero, e as
+# etapas seguintes comparam e indexam por ele em vez de pela string. O texto
+# so eh recuperado (com nome) para mensagens e para imprimir a tabela de
+# simbolos.
+
+class Simbolos:
+    def __init__(self) -> None:
+        self.nomes: list[str] = []
+        self.ids: dict[str, int] = {}
+        # Mesmo indice, pelos bytes UTF-8 do nome (usado pelo LexerMmap).
+        self.ids_bytes: dict[bytes, int] = {}
+    
+    # Retorna o simbolo de nome, criando um novo se for a primeira vez que ele aparece.
+    def interna(self, nome: str) -> int:
+        simbolo = self.ids.get(nome)
+        
+        if simbolo is None:
+            simbolo = self.ids[nome] = len(self.nomes)
+            self.nomes.append(nome)
+        
+        return simbolo
+    
+    # Como interna, mas a partir dos bytes do nome. Cada nome distinto
+    # so eh decodificado uma vez.
+    def interna_bytes(self, nome: bytes) -> int:
+        simbolo = self.ids_bytes.get(nome)
+        
+        if simbolo is None:
+            simbolo = self.ids_bytes[nome] = self.interna(nome.decode("utf-8", "replace"))
+        
+        return simbolo
+    
+    def nome(self, simbolo: int) -> str:
+        return self.nomes[simbolo]
+    
+    def __len__(self) -> int:
+        return len(self.nomes)
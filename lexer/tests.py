@@ -1,9 +1,33 @@
 from .lex import Lexer
+from .lex_tabela import LexerTabela
+from .lex_stream import LexerStream
+from .lex_mmap import LexerMmap
+from .token_buffer import LexerBuffer
+from .lex_incremental import relexa
+from .linhas import PosicoesDeslocadas
+from .lex_paralelo import LexerParalelo, fronteiras
 from .lex_token import Token, TokenType
 from .lex_error import LexError, LexErrorType
+from .linhas import IndiceLinhas, IndiceLinhasBytes
 
+import contextlib
+import io
+import os
+import random
+import tempfile
 import unittest
 
+# Executa o lexer sem imprimir os erros e retorna os tokens, os erros
+# e se a analise terminou com erro.
+def executa(lexer) -> tuple[list[Token], list[LexError], bool]:
+    with contextlib.redirect_stdout(io.StringIO()):
+        try:
+            lexer.lex()
+        except SystemExit:
+            return lexer.tokens, lexer.erros, True
+
+    return lexer.tokens, lexer.erros, False
+
 class LexTests(unittest.TestCase):
     def teste_lex(self):
         fonte = r"""
@@ -70,4 +94,265 @@ int float string bool lista
                 Token(TokenType.LISTA, "lista", 10),
                 Token(TokenType.EOF, "", 11),
             ]
-        )
\ No newline at end of file
+        )
+
+class LexTabelaTests(unittest.TestCase):
+    FONTES = [
+        "",
+        "xerife a: int = 10;\n// fim",
+        "procurado f(x: float): float {\n    vorta x * 2.5;\n}\n",
+        "\"string\nde varias\nlinhas\" depois",
+        "\"nunca fecha\nola",
+        "a & b | c && d || e",
+        "1.x 2. 3.25.4 ab_cd @#$ ok",
+        "café ½ ²3 ٣٤ x\fy\0z",
+        "a//comentario sem quebra de linha",
+        "!a != b <= c >= d == e = f < g > h",
+    ]
+
+    def teste_mesmo_resultado_do_lexer_classico(self):
+        for fonte in self.FONTES:
+            with self.subTest(fonte=fonte):
+                self.assertEqual(executa(LexerTabela(fonte)), executa(Lexer(fonte)))
+
+    def teste_erros(self):
+        tokens, erros, falhou = executa(LexerTabela("a\n  &x \"abc\n"))
+
+        self.assertTrue(falhou)
+        self.assertEqual(tokens, [Token(TokenType.IDENTIFICADOR, "a", 1), Token(TokenType.IDENTIFICADOR, "x", 2)])
+        self.assertEqual(
+            erros,
+            [
+                LexError(LexErrorType.E_INESPERADO, None, 2),
+                LexError(LexErrorType.STRING_INTERMINADA, None, 2),
+            ]
+        )
+
+
+class LexStreamTests(unittest.TestCase):
+    def teste_mesmo_resultado_em_qualquer_tamanho_de_trecho(self):
+        for fonte in LexTabelaTests.FONTES:
+            esperado = executa(LexerTabela(fonte))
+
+            for tamanho_trecho in [1, 2, 3, 7, 64]:
+                with self.subTest(fonte=fonte, tamanho_trecho=tamanho_trecho):
+                    lexer = LexerStream(io.StringIO(fonte), tamanho_trecho)
+                    tokens = []
+
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        try:
+                            tokens.extend(lexer.gera_tokens())
+                            falhou = False
+                        except SystemExit:
+                            falhou = True
+
+                    self.assertEqual((tokens, lexer.erros, falhou), esperado)
+
+    def teste_string_e_comentario_longos_nao_sao_varridos_de_novo(self):
+        fonte = 'a "' + "x\n" * 500 + '" // ' + "y" * 1000 + '\nb'
+        tamanhos = []
+
+        # Anota o tamanho de self.source a cada trecho lido.
+        class Arquivo(io.StringIO):
+            def read(self, tamanho: int = -1) -> str:
+                tamanhos.append(len(lexer.source) - lexer.posicao)
+                return super().read(tamanho)
+
+        lexer = LexerStream(Arquivo(fonte), 8)
+        tokens = list(lexer.gera_tokens())
+
+        self.assertEqual(tokens, executa(LexerTabela(fonte))[0])
+        self.assertEqual(tokens[1].posicao, 2)
+        self.assertLess(max(tamanhos), 8)
+
+
+class LexMmapTests(unittest.TestCase):
+    def teste_mesmo_resultado_do_lexer_tabela(self):
+        with tempfile.TemporaryDirectory() as diretorio:
+            caminho = os.path.join(diretorio, "fonte.txt")
+
+            for fonte in LexTabelaTests.FONTES:
+                with self.subTest(fonte=fonte):
+                    with open(caminho, "w", encoding="utf-8") as arq:
+                        arq.write(fonte)
+
+                    self.assertEqual(executa(LexerMmap(caminho)), executa(LexerTabela(fonte)))
+
+    def teste_lexema_decodificado_sob_demanda(self):
+        with tempfile.TemporaryDirectory() as diretorio:
+            caminho = os.path.join(diretorio, "fonte.txt")
+
+            with open(caminho, "w", encoding="utf-8") as arq:
+                arq.write('xerife ação: string = "olá";')
+
+            lexer = LexerMmap(caminho)
+            lexer.lex()
+
+            nome, texto = lexer.tokens[1], lexer.tokens[5]
+            self.assertIsNone(texto._lexema)
+            self.assertEqual((texto.inicio, texto.fim), (25, 29))
+            self.assertEqual(texto.lexema, "olá")
+            self.assertEqual((nome.inicio, nome.fim), (7, 13))
+            self.assertEqual(nome.lexema, "ação")
+            self.assertEqual(lexer.simbolos.nome(nome.simbolo), "ação")
+            self.assertEqual(lexer.tokens[0].lexema, "xerife")
+
+    def teste_fecha_o_mapeamento(self):
+        with tempfile.TemporaryDirectory() as diretorio:
+            caminho = os.path.join(diretorio, "fonte.txt")
+
+            with open(caminho, "w", encoding="utf-8") as arq:
+                arq.write('xerife a: float = 1.5;\natire "olá";')
+
+            with LexerMmap(caminho) as lexer:
+                lexer.lex()
+
+            self.assertTrue(lexer.buffer.closed)
+            self.assertEqual([token.lexema for token in lexer.tokens],
+                             ["xerife", "a", ":", "float", "=", "1.5", ";", "atire", "olá", ";", ""])
+            self.assertEqual(lexer.tokens[7].linha, 2)
+
+
+class TokenBufferTests(unittest.TestCase):
+    def teste_mesmos_tokens_do_lexer_tabela(self):
+        for fonte in LexTabelaTests.FONTES:
+            with self.subTest(fonte=fonte):
+                buffer, erros, falhou = executa(LexerBuffer(fonte))
+
+                self.assertEqual(
+                    ([buffer[i] for i in range(len(buffer))], erros, falhou),
+                    executa(LexerTabela(fonte))
+                )
+
+    def teste_deslocamentos_e_tabela_de_lexemas(self):
+        lexer = LexerBuffer('a = "b c";\na = a;')
+        lexer.lex()
+        buffer = lexer.tokens
+
+        self.assertEqual(
+            [buffer.fonte[inicio:fim] for inicio, fim in zip(buffer.inicios, buffer.fins)],
+            ["a", "=", '"b c"', ";", "a", "=", "a", ";", ""]
+        )
+        self.assertEqual([buffer.linha(i) for i in range(len(buffer))], [1, 1, 1, 1, 2, 2, 2, 2, 2])
+        self.assertEqual(buffer.tabela, ["a", "=", "b c", ";", ""])
+        self.assertEqual(buffer.tipo(2), TokenType.STRING)
+
+
+class RelexaTests(unittest.TestCase):
+    FONTE = """procurado f(a: int): float {
+    // comentario
+    xerife b: float = 2.5 * a;
+    bang (a >= 10 && b != 1.0) { atire "grande
+    demais"; }
+    vorta b;
+}
+"""
+    PEDACOS = ["a", "1", ".5", "=", "!", " ", "\n", "//", "\"", "}", "&&", "bang", "xerife x: int;", ""]
+
+    def teste_igual_a_analise_completa_em_edicoes_aleatorias(self):
+        aleatorio = random.Random(5)
+
+        for _ in range(300):
+            fonte = self.FONTE
+            lexer = LexerBuffer(fonte)
+            lexer.lex()
+            buffer = lexer.tokens
+
+            for _ in range(5):
+                inicio = aleatorio.randint(0, len(fonte))
+                fim = aleatorio.randint(inicio, min(len(fonte), inicio + 8))
+                texto = "".join(aleatorio.choices(self.PEDACOS, k=aleatorio.randint(0, 3)))
+                fonte = fonte[:inicio] + texto + fonte[fim:]
+
+                esperado, erros, falhou = executa(LexerBuffer(fonte))
+
+                with self.subTest(fonte=fonte):
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        try:
+                            buffer = relexa(buffer, inicio, fim, texto)
+                        except SystemExit:
+                            self.assertTrue(falhou)
+                            break
+
+                    self.assertFalse(falhou)
+                    self.assertEqual(buffer, esperado)
+                    self.assertEqual(list(buffer.linhas.inicios), list(esperado.linhas.inicios))
+
+    def teste_reaproveita_os_tokens_depois_da_edicao(self):
+        lexer = LexerBuffer("a = 1;\nb = 2;\nc = 3;")
+        lexer.lex()
+
+        novo = relexa(lexer.tokens, 4, 5, "10\n")
+
+        self.assertEqual(novo.fonte, "a = 10\n;\nb = 2;\nc = 3;")
+        self.assertEqual([novo.lexema(i) for i in range(len(novo))],
+                         ["a", "=", "10", ";", "b", "=", "2", ";", "c", "=", "3", ";", ""])
+        self.assertEqual([novo.linha(i) for i in range(len(novo))], [1, 1, 1, 2, 3, 3, 3, 3, 4, 4, 4, 4, 4])
+        # As posicoes de depois da edicao ficam com o deslocamento pendente.
+        self.assertIsInstance(novo.inicios, PosicoesDeslocadas)
+        self.assertEqual(novo.inicios.valores[novo.inicios.desde:], lexer.tokens.inicios[3:])
+        self.assertEqual((novo.inicios.desde, novo.inicios.deslocamento), (3, 2))
+        self.assertIsInstance(novo.linhas.inicios, PosicoesDeslocadas)
+
+
+class LexParaleloTests(unittest.TestCase):
+    FONTES = LexTabelaTests.FONTES + [
+        "a\n\"b\nc\" // \"\nd\n\"e\"\nf\n",
+        # As aspas dentro de uma sequencia invalida nao abrem uma string.
+        "@\"x\nab\n\"c\nd\n",
+        RelexaTests.FONTE * 5,
+    ]
+
+    def teste_fronteiras_fora_de_strings_e_comentarios(self):
+        fonte = "a\n\"b\nc\" // \"\nd\n"
+
+        self.assertEqual(fronteiras(fonte, [1, 3, 5, 9]), [2, 13])
+
+    def teste_mesmo_resultado_do_lexer_classico(self):
+        for fonte in self.FONTES:
+            classico = Lexer(fonte)
+            esperado = executa(classico)
+
+            for trabalhadores in [1, 2, 3]:
+                with self.subTest(fonte=fonte, trabalhadores=trabalhadores):
+                    lexer = LexerParalelo(fonte, trabalhadores = trabalhadores, tamanho_minimo = 1)
+
+                    self.assertEqual(executa(lexer), esperado)
+                    self.assertEqual(lexer.simbolos.nomes, classico.simbolos.nomes)
+
+
+class IndiceLinhasTests(unittest.TestCase):
+    def teste_linha_e_coluna(self):
+        fonte = "ab\n\ncd\ne"
+        linhas = IndiceLinhas(fonte)
+
+        self.assertEqual(list(linhas.inicios), [0, 3, 4, 7])
+        self.assertEqual([linhas.linha(p) for p in range(len(fonte) + 1)], [1, 1, 1, 2, 3, 3, 3, 4, 4])
+        self.assertEqual([linhas.coluna(p) for p in range(len(fonte) + 1)], [1, 2, 3, 1, 1, 2, 3, 1, 2])
+
+    def teste_estende_por_trechos(self):
+        fonte = "a\nbc\n\nd\n"
+        esperado = IndiceLinhas(fonte)
+
+        for tamanho in [1, 2, 3]:
+            with self.subTest(tamanho=tamanho):
+                linhas = IndiceLinhas()
+
+                for inicio in range(0, len(fonte), tamanho):
+                    linhas.estende(fonte[inicio : inicio + tamanho], inicio)
+
+                self.assertEqual(linhas.inicios, esperado.inicios)
+
+        linhas = IndiceLinhasBytes(fonte.encode())
+        self.assertEqual(linhas.inicios, esperado.inicios)
+
+    def teste_coluna_em_caracteres_nos_bytes(self):
+        linhas = IndiceLinhasBytes("ação\nsó x".encode())
+
+        self.assertEqual((linhas.linha(11), linhas.coluna(11)), (2, 4))
+
+    def teste_colunas_dos_tokens_e_erros(self):
+        tokens, erros, _ = executa(LexerTabela("xerife a;\n  b = @;"))
+
+        self.assertEqual([(t.linha, t.coluna) for t in tokens], [(1, 1), (1, 8), (1, 9), (2, 3), (2, 5)])
+        self.assertEqual((erros[0].linha, erros[0].coluna), (2, 7))
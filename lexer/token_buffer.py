@@ -0,0 +1,94 @@
+from .lex_token import TokenType, Token
+from .lex_tabela import LexerTabela
+from .simbolos import Simbolos
+from .linhas import IndiceLinhas
+from array import array
+from typing import Optional
+
+# Sequencia de tokens guardada como uma estrutura de arrays.
+#
+# Em vez de um objeto Token (com um membro do enum e uma str propria) por
+# token, cada campo fica num array compacto indexado pela posicao do token:
+# o tipo em um byte, os deslocamentos [inicio, fim) no codigo-fonte em
+# inteiros de 32 bits, e o lexema como o indice de uma tabela de lexemas
+# compartilhada, em que cada texto distinto aparece uma vez so. O simbolo de
+# um identificador depende so do lexema, entao tambem fica na tabela. A linha
+# vem do inicio do token, pelo indice de linhas do codigo-fonte.
+#
+# Indexar o buffer (buffer[i]) cria um Token equivalente, para os lugares que
+# ainda precisam de um objeto, como as arvores sintaticas e os erros.
+
+# Codigo de cada tipo de token guardado no array de tipos, e o caminho de volta.
+CODIGOS: dict[TokenType, int] = {tipo: tipo.value for tipo in TokenType}
+TIPOS: dict[int, TokenType] = {tipo.value: tipo for tipo in TokenType}
+
+class TokenBuffer:
+    def __init__(self, fonte: str, simbolos: Simbolos, linhas: Optional[IndiceLinhas] = None) -> None:
+        self.fonte = fonte
+        self.simbolos = simbolos
+        self.linhas = linhas if linhas is not None else IndiceLinhas(fonte)
+        self.tipos = array('B')
+        self.inicios = array('I')
+        self.fins = array('I')
+        self.lexemas = array('I')
+        # Tabela de lexemas e o indice de cada lexema nela.
+        self.tabela: list[str] = []
+        self.indices: dict[str, int] = {}
+        # Simbolo de cada lexema da tabela que ja apareceu como identificador, ou -1.
+        self.simbolos_tabela = array('i')
+
+    def adiciona(self, tipo: TokenType, inicio: int, fim: int, lexema: str, simbolo: int = -1) -> None:
+        indice = self.indices.get(lexema)
+
+        if indice is None:
+            indice = self.indices[lexema] = len(self.tabela)
+            self.tabela.append(lexema)
+            self.simbolos_tabela.append(simbolo)
+        elif simbolo != -1:
+            self.simbolos_tabela[indice] = simbolo
+
+        self.tipos.append(CODIGOS[tipo])
+        self.inicios.append(inicio)
+        self.fins.append(fim)
+        self.lexemas.append(indice)
+
+    def __len__(self) -> int:
+        return len(self.tipos)
+
+    def __getitem__(self, indice: int) -> Token:
+        tipo = TIPOS[self.tipos[indice]]
+        lexema = self.lexemas[indice]
+        simbolo = self.simbolos_tabela[lexema] if tipo == TokenType.IDENTIFICADOR else -1
+        
+        return Token(tipo, self.tabela[lexema], simbolo = simbolo, posicao = self.inicios[indice], linhas = self.linhas)
+
+    # Dois buffers sao iguais se tem os mesmos tokens, mesmo que a tabela
+    # de lexemas de cada um esteja numa ordem diferente.
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, TokenBuffer):
+            return NotImplemented
+
+        return (
+            self.tipos == other.tipos and
+            self.inicios == other.inicios and
+            self.fins == other.fins and
+            all(self.tabela[a] == other.tabela[b] for a, b in zip(self.lexemas, other.lexemas))
+        )
+
+    def tipo(self, indice: int) -> TokenType:
+        return TIPOS[self.tipos[indice]]
+
+    def lexema(self, indice: int) -> str:
+        return self.tabela[self.lexemas[indice]]
+
+    def linha(self, indice: int) -> int:
+        return self.linhas.linha(self.inicios[indice])
+
+# LexerTabela que guarda os tokens num TokenBuffer.
+class LexerBuffer(LexerTabela):
+    def __init__(self, source: str, simbolos: Optional[Simbolos] = None, linhas: Optional[IndiceLinhas] = None) -> None:
+        super().__init__(source, simbolos, linhas)
+        self.tokens: TokenBuffer = TokenBuffer(source, self.simbolos, self.linhas)
+
+    def emite(self, tipo: TokenType, inicio: int, fim: int, lexema: str, simbolo: int = -1) -> None:
+        self.tokens.adiciona(tipo, inicio, fim, lexema, simbolo)
@@ -1,12 +1,34 @@
 from lexer.lex import Lexer
+from lexer.lex_tabela import LexerTabela
+from lexer.lex_stream import LexerStream
+from lexer.lex_mmap import LexerMmap
+from lexer.token_buffer import LexerBuffer
+from lexer.lex_paralelo import LexerParalelo
+from lexer.simbolos import Simbolos
 from parser.parser import Parser
+from parser.janela import JanelaTokens
+from parser.parser_buffer import ParserBuffer
+from parser.parser_iterativo import ParserIterativo, ParserBufferIterativo
+from parser.parser_paralelo import ParserParalelo
+from parser.parser_compartilhado import ParserCompartilhado
+from cache.cache_compilacao import CacheCompilacao
+from analise_semantica.analise_paralela import AnaliseParalela
 from analise_semantica.validator import AnaliseSemantica, TabelaSimbolos
 from arvores_sintaticas.declaracao import TipoLista, TipoPrimitivo
+from typing import TextIO
+import argparse
 
 def le_arq_entrada(nome_arq: str) -> str:
     try:
-        with open(nome_arq, 'r') as arq:
+        with abre_arq_entrada(nome_arq) as arq:
             return arq.read()
+    except IOError:
+        print("Um erro aconteceu enquanto o arquivo era lido.")
+        exit(1) 
+
+def abre_arq_entrada(nome_arq: str) -> TextIO:
+    try:
+        return open(nome_arq, 'r')
     except FileNotFoundError:
         print("Nao foi possivel abrir o arquivo no caminho especificado.")
         exit(1)
@@ -16,30 +38,126 @@ def le_arq_entrada(nome_arq: str) -> str:
 
 def printar_tabela_simbolos(tabela_simbolos: TabelaSimbolos) -> None:
     print("Tabela de Símbolos:")
-    for nivel, escopo in enumerate(reversed(tabela_simbolos.escopos)):
-        print(f"Escopo {len(tabela_simbolos.escopos) - nivel - 1}:")
+    escopos = tabela_simbolos.escopos
+    for nivel, escopo in enumerate(reversed(escopos)):
+        print(f"Escopo {len(escopos) - nivel - 1}:")
         if not escopo:
             print("  (vazio)")
         else:
-            for nome, tipo in escopo.items():
+            for simbolo, tipo in escopo.items():
                 tipo_str = (
                     tipo.interno.name if isinstance(tipo, TipoLista) else tipo.name
                 )
-                print(f"  {nome}: {tipo_str}")
+                print(f"  {tabela_simbolos.simbolos.nome(simbolo)}: {tipo_str}")
         print("-" * 30)
 
 
+def le_argumentos() -> argparse.Namespace:
+    argumentos = argparse.ArgumentParser(description="Compilador da linguagem do velho oeste.")
+    argumentos.add_argument("arquivo", nargs="?", default="teste.txt",
+                            help="codigo-fonte a ser compilado (padrao: teste.txt)")
+    argumentos.add_argument("--lexer", choices=["tabela", "classico"], default="tabela",
+                            help="motor da analise lexica (padrao: tabela)")
+    argumentos.add_argument("--iterativo", action="store_true",
+                            help="usa o parser com pilha explicita, para codigo aninhado muito fundo")
+    
+    entrada = argumentos.add_mutually_exclusive_group()
+    entrada.add_argument("--stream", action="store_true",
+                         help="le o arquivo em trechos e analisa cada declaracao assim que ela termina")
+    entrada.add_argument("--mmap", action="store_true",
+                         help="mapeia o arquivo em memoria e faz a analise lexica sobre os bytes")
+    entrada.add_argument("--buffer", action="store_true",
+                         help="guarda os tokens num TokenBuffer compacto em vez de uma lista de Token")
+    entrada.add_argument("--paralelo", type=int, metavar="N",
+                         help="divide o arquivo em trechos e faz a analise lexica e sintatica deles, e a semantica dos corpos das funcoes, em N processos")
+    
+    argumentos.add_argument("--cache", metavar="DIR",
+                            help="guarda os tokens e a arvore sintatica em DIR e os reaproveita se o codigo nao mudar")
+    
+    argumentos.add_argument("--compartilhar", action="store_true",
+                            help="monta um so no para expressoes iguais e sem efeitos colaterais (hash-consing)")
+    
+    lidos = argumentos.parse_args()
+    
+    # A arena do cache nao guarda quais nos sao compartilhados.
+    if lidos.cache is not None and (lidos.stream or lidos.mmap or lidos.buffer or lidos.compartilhar):
+        argumentos.error("--cache nao pode ser usado com --stream, --mmap, --buffer ou --compartilhar")
+    
+    if lidos.compartilhar and (lidos.stream or lidos.buffer or lidos.paralelo is not None or lidos.iterativo):
+        argumentos.error("--compartilhar nao pode ser usado com --stream, --buffer, --paralelo ou --iterativo")
+    
+    return lidos
+
+
 if __name__ == '__main__':
-    entrada = le_arq_entrada("teste.txt")
+    argumentos = le_argumentos()
+    simbolos = Simbolos()
     
-    lexer = Lexer(entrada)
-    lexer.lex()
+    if argumentos.paralelo is not None:
+        analisador = AnaliseParalela(simbolos, argumentos.paralelo)
+    else:
+        analisador = AnaliseSemantica(simbolos)
     
-    parser = Parser(lexer.tokens)
-    parser.parse()
+    if argumentos.stream:
+        with abre_arq_entrada(argumentos.arquivo) as arq:
+            lexer_stream = LexerStream(arq, simbolos = simbolos)
+            classe_parser = ParserIterativo if argumentos.iterativo else Parser
+            parser = classe_parser(JanelaTokens(lexer_stream.gera_tokens()))
+            analisador.analisar(parser.itera_declaracoes())
+    else:
+        entrada = None if argumentos.mmap else le_arq_entrada(argumentos.arquivo)
+        cache = CacheCompilacao(argumentos.cache) if argumentos.cache is not None else None
+        salvo = cache.carrega(entrada, simbolos) if cache is not None else None
+        
+        if salvo is not None:
+            _, declaracoes = salvo
+        else:
+            if argumentos.mmap:
+                try:
+                    lexer = LexerMmap(argumentos.arquivo, simbolos)
+                except FileNotFoundError:
+                    print("Nao foi possivel abrir o arquivo no caminho especificado.")
+                    exit(1)
+            elif argumentos.buffer:
+                lexer = LexerBuffer(entrada, simbolos)
+            elif argumentos.paralelo is not None:
+                classe = LexerTabela if argumentos.lexer == "tabela" else Lexer
+                lexer = LexerParalelo(entrada, simbolos, argumentos.paralelo, classe)
+            else:
+                lexer = LexerTabela(entrada, simbolos) if argumentos.lexer == "tabela" else Lexer(entrada, simbolos)
+            
+            lexer.lex()
+            
+            if argumentos.buffer:
+                classe_parser = ParserBufferIterativo if argumentos.iterativo else ParserBuffer
+            elif argumentos.compartilhar:
+                classe_parser = ParserCompartilhado
+            else:
+                classe_parser = ParserIterativo if argumentos.iterativo else Parser
+            
+            if argumentos.paralelo is not None and not argumentos.iterativo:
+                parser = ParserParalelo(lexer.tokens, argumentos.paralelo)
+            else:
+                parser = classe_parser(lexer.tokens)
+            
+            parser.parse()
+            declaracoes = parser.declaracoes
+            
+            if argumentos.compartilhar:
+                analisador.compartilhados = parser.fabrica.compartilhados
+            
+            if cache is not None:
+                cache.guarda(entrada, lexer.tokens, declaracoes)
+        
+        try:
+            analisador.analisar(declaracoes)
+        finally:
+            # As colunas das mensagens de erro ainda leem o arquivo mapeado.
+            if argumentos.mmap:
+                lexer.fecha()
         
-    analisador = AnaliseSemantica()
-    analisador.analisar(parser.declaracoes)
+        if cache is not None:
+            print(f"Cache: {cache.acertos} acerto(s), {cache.falhas} falha(s)")
 
     print("Compilado com sucesso")
     print("Essa eh a tabela de simbolos ao final da execucao:")
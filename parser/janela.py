@@ -0,0 +1,29 @@
+from lexer.lex_token import Token
+from collections import deque
+from typing import Iterable
+
+# Sequencia de tokens lida sob demanda de um iterador.
+#
+# O Parser so acessa o proximo token (peek), o ultimo consumido (anterior) e,
+# nas listas de numeros, ate dois tokens depois do proximo, entao basta guardar
+# os ultimos tamanho tokens num buffer circular. Os indices continuam sendo as
+# posicoes absolutas na entrada.
+
+class JanelaTokens:
+    def __init__(self, tokens: Iterable[Token], tamanho: int = 3) -> None:
+        self.fonte = iter(tokens)
+        self.janela: deque[Token] = deque(maxlen=tamanho)
+        # Posicao absoluta do token mais antigo da janela.
+        self.inicio = 0
+
+    def __getitem__(self, indice: int) -> Token:
+        while indice >= self.inicio + len(self.janela):
+            if len(self.janela) == self.janela.maxlen:
+                self.inicio += 1
+
+            self.janela.append(next(self.fonte))
+
+        if indice < self.inicio:
+            raise IndexError(f"O token {indice} ja saiu da janela (inicio: {self.inicio}).")
+
+        return self.janela[indice - self.inicio]
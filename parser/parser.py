@@ -5,23 +5,67 @@ from lexer.lex_token import (
 from arvores_sintaticas.expressao import *
 from arvores_sintaticas.declaracao import *
 from .parser_error import ParserError
-from typing import Optional, NoReturn
+from .janela import JanelaTokens
+from typing import Callable, Iterator, Optional, NoReturn
+from array import array
 
 # Crafting Interpreters, Robert Nystrom - Caps. 6 - 10.
 
+# Precedencia de cada operador binario (quanto maior, mais forte) e o no que
+# ele constroi.
+OPERADORES_BINARIOS: dict[TokenType, tuple[int, type[Binaria] | type[Logica]]] = {
+    TokenType.OR: (1, Logica),
+    TokenType.AND: (2, Logica),
+    TokenType.DIFERENTE: (3, Binaria),
+    TokenType.IGUAL_IGUAL: (3, Binaria),
+    TokenType.MAIOR: (4, Binaria),
+    TokenType.MAIOR_IGUAL: (4, Binaria),
+    TokenType.MENOR: (4, Binaria),
+    TokenType.MENOR_IGUAL: (4, Binaria),
+    TokenType.MENOS: (5, Binaria),
+    TokenType.MAIS: (5, Binaria),
+    TokenType.ASTERISCO: (6, Binaria),
+    TokenType.BARRA: (6, Binaria),
+}
+
+OPERADORES_UNARIOS = {TokenType.EXCLAMACAO, TokenType.MENOS}
+
+# Valor de cada tipo de literal a partir do lexema.
+LITERAIS: dict[TokenType, Callable[[str], TipoLiteral]] = {
+    TokenType.BANDIDO: lambda lexema: False,
+    TokenType.MOCINHO: lambda lexema: True,
+    TokenType.DESERTO: lambda lexema: None,
+    TokenType.STRING: str,
+    TokenType.INT: int,
+    TokenType.FLOAT: float,
+}
+
+# Tipo dos numeros literais de uma ListaCompacta pelo codigo do array dela.
+TIPOS_COMPACTOS: dict[str, TokenType] = {
+    'q': TokenType.INT,
+    'd': TokenType.FLOAT,
+}
+
 class Parser:
-    def __init__(self, tokens: list[Token]) -> None:
+    def __init__(self, tokens: list[Token] | JanelaTokens) -> None:
         self.tokens = tokens
         self.posicao: int = 0
         self.ocorreu_erro = False
+        self.erros: list[ParserError] = []
         self.declaracoes: list[Declaracao] = []
     
     def parse(self) -> None:
+        for declaracao in self.itera_declaracoes():
+            self.declaracoes.append(declaracao)
+    
+    # Gera cada declaracao do nivel mais externo assim que ela termina,
+    # sem guarda-las em self.declaracoes.
+    def itera_declaracoes(self) -> Iterator[Declaracao]:
         while not self.fim_tokens():
             declaracao = self.declaracao()
             
             if declaracao is not None:
-                self.declaracoes.append(declaracao)
+                yield declaracao
                 
         if self.ocorreu_erro:
             exit(1)
@@ -34,6 +78,7 @@ class Parser:
             return self.statement()
         except ParserError as e:
             e.report()
+            self.erros.append(e)
             
             self.sincroniza()
             return None
@@ -50,7 +95,7 @@ class Parser:
                 self.espera(TokenType.DOIS_PONTOS, "Eu esperava ':' depois de um parametro.")
                 tipo_param = self.tipo()
                 
-                params.append(Parametro(token_param, tipo_param))
+                params.append(self.no(Parametro, token_param, tipo_param))
                 
                 if not self.match(TokenType.VIRGULA):
                     break
@@ -61,11 +106,12 @@ class Parser:
         
         tipo_retorno = self.tipo()
         
+        return self.no(Funcao, nome, params, self.corpo_funcao(), tipo_retorno)
+    
+    def corpo_funcao(self) -> list[Declaracao]:
         self.espera(TokenType.ABRE_CHAVE, "Eu esperava '{' antes do corpo de uma funcao.")
         
-        corpo: list[Declaracao] = self.bloco()
-        
-        return Funcao(nome, params, corpo, tipo_retorno)
+        return self.bloco()
     
     def declaracao_variavel(self) -> Declaracao:
         nome: Token = self.espera(TokenType.IDENTIFICADOR, "Eu esperava um nome aqui.")
@@ -81,7 +127,7 @@ class Parser:
             
         self.espera(TokenType.PONTO_VIRGULA, "Eu esperava encontrar ';' depois da declaracao da variavel.")
         
-        return Var(nome, inicializador, tipo)
+        return self.no(Var, nome, inicializador, tipo)
     
     def tipo(self) -> Tipo:
         if self.match(TokenType.LISTA):
@@ -125,7 +171,7 @@ class Parser:
             return self.statement_print()
         
         if self.match(TokenType.ABRE_CHAVE):
-            return Bloco(self.bloco())
+            return self.no(Bloco, self.bloco())
         
         return self.statement_expressao()
     
@@ -138,7 +184,7 @@ class Parser:
             valor = self.expressao()
             
         self.espera(TokenType.PONTO_VIRGULA, "Eu esperava ';' aqui")
-        return Return(token, valor)
+        return self.no(Return, token, valor)
     
     def statement_if(self) -> Declaracao:
         self.espera(TokenType.ABRE_PARENTESES, "Eu esperava '(' apos um if.")
@@ -151,7 +197,7 @@ class Parser:
         if self.match(TokenType.MISS):
             else_branch = self.statement()
             
-        return If(condicao, then_branch, else_branch)
+        return self.no(If, condicao, then_branch, else_branch)
     
     def statement_while(self) -> Declaracao:
         self.espera(TokenType.ABRE_PARENTESES, "Eu esperava '(' apos um while.")
@@ -160,14 +206,14 @@ class Parser:
         
         corpo: Optional[Declaracao] = self.declaracao()
         
-        return While(condicao, corpo)
+        return self.no(While, condicao, corpo)
     
     def statement_print(self) -> Declaracao:
         valor: Expressao = self.expressao()
         
         self.espera(TokenType.PONTO_VIRGULA, "Eu esperava encontrar ';' depois do valor.")
         
-        return Print(valor)
+        return self.no(Print, valor)
     
     def bloco(self) -> list[Declaracao]:
         declaracoes = []
@@ -186,102 +232,51 @@ class Parser:
         
         self.espera(TokenType.PONTO_VIRGULA, "Eu esperava encontrar ';' depois dessa expressao.")
         
-        return Expr(expressao)
+        return self.no(Expr, expressao)
     
+    # As expressoes binarias sao analisadas por precedencia (Pratt): em vez de
+    # uma regra por nivel de precedencia, uma so funcao consulta a tabela
+    # OPERADORES_BINARIOS para decidir se o proximo operador pertence a
+    # expressao atual ou a uma expressao mais externa.
     def expressao(self) -> Expressao:
-        return self.atribuicao()
-    
-    def atribuicao(self) -> Expressao:
-        expressao: Expressao = self.ou()
+        expressao: Expressao = self.operacao(0)
         
+        # A atribuicao tem a menor precedencia e eh associativa a direita.
         if self.match(TokenType.IGUAL):
             igual: Token = self.anterior()
-            valor: Expressao = self.atribuicao()
-            
-            if isinstance(expressao, Variavel):
-                nome: Token = expressao.nome
-                return Atribuicao(nome, valor)
-            
-            self.erro("Isso nao e uma atribuicao valida.", igual)
-            
-        return expressao
-    
-    def ou(self) -> Expressao:
-        expressao: Expressao = self.e()
-        
-        while self.match(TokenType.OR):
-            operador: Token = self.anterior()
-            direita: Expressao = self.e()
-            expressao = Logica(expressao, operador, direita)
+            valor: Expressao = self.expressao()
             
-        return expressao
-    
-    def e(self) -> Expressao:
-        expressao: Expressao = self.igualdade()
-        
-        while self.match(TokenType.AND):
-            operador: Token = self.anterior()
-            direita: Expressao = self.igualdade()
-            expressao = Logica(expressao, operador, direita)
+            nome: Optional[Token] = self.nome_variavel(expressao)
             
-        return expressao
-    
-    def igualdade(self) -> Expressao:
-        expressao = self.comparacao()
-        
-        while self.match(TokenType.DIFERENTE, TokenType.IGUAL_IGUAL):
-            operador = self.anterior()
-            direita = self.comparacao()
-            expressao = Binaria(expressao, operador, direita)
+            if nome is not None:
+                return self.no(Atribuicao, nome, valor)
             
-        return expressao
-    
-    def comparacao(self) -> Expressao:
-        expressao = self.termo()
-        
-        while self.match(
-            TokenType.MAIOR,
-            TokenType.MAIOR_IGUAL,
-            TokenType.MENOR,
-            TokenType.MENOR_IGUAL
-        ):
-            operador = self.anterior()
-            direita = self.termo()
-            expressao = Binaria(expressao, operador, direita)
+            self.erro("Isso nao e uma atribuicao valida.", igual)
             
         return expressao
     
-    def termo(self) -> Expressao:
-        expressao = self.fator()
+    # Analisa uma expressao cujos operadores binarios tem precedencia maior
+    # que precedencia_minima. Todos os operadores binarios sao associativos a
+    # esquerda, entao o operando da direita so aceita operadores mais fortes.
+    def operacao(self, precedencia_minima: int) -> Expressao:
+        expressao: Expressao = self.unaria()
         
-        while self.match(
-            TokenType.MENOS,
-            TokenType.MAIS
-        ):
-            operador = self.anterior()
-            direita = self.fator()
-            expressao = Binaria(expressao, operador, direita)
+        while True:
+            operador = OPERADORES_BINARIOS.get(self.tipo_atual())
             
-        return expressao
-    
-    def fator(self) -> Expressao:
-        expressao = self.unaria()
-        
-        while self.match(
-            TokenType.ASTERISCO,
-            TokenType.BARRA
-        ):
-            operador = self.anterior()
-            direita = self.unaria()
-            expressao = Binaria(expressao, operador, direita)
+            if operador is None or operador[0] <= precedencia_minima:
+                return expressao
             
-        return expressao
+            precedencia, classe = operador
+            token: Token = self.avanca()
+            direita: Expressao = self.operacao(precedencia)
+            expressao = self.no(classe, expressao, token, direita)
     
     def unaria(self) -> Expressao:
-        if self.match(TokenType.EXCLAMACAO, TokenType.MENOS):
-            operador = self.anterior()
+        if self.tipo_atual() in OPERADORES_UNARIOS:
+            operador = self.avanca()
             direita = self.unaria()
-            return Unaria(operador, direita)
+            return self.no(Unaria, operador, direita)
         
         return self.chamada()
     
@@ -305,31 +300,30 @@ class Parser:
         
         paren: Token = self.espera(TokenType.FECHA_PARENTESES, "Eu esperava ')' depois dos argumentos.")
         
-        return Chamada(chamado, paren, argumentos)
+        return self.no(Chamada, chamado, paren, argumentos)
     
     def primaria(self) -> Expressao:
-        if self.match(TokenType.BANDIDO): return Literal(False, TokenType.BANDIDO)
-        if self.match(TokenType.MOCINHO): return Literal(True, TokenType.MOCINHO)
-        if self.match(TokenType.DESERTO): return Literal(None, TokenType.DESERTO)
-        if self.match(TokenType.STRING): return Literal(self.anterior().lexema, TokenType.STRING)
+        literal = LITERAIS.get(self.tipo_atual())
         
-        if self.match(TokenType.INT): 
-            return Literal(int(self.anterior().lexema), TokenType.INT)
-        if self.match(TokenType.FLOAT): 
-            return Literal(float(self.anterior().lexema), TokenType.FLOAT)
+        if literal is not None:
+            token = self.avanca()
+            return self.no(Literal, literal(token.lexema), token.tipo)
         
         if self.match(TokenType.IDENTIFICADOR):
-            return Variavel(self.anterior())
+            return self.no(Variavel, self.anterior())
         
         if self.match(TokenType.ABRE_PARENTESES):
             expressao = self.expressao()
             self.espera(TokenType.FECHA_PARENTESES, "Esperado ')' apos essa expressao")
-            return Agrupamento(expressao)
+            return self.no(Agrupamento, expressao)
         
         if self.match(TokenType.ABRE_COLCHETE):
-            elementos = []
+            elementos = self.lista_compacta()
             
-            if not self.check(TokenType.FECHA_COLCHETE):
+            if not isinstance(elementos, list):
+                return elementos
+            
+            if elementos or not self.check(TokenType.FECHA_COLCHETE):
                 while True:
                     elementos.append(self.expressao())
                     
@@ -338,10 +332,94 @@ class Parser:
         
             self.espera(TokenType.FECHA_COLCHETE, "Eu esperava ']' depois de uma lista.")
             
-            return Lista(elementos)
+            return self.no(Lista, elementos)
         
         self.erro("Eu esperava uma expressao aqui")
-        
+    
+    # Le, logo depois do '[', os elementos que sao so um numero literal (com ou
+    # sem '-' na frente), todos do mesmo tipo, guardando so os valores num
+    # array. Se a lista inteira for assim, consome o ']' e retorna uma
+    # ListaCompacta. Senao, para no comeco do primeiro elemento que nao eh e
+    # retorna os nos dos elementos ja lidos, iguais aos que primaria montaria.
+    # Um inteiro que nao cabe em 64 bits tambem encerra a parte compacta, e um
+    # -0 inteiro tambem, porque no array ele seria igual a 0.
+    def lista_compacta(self) -> Expressao | list[Expressao]:
+        valores = None
+        negativos: list[tuple[int, Token]] = []  # O '-' de cada valor negativo, pelo indice.
+        
+        while True:
+            tipo = self.tipo_atual()
+            sinal = 0
+            
+            if tipo is TokenType.MENOS:
+                sinal = 1
+                tipo = self.tipo_em(1)
+            
+            if tipo is TokenType.INT:
+                codigo = 'q'
+            elif tipo is TokenType.FLOAT:
+                codigo = 'd'
+            else:
+                break
+            
+            separador = self.tipo_em(sinal + 1)
+            
+            if separador is not TokenType.VIRGULA and separador is not TokenType.FECHA_COLCHETE:
+                break
+            
+            if valores is None:
+                valores = array(codigo)
+            elif valores.typecode != codigo:
+                break
+            
+            lexema = self.lexema_em(sinal)
+            valor = int(lexema) if codigo == 'q' else float(lexema)
+            
+            if sinal and codigo == 'q' and valor == 0:
+                break
+            
+            try:
+                valores.append(-valor if sinal else valor)
+            except OverflowError:
+                break
+            
+            if sinal:
+                negativos.append((len(valores) - 1, self.peek()))
+            
+            self.posicao += sinal + 2
+            
+            if separador is TokenType.FECHA_COLCHETE:
+                return self.no(ListaCompacta, valores)
+        
+        if not valores:
+            return []
+        
+        # Os elementos lidos viram nos, na mesma ordem em que primaria os montaria.
+        elementos = []
+        tipo = TIPOS_COMPACTOS[valores.typecode]
+        negativos.append((len(valores), None))
+        proximo, menos = negativos[0]
+        k = 1
+        
+        for i, valor in enumerate(valores):
+            if i == proximo:
+                elementos.append(self.no(Unaria, menos, self.no(Literal, -valor, tipo)))
+                proximo, menos = negativos[k]
+                k += 1
+            else:
+                elementos.append(self.no(Literal, valor, tipo))
+        
+        return elementos
+        
+    # Monta um no da arvore com os argumentos do construtor da classe. O
+    # ParserArena troca os objetos por indices numa arena (veja arvores_sintaticas.arena).
+    def no(self, classe: type, *argumentos):
+        return classe(*argumentos)
+    
+    # O token do nome, se a expressao for uma Variavel.
+    def nome_variavel(self, expressao: Expressao) -> Optional[Token]:
+        return expressao.nome if isinstance(expressao, Variavel) else None
+    
     def erro(self, mensagem: str, token: Optional[Token] = None) -> NoReturn:
         self.ocorreu_erro = True
         
@@ -405,6 +483,18 @@ class Parser:
     def fim_tokens(self) -> bool:
         return self.peek().tipo == TokenType.EOF
     
+    # Retorna o tipo do proximo token sem o consumir.
+    def tipo_atual(self) -> TokenType:
+        return self.tokens[self.posicao].tipo
+    
+    # Retorna o tipo do token a deslocamento tokens do proximo.
+    def tipo_em(self, deslocamento: int) -> TokenType:
+        return self.tokens[self.posicao + deslocamento].tipo
+    
+    # Retorna o lexema do token a deslocamento tokens do proximo.
+    def lexema_em(self, deslocamento: int) -> str:
+        return self.tokens[self.posicao + deslocamento].lexema
+    
     # Retorna qual o proximo token na lista sem o consumir.
     def peek(self) -> Token:
         return self.tokens[self.posicao]
@@ -0,0 +1,33 @@
+from lexer.lex_token import Token
+from arvores_sintaticas.arena import Arena, ConstrutorArena, VARIAVEL
+from .parser import Parser
+from .parser_iterativo import ParserIterativo
+from typing import Optional
+
+# Parser que monta a arvore numa Arena (veja arvores_sintaticas.arena) em vez
+# de objetos: cada no eh o indice dele na arena, e self.declaracoes guarda os
+# indices das declaracoes do nivel mais externo. Depois de parse(),
+# self.arena tem a arvore inteira; self.arena.declaracoes() retorna visoes
+# que a AnaliseSemantica aceita.
+
+class ParserArena(Parser):
+    def __init__(self, tokens: list[Token]) -> None:
+        super().__init__(tokens)
+        self.construtor = ConstrutorArena(tokens)
+        self.no = self.construtor.no
+        self.arena: Arena = self.construtor.arena
+
+    def parse(self) -> None:
+        try:
+            super().parse()
+        finally:
+            self.construtor.termina(self.declaracoes)
+
+    def nome_variavel(self, expressao: int) -> Optional[Token]:
+        arena = self.arena
+
+        return arena.tokens[arena.token[expressao]] if arena.tipos[expressao] == VARIAVEL else None
+
+# ParserArena que nao usa a pilha do Python para as regras aninhadas.
+class ParserArenaIterativo(ParserArena, ParserIterativo):
+    pass
@@ -0,0 +1,54 @@
+from lexer.lex_token import Token, TokenType
+from lexer.token_buffer import TokenBuffer, CODIGOS, TIPOS
+from .parser import Parser
+
+# Parser que consulta direto os arrays de um TokenBuffer.
+#
+# check, match, espera, tipo_atual, tipo_em e fim_tokens comparam o codigo do tipo
+# guardado em tokens.tipos pela posicao, sem criar um Token, e lexema_em le o
+# lexema direto da tabela. So quando um
+# token eh devolvido (espera, peek, anterior) eh que um Token eh montado a
+# partir do buffer.
+
+EOF_CODIGO = CODIGOS[TokenType.EOF]
+
+class ParserBuffer(Parser):
+    def __init__(self, tokens: TokenBuffer) -> None:
+        super().__init__(tokens)
+        self.tipos = tokens.tipos
+    
+    def espera(self, tipo: TokenType, mensagem: str) -> Token:
+        if self.check(tipo):
+            self.posicao += 1
+            return self.tokens[self.posicao - 1]
+        
+        self.erro(mensagem)
+    
+    def match(self, *tipos: TokenType) -> bool:
+        atual = self.tipos[self.posicao]
+        
+        if atual == EOF_CODIGO:
+            return False
+        
+        for tipo in tipos:
+            if atual == CODIGOS[tipo]:
+                self.posicao += 1
+                return True
+        
+        return False
+    
+    def check(self, tipo: TokenType) -> bool:
+        atual = self.tipos[self.posicao]
+        return atual == CODIGOS[tipo] and atual != EOF_CODIGO
+    
+    def tipo_atual(self) -> TokenType:
+        return TIPOS[self.tipos[self.posicao]]
+    
+    def tipo_em(self, deslocamento: int) -> TokenType:
+        return TIPOS[self.tipos[self.posicao + deslocamento]]
+    
+    def lexema_em(self, deslocamento: int) -> str:
+        return self.tokens.lexema(self.posicao + deslocamento)
+    
+    def fim_tokens(self) -> bool:
+        return self.tipos[self.posicao] == EOF_CODIGO
@@ -0,0 +1,44 @@
+from lexer.lex_token import Token
+from arvores_sintaticas.declaracao import Declaracao
+from arvores_sintaticas.compartilhamento import FabricaCompartilhada
+from .parser import Parser
+
+# Parser que monta as expressoes por uma FabricaCompartilhada (veja
+# arvores_sintaticas.compartilhamento): expressoes iguais e sem efeitos
+# colaterais que se referem as mesmas declaracoes viram um so objeto. Depois de
+# parse(), self.fabrica.compartilhados tem os nos que aparecem mais de uma vez,
+# que a AnaliseSemantica recebe para calcular o tipo deles uma vez so.
+#
+# A fabrica precisa saber dos escopos: cada bloco abre um, e cada funcao
+# declara o nome dela antes dos parametros e abre um escopo para eles, como a
+# AnaliseSemantica faz.
+
+class ParserCompartilhado(Parser):
+    def __init__(self, tokens: list[Token]) -> None:
+        super().__init__(tokens)
+        self.fabrica = FabricaCompartilhada()
+        self.no = self.fabrica.no
+
+    def parse(self) -> None:
+        try:
+            super().parse()
+        finally:
+            self.fabrica.termina()
+
+    def declaracao_funcao(self) -> Declaracao:
+        # O proximo token eh o nome; se nao for, declaracao_funcao lanca o erro.
+        self.fabrica.declara(self.peek().simbolo)
+        self.fabrica.abre_escopo()
+
+        try:
+            return super().declaracao_funcao()
+        finally:
+            self.fabrica.fecha_escopo()
+
+    def bloco(self) -> list[Declaracao]:
+        self.fabrica.abre_escopo()
+
+        try:
+            return super().bloco()
+        finally:
+            self.fabrica.fecha_escopo()
@@ -1,14 +1,26 @@
 from lexer.lex_token import (Token, TokenType)
+from typing import Optional
 
+# A posicao do erro eh a do token; a linha e a coluna vem dele.
 class ParserError(Exception):
     def __init__(self, token: Token, mensagem: str) -> None:
+        super().__init__(token, mensagem)
         self.token = token
         self.mensagem = mensagem
     
+    @property
+    def linha(self) -> int:
+        return self.token.linha
+    
+    @property
+    def coluna(self) -> Optional[int]:
+        return self.token.coluna
+    
     def report(self) -> None:
         print("\033[91mErro na analise sintatica:\033[0m")
         
         if self.token.tipo == TokenType.EOF:
             print(f"Erro no fim do arquivo\n{self.mensagem}\n\n")
         else:
-            print(f"Erro na linha {self.token.linha}: {self.token.lexema}\n{self.mensagem}\n\n")
\ No newline at end of file
+            posicao = f"linha {self.linha}" if self.coluna is None else f"linha {self.linha}, coluna {self.coluna}"
+            print(f"Erro na {posicao}: {self.token.lexema}\n{self.mensagem}\n\n")
\ No newline at end of file
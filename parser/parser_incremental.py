@@ -0,0 +1,116 @@
+from lexer.lex_token import Token
+from arvores_sintaticas.declaracao import Declaracao
+from .parser import Parser
+from typing import Iterator, Optional
+
+# Analise sintatica incremental de uma nova versao do codigo.
+#
+# Guarda, para cada declaracao do nivel mais externo, o intervalo [inicio, fim)
+# dos seus tokens e uma impressao digital deles: a tupla dos tipos, lexemas,
+# simbolos e posicoes (relativas ao primeiro token) e do tipo do token logo
+# depois, que o parser tambem consulta (um 'miss' depois de um 'bang', por
+# exemplo). Com os mesmos tokens, a declaracao seria analisada do mesmo jeito,
+# entao na versao seguinte uma declaracao que comeca onde comecava uma antiga
+# (no mesmo indice, antes da edicao, ou deslocada pela diferenca no numero de
+# tokens, depois dela) e tem a mesma impressao eh reaproveitada: o mesmo objeto
+# vai para self.declaracoes. As demais sao analisadas de novo.
+#
+# Cada declaracao antiga eh reaproveitada no maximo uma vez, e na ordem: o
+# indice dela tem que ser maior que o da ultima reaproveitada. Depois da
+# primeira reaproveitada com o deslocamento, que ja esta depois da edicao, o
+# mesmo indice nao eh mais tentado.
+#
+# Os tokens de uma declaracao reaproveitada sao os objetos antigos, que estao
+# na arvore: eles recebem a posicao e o indice de linhas dos tokens novos e os
+# substituem na lista de tokens, para que a arvore continue apontando para os
+# tokens da lista (e as linhas e colunas continuem certas). Por isso as duas
+# versoes precisam usar a mesma tabela de simbolos, e o parser anterior nao deve
+# mais ser usado.
+
+class ParserIncremental(Parser):
+    def __init__(self, tokens: list[Token], anterior: Optional["ParserIncremental"] = None) -> None:
+        super().__init__(tokens)
+        # Sem arvore completa da versao anterior, nao ha o que reaproveitar.
+        self.versao_anterior = anterior if anterior is not None and not anterior.ocorreu_erro else None
+        # Intervalo de tokens, impressao digital e arvore (None se teve erro) de cada declaracao.
+        self.intervalos: list[tuple[int, int]] = []
+        self.impressoes: list[tuple] = []
+        self.itens: list[Optional[Declaracao]] = []
+        self.reaproveitadas = 0
+
+    def itera_declaracoes(self) -> Iterator[Declaracao]:
+        if self.versao_anterior is not None:
+            self.inicios_anteriores = {inicio: k for k, (inicio, _) in enumerate(self.versao_anterior.intervalos)}
+            diferenca = len(self.tokens) - len(self.versao_anterior.tokens)
+            self.deslocamentos = [0] if diferenca == 0 else [0, diferenca]
+            self.ultima_reaproveitada = -1
+
+        while not self.fim_tokens():
+            inicio = self.posicao
+            k = self.reaproveita(inicio) if self.versao_anterior is not None else None
+
+            if k is None:
+                declaracao = self.declaracao()
+                impressao = self.impressao(inicio, self.posicao)
+            else:
+                declaracao = self.versao_anterior.itens[k]
+                impressao = self.versao_anterior.impressoes[k]
+                self.reaproveitadas += 1
+
+            self.intervalos.append((inicio, self.posicao))
+            self.impressoes.append(impressao)
+            self.itens.append(declaracao)
+
+            if declaracao is not None:
+                yield declaracao
+
+        # A versao anterior nao eh mais necessaria.
+        self.versao_anterior = None
+
+        if self.ocorreu_erro:
+            exit(1)
+
+    # Impressao digital dos tokens em [inicio, fim).
+    def impressao(self, inicio: int, fim: int) -> tuple:
+        tokens = self.tokens
+        base = tokens[inicio].posicao
+
+        return (
+            tuple((t.tipo, t.lexema, t.simbolo, t.posicao - base) for t in tokens[inicio:fim]),
+            tokens[fim].tipo,
+        )
+
+    # Se uma declaracao da versao anterior pode ser reaproveitada a partir do
+    # token inicio, move os tokens dela para a lista, avanca ate o fim dela e
+    # retorna o seu indice. Caso contrario, retorna None.
+    def reaproveita(self, inicio: int) -> Optional[int]:
+        anterior = self.versao_anterior
+
+        for deslocamento in self.deslocamentos:
+            k = self.inicios_anteriores.get(inicio - deslocamento)
+
+            if k is None or k <= self.ultima_reaproveitada:
+                continue
+
+            a, b = anterior.intervalos[k]
+            fim = inicio + b - a
+
+            if fim >= len(self.tokens) or self.impressao(inicio, fim) != anterior.impressoes[k]:
+                continue
+
+            for antigo, i in zip(anterior.tokens[a:b], range(inicio, fim)):
+                novo = self.tokens[i]
+
+                if antigo is not novo:
+                    antigo.posicao = novo.posicao
+                    antigo.linhas = novo.linhas
+                    self.tokens[i] = antigo
+
+            if deslocamento != 0:
+                self.deslocamentos = [deslocamento]
+
+            self.ultima_reaproveitada = k
+            self.posicao = fim
+            return k
+
+        return None
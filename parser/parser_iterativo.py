@@ -0,0 +1,279 @@
+from lexer.lex_token import Token, TokenType
+from arvores_sintaticas.expressao import *
+from arvores_sintaticas.declaracao import *
+from .parser import Parser, OPERADORES_BINARIOS, OPERADORES_UNARIOS, LITERAIS
+from .parser_buffer import ParserBuffer
+from .parser_error import ParserError
+from typing import Generator, Optional
+
+# Parser que nao usa a pilha do Python para as regras aninhadas.
+#
+# Cada regra que pode conter outra (declaracoes, blocos, if, while e
+# expressoes entre parenteses, colchetes ou argumentos) eh um gerador: em vez
+# de chamar a outra regra, ele faz yield do gerador dela e recebe de volta a
+# arvore construida. executa guarda os geradores em andamento numa lista, entao
+# a profundidade do codigo so ocupa memoria do heap, e um ParserError lancado
+# numa regra eh repassado (com throw) para a regra de cima, como aconteceria
+# com a pilha do Python.
+#
+# Os operadores unarios e binarios de uma mesma expressao nao precisam de
+# regras aninhadas: os unarios sao acumulados numa lista e os binarios numa
+# pilha de operadores, que eh reduzida conforme a precedencia.
+#
+# As arvores, os erros e os tokens consumidos sao os mesmos do Parser.
+
+Regra = Generator["Regra", object, object]
+
+class ParserIterativo(Parser):
+    def declaracao(self) -> Optional[Declaracao]:
+        return self.executa(self.gera_declaracao())
+
+    def expressao(self) -> Expressao:
+        return self.executa(self.gera_expressao())
+
+    # Executa a regra e as regras de que ela depende ate ela retornar.
+    def executa(self, regra: Regra):
+        pilha: list[Regra] = [regra]
+        valor = None
+        erro: Optional[ParserError] = None
+
+        while pilha:
+            try:
+                if erro is None:
+                    proxima = pilha[-1].send(valor)
+                else:
+                    erro, lancado = None, erro
+                    proxima = pilha[-1].throw(lancado)
+            except StopIteration as fim:
+                pilha.pop()
+                valor = fim.value
+                continue
+            except ParserError as e:
+                pilha.pop()
+
+                if not pilha:
+                    raise
+
+                erro = e
+                continue
+
+            pilha.append(proxima)
+            valor = None
+
+        return valor
+
+    def gera_declaracao(self) -> Regra:
+        try:
+            if self.match(TokenType.PROCURADO): return (yield self.gera_declaracao_funcao())
+            if self.match(TokenType.XERIFE): return (yield self.gera_declaracao_variavel())
+
+            return (yield self.gera_statement())
+        except ParserError as e:
+            e.report()
+            self.erros.append(e)
+
+            self.sincroniza()
+            return None
+
+    def gera_declaracao_funcao(self) -> Regra:
+        nome: Token = self.espera(TokenType.IDENTIFICADOR, "Eu esperava encontrar um nome.")
+        self.espera(TokenType.ABRE_PARENTESES, "Eu esperava '(' depois de um nome de funcao.")
+
+        params: list[Parametro] = []
+
+        if not self.check(TokenType.FECHA_PARENTESES):
+            while True:
+                token_param = self.espera(TokenType.IDENTIFICADOR, "Eu esperava o nome de um parametro.")
+                self.espera(TokenType.DOIS_PONTOS, "Eu esperava ':' depois de um parametro.")
+                tipo_param = self.tipo()
+
+                params.append(self.no(Parametro, token_param, tipo_param))
+
+                if not self.match(TokenType.VIRGULA):
+                    break
+
+        self.espera(TokenType.FECHA_PARENTESES, "Eu esperava ')' depois dos parametros de uma funcao.")
+
+        self.espera(TokenType.DOIS_PONTOS, "Eu esperava ':' depois de uma funcao.")
+
+        tipo_retorno = self.tipo()
+
+        self.espera(TokenType.ABRE_CHAVE, "Eu esperava '{' antes do corpo de uma funcao.")
+
+        corpo: list[Declaracao] = yield self.gera_bloco()
+
+        return self.no(Funcao, nome, params, corpo, tipo_retorno)
+
+    def gera_declaracao_variavel(self) -> Regra:
+        nome: Token = self.espera(TokenType.IDENTIFICADOR, "Eu esperava um nome aqui.")
+
+        self.espera(TokenType.DOIS_PONTOS, "Eu esperava encontrar ':' depois de um nome de variavel.")
+
+        tipo = self.tipo()
+
+        inicializador: Optional[Expressao] = None
+
+        if self.match(TokenType.IGUAL):
+            inicializador = yield self.gera_expressao()
+
+        self.espera(TokenType.PONTO_VIRGULA, "Eu esperava encontrar ';' depois da declaracao da variavel.")
+
+        return self.no(Var, nome, inicializador, tipo)
+
+    def gera_statement(self) -> Regra:
+        if self.match(TokenType.BANG):
+            self.espera(TokenType.ABRE_PARENTESES, "Eu esperava '(' apos um if.")
+            condicao: Expressao = yield self.gera_expressao()
+            self.espera(TokenType.FECHA_PARENTESES, "Eu esperava ')' apos uma condicao.")
+
+            then_branch: Declaracao = yield self.gera_statement()
+            else_branch: Optional[Declaracao] = None
+
+            if self.match(TokenType.MISS):
+                else_branch = yield self.gera_statement()
+
+            return self.no(If, condicao, then_branch, else_branch)
+
+        if self.match(TokenType.CAVALGANDO):
+            self.espera(TokenType.ABRE_PARENTESES, "Eu esperava '(' apos um while.")
+            condicao = yield self.gera_expressao()
+            self.espera(TokenType.FECHA_PARENTESES, "Eu esperava ')' apos uma condicao.")
+
+            corpo: Optional[Declaracao] = yield self.gera_declaracao()
+
+            return self.no(While, condicao, corpo)
+
+        if self.match(TokenType.VORTA):
+            token: Token = self.anterior()
+
+            valor: Optional[Expressao] = None
+            if not self.check(TokenType.PONTO_VIRGULA):
+                valor = yield self.gera_expressao()
+
+            self.espera(TokenType.PONTO_VIRGULA, "Eu esperava ';' aqui")
+            return self.no(Return, token, valor)
+
+        if self.match(TokenType.ATIRE):
+            valor = yield self.gera_expressao()
+
+            self.espera(TokenType.PONTO_VIRGULA, "Eu esperava encontrar ';' depois do valor.")
+
+            return self.no(Print, valor)
+
+        if self.match(TokenType.ABRE_CHAVE):
+            return self.no(Bloco, (yield self.gera_bloco()))
+
+        expressao: Expressao = yield self.gera_expressao()
+
+        self.espera(TokenType.PONTO_VIRGULA, "Eu esperava encontrar ';' depois dessa expressao.")
+
+        return self.no(Expr, expressao)
+
+    def gera_bloco(self) -> Regra:
+        declaracoes = []
+
+        while not self.check(TokenType.FECHA_CHAVE) and not self.fim_tokens():
+            declaracao = yield self.gera_declaracao()
+
+            if declaracao is not None:
+                declaracoes.append(declaracao)
+
+        self.espera(TokenType.FECHA_CHAVE, "Eu esperava '}' aqui.")
+        return declaracoes
+
+    # Uma expressao inteira, ate o primeiro token que nao faz parte dela.
+    # Cada operando eh lido por completo (operadores unarios, primaria e
+    # chamadas) e depois empilhado junto com o operador binario que o segue.
+    # Antes de empilhar um operador, os operadores da pilha com precedencia
+    # maior ou igual (todos sao associativos a esquerda) sao reduzidos.
+    def gera_expressao(self) -> Regra:
+        operadores: list[tuple[Expressao, Token, int, type]] = []
+
+        while True:
+            unarios: list[Token] = []
+
+            while self.tipo_atual() in OPERADORES_UNARIOS:
+                unarios.append(self.avanca())
+
+            expressao: Expressao = yield from self.gera_primaria()
+
+            while self.match(TokenType.ABRE_PARENTESES):
+                argumentos = []
+
+                if not self.check(TokenType.FECHA_PARENTESES):
+                    while True:
+                        argumentos.append((yield self.gera_expressao()))
+
+                        if not self.match(TokenType.VIRGULA):
+                            break
+
+                paren: Token = self.espera(TokenType.FECHA_PARENTESES, "Eu esperava ')' depois dos argumentos.")
+
+                expressao = self.no(Chamada, expressao, paren, argumentos)
+
+            for operador in reversed(unarios):
+                expressao = self.no(Unaria, operador, expressao)
+
+            binario = OPERADORES_BINARIOS.get(self.tipo_atual())
+
+            while operadores and (binario is None or operadores[-1][2] >= binario[0]):
+                esquerda, token, _, classe = operadores.pop()
+                expressao = self.no(classe, esquerda, token, expressao)
+
+            if binario is None:
+                break
+
+            precedencia, classe = binario
+            operadores.append((expressao, self.avanca(), precedencia, classe))
+
+        if self.match(TokenType.IGUAL):
+            igual: Token = self.anterior()
+            valor: Expressao = yield self.gera_expressao()
+
+            nome: Optional[Token] = self.nome_variavel(expressao)
+
+            if nome is not None:
+                return self.no(Atribuicao, nome, valor)
+
+            self.erro("Isso nao e uma atribuicao valida.", igual)
+
+        return expressao
+
+    # Parte de gera_expressao (com yield from), para nao criar uma regra por operando.
+    def gera_primaria(self) -> Regra:
+        literal = LITERAIS.get(self.tipo_atual())
+
+        if literal is not None:
+            token = self.avanca()
+            return self.no(Literal, literal(token.lexema), token.tipo)
+
+        if self.match(TokenType.IDENTIFICADOR):
+            return self.no(Variavel, self.anterior())
+
+        if self.match(TokenType.ABRE_PARENTESES):
+            expressao = yield self.gera_expressao()
+            self.espera(TokenType.FECHA_PARENTESES, "Esperado ')' apos essa expressao")
+            return self.no(Agrupamento, expressao)
+
+        if self.match(TokenType.ABRE_COLCHETE):
+            elementos = self.lista_compacta()
+
+            if not isinstance(elementos, list):
+                return elementos
+
+            if elementos or not self.check(TokenType.FECHA_COLCHETE):
+                while True:
+                    elementos.append((yield self.gera_expressao()))
+
+                    if not self.match(TokenType.VIRGULA):
+                        break
+
+            self.espera(TokenType.FECHA_COLCHETE, "Eu esperava ']' depois de uma lista.")
+
+            return self.no(Lista, elementos)
+
+        self.erro("Eu esperava uma expressao aqui")
+
+# ParserIterativo que consulta direto os arrays de um TokenBuffer.
+class ParserBufferIterativo(ParserIterativo, ParserBuffer):
+    pass
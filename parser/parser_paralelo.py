@@ -0,0 +1,183 @@
+from lexer.lex_token import Token, TokenType
+from lexer.token_buffer import CODIGOS, TIPOS
+from .parser import Parser
+from .parser_error import ParserError
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+import bisect
+import contextlib
+import io
+import os
+import pickle
+
+# Analise sintatica das declaracoes do nivel mais externo em varios processos.
+#
+# Uma varredura dos tipos dos tokens conta a profundidade de chaves,
+# parenteses e colchetes e marca como fronteira todo 'procurado' ou 'xerife'
+# na profundidade 0 logo depois de um ';' ou de um '}': ali termina uma
+# declaracao e comeca outra. Cada trecho entre fronteiras vai para um processo
+# como arrays compactos (tipo, lexema e simbolo de cada token), eh analisado
+# por um Parser comum e volta serializado, com cada Token trocado pelo seu
+# indice na lista original. O processo principal junta as declaracoes na
+# ordem do codigo, com os proprios tokens dele (e portanto as linhas certas),
+# e reporta os erros de cada trecho na ordem.
+#
+# Num trecho sem erro que chegue ao fim dele, o parser do trecho faz as mesmas
+# escolhas que faria no codigo inteiro. Se um trecho do meio tiver um erro no
+# proprio EOF, a fronteira nao era segura (faltou fechar alguma coisa), e o
+# resto do codigo eh analisado de uma vez no processo principal.
+
+ABRE = {TokenType.ABRE_CHAVE, TokenType.ABRE_PARENTESES, TokenType.ABRE_COLCHETE}
+FECHA = {TokenType.FECHA_CHAVE, TokenType.FECHA_PARENTESES, TokenType.FECHA_COLCHETE}
+INICIOS = {TokenType.PROCURADO, TokenType.XERIFE}
+FINAIS = {TokenType.PONTO_VIRGULA, TokenType.FECHA_CHAVE}
+
+# Retorna os indices dos tokens que comecam uma declaracao do nivel mais externo.
+def fronteiras(tokens: list[Token]) -> list[int]:
+    resultado = []
+    profundidade = 0
+    anterior = None
+
+    for i, token in enumerate(tokens):
+        tipo = token.tipo
+
+        if tipo in ABRE:
+            profundidade += 1
+        elif tipo in FECHA:
+            profundidade -= 1
+        elif tipo in INICIOS and profundidade == 0 and anterior in FINAIS:
+            resultado.append(i)
+
+        anterior = tipo
+
+    return resultado
+
+# Serializa as declaracoes e os erros de um trecho, trocando cada Token pelo
+# seu indice na lista original. A troca fica na dispatch_table, que o pickle
+# so consulta para objetos Token: os demais objetos sao serializados sem
+# nenhuma chamada em Python.
+class _PicklerTrecho(pickle.Pickler):
+    def __init__(self, arquivo, indices: dict[int, int]) -> None:
+        super().__init__(arquivo, pickle.HIGHEST_PROTOCOL)
+        self.dispatch_table = {Token: lambda token: (_token, (indices[id(token)],))}
+
+# Marcador serializado no lugar dos tokens; na leitura, vira self.tokens.__getitem__.
+def _token(indice: int) -> Token:
+    raise RuntimeError("Tokens de um trecho so podem ser lidos por _UnpicklerTrecho.")
+
+class _UnpicklerTrecho(pickle.Unpickler):
+    def __init__(self, arquivo, tokens: list[Token]) -> None:
+        super().__init__(arquivo)
+        self.tokens = tokens
+
+    def find_class(self, modulo: str, nome: str):
+        if modulo == __name__ and nome == "_token":
+            return self.tokens.__getitem__
+
+        return super().find_class(modulo, nome)
+
+# Analisa um trecho num processo separado. Retorna as declaracoes e os erros
+# serializados e se algum erro aconteceu no EOF do trecho.
+def _analisa_trecho(tipos: bytes, lexemas: list[str], simbolos: array, inicio: int) -> tuple[bytes, bool]:
+    tokens = [
+        Token(TIPOS[codigo], lexema, simbolo = simbolo)
+        for codigo, lexema, simbolo in zip(tipos, lexemas, simbolos)
+    ]
+    tokens.append(Token(TokenType.EOF, ""))
+
+    parser = Parser(tokens)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        try:
+            parser.parse()
+        except SystemExit:
+            pass
+
+    indices = {id(token): inicio + i for i, token in enumerate(tokens)}
+    arquivo = io.BytesIO()
+    _PicklerTrecho(arquivo, indices).dump((parser.declaracoes, parser.erros))
+
+    return arquivo.getvalue(), any(erro.token is tokens[-1] for erro in parser.erros)
+
+class ParserParalelo(Parser):
+    def __init__(self, tokens: list[Token], trabalhadores: Optional[int] = None, tamanho_minimo: int = 1 << 14) -> None:
+        super().__init__(tokens)
+        self.trabalhadores = trabalhadores if trabalhadores is not None else os.cpu_count() or 1
+        # Trechos com menos tokens que isso nao compensam o custo de mandar para outro processo.
+        self.tamanho_minimo = tamanho_minimo
+
+    # Divide os tokens (sem o EOF) em ate um trecho por trabalhador, de tamanhos parecidos.
+    def divide(self) -> list[tuple[int, int]]:
+        n = len(self.tokens) - 1
+        partes = max(1, min(self.trabalhadores, n // max(1, self.tamanho_minimo)))
+
+        if partes == 1:
+            return [(0, n)]
+
+        candidatos = fronteiras(self.tokens)
+        cortes = [0]
+
+        for i in range(1, partes):
+            k = bisect.bisect_left(candidatos, n * i // partes)
+
+            if k < len(candidatos) and candidatos[k] > cortes[-1]:
+                cortes.append(candidatos[k])
+
+        cortes.append(n)
+
+        return list(zip(cortes, cortes[1:]))
+
+    # Arrays compactos com os tokens de [inicio, fim), para mandar a outro processo.
+    def empacota(self, inicio: int, fim: int) -> tuple[bytes, list[str], array, int]:
+        tokens = self.tokens[inicio:fim]
+
+        return (
+            bytes([CODIGOS[token.tipo] for token in tokens]),
+            [token.lexema for token in tokens],
+            array('i', [token.simbolo for token in tokens]),
+            inicio,
+        )
+
+    def parse(self) -> None:
+        trechos = self.divide()
+
+        if len(trechos) == 1:
+            super().parse()
+            return
+
+        with ProcessPoolExecutor(max_workers = min(self.trabalhadores, len(trechos))) as executor:
+            resultados = executor.map(_analisa_trecho, *zip(*(self.empacota(a, b) for a, b in trechos)))
+
+            for (inicio, _), (dados, erro_no_fim) in zip(trechos[:-1], resultados):
+                if erro_no_fim:
+                    executor.shutdown(cancel_futures = True)
+                    self.analisa_resto(inicio)
+                    return
+
+                self.junta(dados)
+            else:
+                self.junta(next(resultados)[0])
+
+        self.posicao = len(self.tokens) - 1
+
+        if self.ocorreu_erro:
+            exit(1)
+
+    # Adiciona as declaracoes e reporta os erros de um trecho.
+    def junta(self, dados: bytes) -> None:
+        declaracoes, erros = _UnpicklerTrecho(io.BytesIO(dados), self.tokens).load()
+
+        self.declaracoes.extend(declaracoes)
+
+        for erro in erros:
+            erro.report()
+            self.erros.append(erro)
+            self.ocorreu_erro = True
+
+    # Analisa aqui mesmo os tokens a partir de inicio.
+    def analisa_resto(self, inicio: int) -> None:
+        self.posicao = inicio
+
+        for declaracao in self.itera_declaracoes():
+            self.declaracoes.append(declaracao)
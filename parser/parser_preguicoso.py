@@ -0,0 +1,82 @@
+from lexer.lex_token import Token, TokenType
+from arvores_sintaticas.declaracao import Declaracao
+from .parser import Parser
+from .parser_error import ParserError
+from typing import Callable
+import contextlib
+import io
+
+# Parser que deixa para depois a analise do corpo das funcoes.
+#
+# Depois da assinatura (nome, parametros e tipo de retorno), o corpo eh
+# pulado contando chaves ate a '}' que fecha a '{' dele, e a Funcao recebe uma
+# funcao que o analisa: so no primeiro acesso a Funcao.corpo eh que as
+# declaracoes do corpo sao montadas, por um parser novo sobre os mesmos tokens,
+# e os erros dele sao reportados (e guardados em self.erros) nesse momento,
+# terminando com exit(1) como no fim de parse(). Quem so precisa das
+# assinaturas faz pouco mais que uma varredura dos tokens.
+#
+# Um corpo sem erros vira a mesma arvore do Parser. Com erros, os reportados
+# sao os do trecho entre as chaves, ja que o corpo nao passa da '}' que o fecha.
+# As funcoes guardam o parser e, com ele, a lista de tokens.
+
+class ParserPreguicoso(Parser):
+    def corpo_funcao(self) -> Callable[[], list[Declaracao]]:
+        self.espera(TokenType.ABRE_CHAVE, "Eu esperava '{' antes do corpo de uma funcao.")
+
+        inicio = self.posicao
+        fim = self.fecha_chave(inicio)
+
+        if fim is None:
+            self.posicao = len(self.tokens) - 1
+            self.erro("Eu esperava '}' aqui.")
+
+        self.posicao = fim + 1
+
+        return lambda: self.analisa_corpo(inicio, fim)
+
+    # Indice da '}' que fecha o bloco que comeca em inicio, ou None se ela nao existe.
+    def fecha_chave(self, inicio: int) -> int | None:
+        abre, fecha = TokenType.ABRE_CHAVE, TokenType.FECHA_CHAVE
+        tokens = self.tokens
+        profundidade = 0
+
+        for i in range(inicio, len(tokens)):
+            tipo = tokens[i].tipo
+
+            if tipo is abre:
+                profundidade += 1
+            elif tipo is fecha:
+                if profundidade == 0:
+                    return i
+
+                profundidade -= 1
+
+        return None
+
+    # Analisa o corpo de uma funcao, cujos tokens vao de inicio ate a '}' em fim.
+    def analisa_corpo(self, inicio: int, fim: int) -> list[Declaracao]:
+        parser = type(self)(self.tokens)
+        parser.posicao = inicio
+
+        # Os erros sao reportados depois, so os que ficam dentro do corpo.
+        with contextlib.redirect_stdout(io.StringIO()):
+            try:
+                corpo = parser.bloco()
+            except ParserError as e:
+                parser.erros.append(e)
+                corpo = []
+
+        # Um corpo que se perde nos proprios erros pode passar da '}'.
+        limite: Token = self.tokens[fim]
+        erros = [erro for erro in parser.erros if erro.token.posicao <= limite.posicao]
+
+        if erros:
+            for erro in erros:
+                erro.report()
+
+            self.erros.extend(erros)
+            self.ocorreu_erro = True
+            exit(1)
+
+        return corpo
@@ -0,0 +1,612 @@
+from .parser import Parser
+from .janela import JanelaTokens
+from .parser_buffer import ParserBuffer
+from .parser_error import ParserError
+from .parser_iterativo import ParserIterativo, ParserBufferIterativo
+from .parser_incremental import ParserIncremental
+from .parser_paralelo import ParserParalelo, fronteiras
+from .parser_preguicoso import ParserPreguicoso
+from .parser_arena import ParserArena, ParserArenaIterativo
+from .parser_compartilhado import ParserCompartilhado
+from lexer.lex_tabela import LexerTabela
+from lexer.token_buffer import LexerBuffer
+from lexer.lex_token import Token, TokenType
+from lexer.simbolos import Simbolos
+from arvores_sintaticas.expressao import Expressao, Agrupamento, Lista, ListaCompacta
+from arvores_sintaticas.declaracao import Declaracao, Bloco, If, Funcao, Var
+from arvores_sintaticas.arena import de_objetos, para_objetos
+
+from array import array
+
+import contextlib
+import io
+import random
+import unittest
+
+FONTE = """
+xerife a: int = 10;
+procurado soma(x: int, y: int): int {
+    xerife r: int = x + y * (2 - a);
+    bang (r > 0 && !(r == 3)) { vorta r; } miss vorta -r;
+}
+cavalgando (a < 100) { a = soma(a, 1); atire [a, 2, 3]; }
+"""
+
+def tokens_de(fonte: str) -> list[Token]:
+    lexer = LexerTabela(fonte)
+    lexer.lex()
+    
+    return lexer.tokens
+
+# Converte uma arvore sintatica em listas e tuplas comparaveis com assertEqual.
+def estrutura(valor):
+    if isinstance(valor, list):
+        return [estrutura(v) for v in valor]
+    
+    if isinstance(valor, (Expressao, Declaracao)):
+        # Analisa o corpo das funcoes do ParserPreguicoso.
+        if isinstance(valor, Funcao):
+            valor.corpo
+        
+        nomes = [nome for classe in type(valor).__mro__ for nome in getattr(classe, "__slots__", ())]
+        
+        return (type(valor).__name__, {nome: estrutura(getattr(valor, nome)) for nome in nomes if hasattr(valor, nome)})
+    
+    return valor
+
+# Executa o parser sem imprimir os erros e retorna as declaracoes, o que
+# seria impresso e se a analise terminou com erro.
+def executa(parser: Parser):
+    saida = io.StringIO()
+    
+    with contextlib.redirect_stdout(saida):
+        try:
+            parser.parse()
+            falhou = False
+        except SystemExit:
+            falhou = True
+    
+    return estrutura(parser.declaracoes), saida.getvalue(), falhou
+
+def parse(tokens) -> Parser:
+    parser = Parser(tokens)
+    parser.parse()
+    
+    return parser
+
+class JanelaTokensTests(unittest.TestCase):
+    def teste_mesmas_declaracoes_que_a_lista(self):
+        tokens = tokens_de(FONTE)
+        
+        esperado = parse(tokens).declaracoes
+        obtido = list(Parser(JanelaTokens(iter(tokens))).itera_declaracoes())
+        
+        self.assertEqual(estrutura(obtido), estrutura(esperado))
+    
+    def teste_guarda_so_a_janela(self):
+        janela = JanelaTokens(iter(tokens_de("a b c d")), tamanho = 2)
+        
+        self.assertEqual(janela[2].lexema, "c")
+        self.assertEqual(janela[1].lexema, "b")
+        self.assertEqual(len(janela.janela), 2)
+        
+        with self.assertRaises(IndexError):
+            janela[0]
+        
+        self.assertEqual(janela[4].tipo, TokenType.EOF)
+
+
+class SlotsTests(unittest.TestCase):
+    def teste_tokens_e_nos_sem_dict(self):
+        parser = parse(tokens_de(FONTE))
+        pendentes = parser.declaracoes + parser.tokens
+        classes = set()
+        
+        while pendentes:
+            valor = pendentes.pop()
+            
+            if isinstance(valor, list):
+                pendentes.extend(valor)
+            elif isinstance(valor, (Expressao, Declaracao, Token)):
+                classes.add(type(valor))
+                pendentes.extend(getattr(valor, nome) for nome in valor.__slots__ if hasattr(valor, nome))
+        
+        self.assertGreater(len(classes), 10)
+        
+        for classe in classes:
+            self.assertNotIn("__dict__", dir(classe), classe.__name__)
+
+class ParserBufferTests(unittest.TestCase):
+    def teste_mesmas_declaracoes_que_a_lista(self):
+        lexer = LexerBuffer(FONTE)
+        lexer.lex()
+        
+        parser = ParserBuffer(lexer.tokens)
+        parser.parse()
+        
+        self.assertEqual(estrutura(parser.declaracoes), estrutura(parse(tokens_de(FONTE)).declaracoes))
+
+
+class ExpressoesTests(unittest.TestCase):
+    def expressao(self, fonte: str) -> str:
+        return Parser(tokens_de(fonte)).expressao().to_str()
+
+    def teste_precedencia_e_associatividade(self):
+        casos = {
+            "a - b - c": "(- (- a b) c)",
+            "a + b * c / d": "(+ a (/ (* b c) d))",
+            "a < b == c >= d": "(== (< a b) (>= c d))",
+            "a || b && c || d": "(|| (|| a (&& b c)) d)",
+            "!a == -b * -(c)": "(== (! a) (* (- b) (- (grupo c))))",
+            "a = b = c + 1": "(atribuicao a (atribuicao b (+ c 1)))",
+            "-f(1)(2) + 2.5": "(+ (- (chamada (chamada f))) 2.5)",
+            "mocinho != bandido": "(!= True False)",
+        }
+
+        for fonte, esperado in casos.items():
+            with self.subTest(fonte=fonte):
+                self.assertEqual(self.expressao(fonte), esperado)
+
+    def teste_erros(self):
+        casos = {
+            "a + b = c": ("=", "Isso nao e uma atribuicao valida."),
+            "a * ;": (";", "Eu esperava uma expressao aqui"),
+            "(a + b": ("", "Esperado ')' apos essa expressao"),
+            "f(a, ]": ("]", "Eu esperava uma expressao aqui"),
+        }
+
+        for fonte, (lexema, mensagem) in casos.items():
+            with self.subTest(fonte=fonte):
+                with self.assertRaises(ParserError) as contexto:
+                    Parser(tokens_de(fonte)).expressao()
+
+                self.assertEqual((contexto.exception.token.lexema, contexto.exception.mensagem), (lexema, mensagem))
+
+
+class ParserIterativoTests(unittest.TestCase):
+    FONTE_COM_ERROS = """
+xerife a: int = (1 + ;
+procurado f(x: int): int { bang (x > 1 { vorta x; } miss vorta -x; }
+a + b = c;
+{ atire [1, 2; }
+"""
+
+    def teste_mesmo_resultado_do_parser(self):
+        for fonte in [FONTE, self.FONTE_COM_ERROS]:
+            with self.subTest(fonte=fonte):
+                tokens = tokens_de(fonte)
+
+                self.assertEqual(executa(ParserIterativo(tokens)), executa(Parser(tokens)))
+
+                lexer = LexerBuffer(fonte)
+                lexer.lex()
+
+                self.assertEqual(executa(ParserBufferIterativo(lexer.tokens)), executa(Parser(tokens)))
+
+    def teste_aninhamento_profundo(self):
+        n = 100_000
+        casos = {
+            "x = " + "(" * n + "a" + ")" * n + ";": lambda d: d.expressao.valor,
+            "{" * n + "a;" + "}" * n: lambda d: d,
+            "bang (a) b; miss " * n + "c;": lambda d: d,
+        }
+        proximo = {
+            Agrupamento: lambda no: no.expressao,
+            Bloco: lambda no: no.statements[0],
+            If: lambda no: no.else_branch,
+        }
+
+        for fonte, raiz in casos.items():
+            with self.subTest(fonte=fonte[:20]):
+                parser = ParserIterativo(tokens_de(fonte))
+                parser.parse()
+
+                no = raiz(parser.declaracoes[0])
+                profundidade = 0
+
+                while type(no) in proximo:
+                    no = proximo[type(no)](no)
+                    profundidade += 1
+
+                self.assertEqual(profundidade, n)
+
+
+class ParserIncrementalTests(unittest.TestCase):
+    # Sem 'int' e 'float', que tem o mesmo tipo de token que os numeros: uma
+    # edicao que deixasse um deles no lugar de um valor faria o Parser falhar.
+    FONTE = """
+xerife a: bool = mocinho;
+procurado soma(x: string, y: lista[bool]): string {
+    xerife r: string = x + y * (2 - a);
+    bang (r > 0 && !(r == 3)) { vorta r; } miss vorta -r;
+}
+cavalgando (a < 100) { a = soma(a, 1); atire [a, 2, 3]; }
+procurado vazia(): bool { }
+atire soma("a", [mocinho]);
+"""
+    PEDACOS = ["a", "1", ";", " ", "\n", "xerife x: bool = 2;", "bang (a) b; ", "miss c;", "}", "{", "atire a;"]
+
+    def teste_reaproveita_declaracoes_inalteradas(self):
+        simbolos = Simbolos()
+        fonte = "procurado f(): int { vorta 1; }\nprocurado g(): int { vorta 2; }\nprocurado h(): int { vorta 3; }\n"
+
+        lexer = LexerTabela(fonte, simbolos)
+        lexer.lex()
+        anterior = ParserIncremental(lexer.tokens)
+        anterior.parse()
+        f, g, h = anterior.declaracoes
+
+        fonte = fonte.replace("vorta 2;", "xerife x: int = 2;\n    vorta x;")
+        lexer = LexerTabela(fonte, simbolos)
+        lexer.lex()
+        parser = ParserIncremental(lexer.tokens, anterior)
+        parser.parse()
+
+        self.assertIs(parser.declaracoes[0], f)
+        self.assertIsNot(parser.declaracoes[1], g)
+        self.assertIs(parser.declaracoes[2], h)
+        self.assertEqual(parser.reaproveitadas, 2)
+        # Os tokens reaproveitados acompanham a nova posicao.
+        self.assertEqual((h.nome.linha, h.nome.coluna), (4, 11))
+        self.assertIs(parser.tokens[parser.intervalos[2][0] + 1], h.nome)
+
+    def teste_linha_duplicada(self):
+        simbolos = Simbolos()
+        versoes = []
+
+        for fonte in ["a;\nb;\n", "a;\na;\nb;\n"]:
+            lexer = LexerTabela(fonte, simbolos)
+            lexer.lex()
+            parser = ParserIncremental(lexer.tokens, versoes[-1] if versoes else None)
+            parser.parse()
+            versoes.append(parser)
+
+        (a, b), parser = versoes[0].declaracoes, versoes[1]
+
+        self.assertIs(parser.declaracoes[0], a)
+        self.assertIsNot(parser.declaracoes[1], a)
+        self.assertIs(parser.declaracoes[2], b)
+        self.assertEqual([declaracao.expressao.nome.linha for declaracao in parser.declaracoes], [1, 2, 3])
+        self.assertEqual(len({id(token) for token in parser.tokens}), len(parser.tokens))
+
+    def teste_igual_a_analise_completa_em_edicoes_aleatorias(self):
+        aleatorio = random.Random(11)
+
+        for _ in range(100):
+            simbolos = Simbolos()
+            fonte = self.FONTE
+            parser = None
+
+            for _ in range(5):
+                inicio = aleatorio.randint(0, len(fonte))
+                fim = aleatorio.randint(inicio, min(len(fonte), inicio + 8))
+                fonte = fonte[:inicio] + "".join(aleatorio.choices(self.PEDACOS, k=aleatorio.randint(0, 2))) + fonte[fim:]
+
+                lexer = LexerTabela(fonte, simbolos)
+
+                with contextlib.redirect_stdout(io.StringIO()):
+                    try:
+                        lexer.lex()
+                    except SystemExit:
+                        break
+
+                esperado = executa(Parser(list(lexer.tokens)))
+
+                with self.subTest(fonte=fonte):
+                    parser = ParserIncremental(lexer.tokens, parser)
+                    self.assertEqual(executa(parser), esperado)
+                    self.assertEqual(len({id(declaracao) for declaracao in parser.declaracoes}), len(parser.declaracoes))
+
+                    if parser.ocorreu_erro:
+                        break
+
+class ParserParaleloTests(unittest.TestCase):
+    FUNCOES = "".join(
+        f"procurado f{i}(x: string): string {{ xerife y: bool = x > {i}; bang (y) {{ vorta x; }} vorta (x + {i}) * 2; }}\n"
+        for i in range(12)
+    )
+
+    def paralelo(self, fonte: str) -> ParserParalelo:
+        return ParserParalelo(tokens_de(fonte), trabalhadores = 3, tamanho_minimo = 1)
+
+    def teste_fronteiras(self):
+        tokens = tokens_de("xerife a: bool = mocinho; procurado f(): bool { vorta (a); } atire a; xerife b: bool;")
+
+        self.assertEqual([tokens[i].lexema for i in fronteiras(tokens)], ["procurado", "xerife"])
+
+    def teste_mesmo_resultado_que_o_parser(self):
+        for fonte in [self.FUNCOES, "xerife a: bool = mocinho;\n" + self.FUNCOES + "atire f1(\"a\");"]:
+            with self.subTest(fonte=fonte):
+                parser = self.paralelo(fonte)
+
+                self.assertGreater(len(parser.divide()), 1)
+                self.assertEqual(executa(parser), executa(Parser(tokens_de(fonte))))
+
+    def teste_erros_reportados_na_ordem(self):
+        fonte = self.FUNCOES.replace("f2(x", "f2(x x").replace("vorta (x + 9)", "vorta (x + 9;")
+
+        resultado = executa(self.paralelo(fonte))
+
+        self.assertEqual(resultado, executa(Parser(tokens_de(fonte))))
+        self.assertTrue(resultado[2])
+        self.assertLess(resultado[1].index("linha 3,"), resultado[1].index("linha 10,"))
+
+    def teste_fronteira_insegura(self):
+        # Sem o '}', o 'procurado' seguinte fica dentro da funcao f3.
+        fonte = self.FUNCOES.replace("vorta (x + 3) * 2; }", "vorta (x + 3) * 2;")
+
+        self.assertEqual(executa(self.paralelo(fonte)), executa(Parser(tokens_de(fonte))))
+
+    def teste_arvore_usa_os_tokens_da_lista(self):
+        parser = self.paralelo(self.FUNCOES)
+        parser.parse()
+
+        ultima = parser.declaracoes[-1]
+
+        self.assertIn(ultima.nome, parser.tokens)
+        self.assertIs(parser.tokens[parser.tokens.index(ultima.nome)], ultima.nome)
+        self.assertEqual((ultima.nome.linha, ultima.nome.coluna), (12, 11))
+
+class ParserPreguicosoTests(unittest.TestCase):
+    def teste_mesmo_resultado_que_o_parser(self):
+        fonte = FONTE + "procurado externa(): bool { procurado interna(): bool { { vorta mocinho; } } vorta interna(); }\n"
+        tokens = tokens_de(fonte)
+
+        self.assertEqual(executa(ParserPreguicoso(tokens)), executa(Parser(tokens)))
+
+    def teste_corpo_analisado_no_primeiro_acesso(self):
+        tokens = tokens_de("procurado f(x: bool): bool { vorta 1 + ; } procurado g(): bool { vorta mocinho; }")
+        parser = ParserPreguicoso(tokens)
+        parser.parse()
+
+        f, g = parser.declaracoes
+
+        self.assertEqual((f.nome.lexema, len(f.params), g.nome.lexema), ("f", 1, "g"))
+        self.assertTrue(hasattr(g, "analisa_corpo"))
+        self.assertIs(g.corpo, g.corpo)
+        self.assertFalse(hasattr(g, "analisa_corpo"))
+        self.assertEqual(parser.erros, [])
+
+        saida = io.StringIO()
+
+        with contextlib.redirect_stdout(saida), self.assertRaises(SystemExit):
+            f.corpo
+
+        self.assertIn("linha 1, coluna 40", saida.getvalue())
+        self.assertEqual(len(parser.erros), 1)
+        self.assertTrue(parser.ocorreu_erro)
+
+    def teste_erros_so_do_proprio_corpo(self):
+        # O erro faz o corpo de f passar da '}' dele, ate o ';' de g.
+        tokens = tokens_de("procurado f(): bool { bang (mocinho } procurado g(): bool { vorta ); }")
+        parser = ParserPreguicoso(tokens)
+        parser.parse()
+
+        f, g = parser.declaracoes
+        saida = io.StringIO()
+
+        with contextlib.redirect_stdout(saida), self.assertRaises(SystemExit):
+            f.corpo
+
+        self.assertEqual(saida.getvalue().count("Erro na analise sintatica"), 1)
+
+    def teste_corpo_sem_fim(self):
+        self.assertEqual(
+            executa(ParserPreguicoso(tokens_de("procurado f(): bool { { vorta mocinho; }"))),
+            executa(Parser(tokens_de("procurado f(): bool { { vorta mocinho; }"))),
+        )
+
+class ParserArenaTests(unittest.TestCase):
+    def teste_mesma_arvore_que_o_parser(self):
+        for fonte in [FONTE, ParserIterativoTests.FONTE_COM_ERROS]:
+            tokens = tokens_de(fonte)
+            esperado = executa(Parser(tokens))
+
+            for classe in [ParserArena, ParserArenaIterativo]:
+                with self.subTest(fonte=fonte, classe=classe.__name__):
+                    parser = classe(tokens)
+                    _, saida, falhou = executa(parser)
+
+                    self.assertEqual((estrutura(para_objetos(parser.arena)), saida, falhou), esperado)
+
+    def teste_conversao_de_objetos_e_de_volta(self):
+        tokens = tokens_de(FONTE + "procurado vazia(l: lista[int], s: string): bool { }")
+        declaracoes = parse(tokens).declaracoes
+        arena = de_objetos(declaracoes, tokens)
+
+        self.assertEqual(estrutura(para_objetos(arena)), estrutura(declaracoes))
+        self.assertIs(para_objetos(arena)[0].nome, declaracoes[0].nome)
+        # Literais e tipos iguais dividem a mesma constante.
+        self.assertEqual(len(arena.constantes), len(set(map(repr, arena.constantes))))
+
+    def teste_visoes(self):
+        tokens = tokens_de(FONTE)
+        parser = ParserArena(tokens)
+        parser.parse()
+
+        var, funcao, _ = parser.arena.declaracoes()
+        esperado = parse(tokens).declaracoes[1]
+
+        self.assertIsInstance(var, Var)
+        self.assertIsInstance(funcao, Funcao)
+        self.assertIs(var.nome, tokens[1])
+        self.assertEqual(var.simbolo, tokens[1].simbolo)
+        self.assertEqual(var.inicializador.valor, 10)
+        self.assertEqual([p.nome.lexema for p in funcao.params], ["x", "y"])
+        self.assertEqual(funcao.corpo[0].inicializador.to_str(), esperado.corpo[0].inicializador.to_str())
+        self.assertEqual(funcao.corpo[1].else_branch.valor.to_str(), "(- r)")
+
+        with self.assertRaises(AttributeError):
+            var.tipo = None
+
+    def teste_aninhamento_profundo(self):
+        n = 100_000
+        parser = ParserArenaIterativo(tokens_de("x = " + "(" * n + "a" + ")" * n + ";"))
+        parser.parse()
+
+        objetos = para_objetos(parser.arena)
+        arena = de_objetos(objetos, parser.tokens)
+        no = arena.visao(arena.raizes[0]).expressao.valor
+        profundidade = 0
+
+        while isinstance(no, Agrupamento):
+            no = no.expressao
+            profundidade += 1
+
+        self.assertEqual(profundidade, n)
+
+# Como estrutura, mas sem a posicao dos tokens: um no compartilhado tem os
+# tokens do primeiro lugar em que apareceu.
+def estrutura_sem_posicoes(valor):
+    if isinstance(valor, Token):
+        return (valor.tipo, valor.lexema)
+    
+    if isinstance(valor, list):
+        return [estrutura_sem_posicoes(v) for v in valor]
+    
+    if isinstance(valor, tuple):
+        return tuple(estrutura_sem_posicoes(v) for v in valor)
+    
+    if isinstance(valor, dict):
+        return {chave: estrutura_sem_posicoes(v) for chave, v in valor.items()}
+    
+    return valor
+
+class ParserCompartilhadoTests(unittest.TestCase):
+    def teste_mesma_arvore_que_o_parser(self):
+        for fonte in [FONTE, ParserIterativoTests.FONTE_COM_ERROS]:
+            with self.subTest(fonte=fonte):
+                tokens = tokens_de(fonte)
+                declaracoes, saida, falhou = executa(ParserCompartilhado(tokens))
+                esperado, saida_esperada, falhou_esperado = executa(Parser(tokens))
+                
+                self.assertEqual(estrutura_sem_posicoes(estrutura(declaracoes)), estrutura_sem_posicoes(estrutura(esperado)))
+                self.assertEqual((saida, falhou), (saida_esperada, falhou_esperado))
+    
+    def teste_expressoes_iguais_viram_um_no(self):
+        parser = ParserCompartilhado(tokens_de("atire (a + 1) * -a; atire (a + 1) * -a; atire a + 1.0;"))
+        parser.parse()
+        
+        primeira, segunda, terceira = [declaracao.expressao for declaracao in parser.declaracoes]
+        
+        self.assertIs(primeira, segunda)
+        self.assertIs(terceira.esquerda, primeira.esquerda.expressao.esquerda)
+        self.assertIsNot(terceira.direita, primeira.esquerda.expressao.direita)
+        self.assertIn(primeira, parser.fabrica.compartilhados)
+        # Sete nos em cada uma das duas primeiras e tres na ultima, dos quais 8 sao distintos.
+        self.assertEqual(parser.fabrica.pedidos, 17)
+        self.assertEqual(parser.fabrica.construidos, 8)
+    
+    def teste_variaveis_de_escopos_diferentes(self):
+        parser = ParserCompartilhado(tokens_de("""
+            atire a;
+            xerife a: int = 1;
+            atire a;
+            { atire a; xerife a: float = 2.0; atire a; }
+            atire a;
+            procurado f(a: string): int { vorta a; }
+            atire a;
+        """))
+        parser.parse()
+        
+        antes, _, depois_var, bloco, depois_bloco, funcao, depois_funcao = parser.declaracoes
+        
+        self.assertIsNot(antes.expressao, depois_var.expressao)
+        self.assertIs(depois_var.expressao, depois_bloco.expressao)
+        self.assertIsNot(bloco.statements[2].expressao, depois_var.expressao)
+        self.assertIsNot(funcao.corpo[0].valor, depois_var.expressao)
+        self.assertIs(depois_funcao.expressao, depois_var.expressao)
+    
+    def teste_efeitos_colaterais_nao_sao_compartilhados(self):
+        parser = ParserCompartilhado(tokens_de("a = 1; a = 1; f(a); f(a); atire [f(a)]; atire [f(a)];"))
+        parser.parse()
+        
+        expressoes = [declaracao.expressao for declaracao in parser.declaracoes]
+        
+        self.assertIsNot(expressoes[0], expressoes[1])
+        self.assertIs(expressoes[0].valor, expressoes[1].valor)
+        self.assertIsNot(expressoes[2], expressoes[3])
+        self.assertIs(expressoes[2].argumentos[0], expressoes[3].argumentos[0])
+        self.assertIsNot(expressoes[4], expressoes[5])
+
+class ListaCompactaTests(unittest.TestCase):
+    FONTE = """
+xerife l: lista[int] = [1, -2, 3];
+atire [0.5, -1.0];
+atire [[1, 2], [3]];
+atire [1, 2.0];
+atire [1, -2, a];
+atire [1, 2 - 3, 4];
+atire [9223372036854775808, 1];
+atire [-9223372036854775808];
+atire [];
+"""
+    
+    def expressoes(self, parser: Parser) -> list[Expressao]:
+        return [declaracao.inicializador if isinstance(declaracao, Var) else declaracao.expressao for declaracao in parser.declaracoes]
+    
+    def teste_listas_de_numeros_viram_arrays(self):
+        l, floats, aninhada, mista, variavel, conta, grande, menor, vazia = self.expressoes(parse(tokens_de(self.FONTE)))
+        
+        self.assertIsInstance(l, ListaCompacta)
+        self.assertEqual(l.valores, array('q', [1, -2, 3]))
+        self.assertEqual(floats.valores, array('d', [0.5, -1.0]))
+        self.assertEqual([type(lista) for lista in aninhada.valores], [ListaCompacta, ListaCompacta])
+        self.assertEqual(menor.valores, array('q', [-2 ** 63]))
+        
+        # As outras sao Listas, com os mesmos nos de antes.
+        for lista, texto in [(aninhada, "[[1, 2], [3]]"), (mista, "[1, 2.0]"), (variavel, "[1, (- 2), a]"),
+                             (conta, "[1, (- 2 3), 4]"), (grande, "[9223372036854775808, 1]"), (vazia, "[]")]:
+            self.assertIsInstance(lista, Lista)
+            self.assertEqual(lista.to_str(), texto)
+        
+        self.assertEqual(variavel.valores[1].operador.lexema, "-")
+    
+    def teste_to_str_igual_ao_da_lista(self):
+        fonte = "atire [1, -2, 3]; atire [0.5, -1.0, -0.0]; atire [-9223372036854775808]; atire [-0, 1]; atire [1, -0];"
+        
+        # Monta as Listas de antes, com um Literal ou uma Unaria para cada elemento.
+        class ParserSemCompactas(Parser):
+            def lista_compacta(self):
+                return []
+        
+        listas = ParserSemCompactas(tokens_de(fonte))
+        listas.parse()
+        
+        textos = ["[1, (- 2), 3]", "[0.5, (- 1.0), (- 0.0)]", "[(- 9223372036854775808)]", "[(- 0), 1]", "[1, (- 0)]"]
+        
+        for compacta, lista, texto in zip(self.expressoes(parse(tokens_de(fonte))), self.expressoes(listas), textos):
+            self.assertIsInstance(lista, Lista)
+            self.assertEqual((compacta.to_str(), lista.to_str()), (texto, texto))
+        
+        # Um -0 inteiro nao cabe no array, entao a lista continua uma Lista.
+        self.assertEqual([type(compacta) for compacta in self.expressoes(parse(tokens_de(fonte)))],
+                         [ListaCompacta, ListaCompacta, ListaCompacta, Lista, Lista])
+    
+    def teste_mesma_arvore_em_todos_os_parsers(self):
+        tokens = tokens_de(self.FONTE)
+        esperado = estrutura(parse(tokens).declaracoes)
+        
+        lexer = LexerBuffer(self.FONTE)
+        lexer.lex()
+        
+        for parser in [ParserIterativo(tokens), ParserBuffer(lexer.tokens), ParserBufferIterativo(lexer.tokens),
+                       Parser(JanelaTokens(iter(tokens)))]:
+            with self.subTest(classe=type(parser).__name__):
+                parser.parse()
+                self.assertEqual(estrutura(parser.declaracoes), esperado)
+        
+        arena = ParserArena(tokens)
+        arena.parse()
+        self.assertEqual(estrutura(para_objetos(arena.arena)), esperado)
+        self.assertEqual(estrutura(para_objetos(de_objetos(parse(tokens).declaracoes, tokens))), esperado)
+        
+        compartilhado = ParserCompartilhado(tokens_de(self.FONTE + "atire [1, -2, 3];"))
+        compartilhado.parse()
+        self.assertIs(compartilhado.declaracoes[0].inicializador, compartilhado.declaracoes[-1].expressao)
+    
+    def teste_virgula_no_fim(self):
+        _, saida, falhou = executa(Parser(tokens_de("atire [1, 2, ];")))
+        
+        self.assertTrue(falhou)
+        self.assertIn("Eu esperava uma expressao aqui", saida)
@@ -1,10 +1,18 @@
 import unittest
 
 import lexer.tests
+import parser.tests
+import analise_semantica.tests
+import cache.tests
+import arvores_sintaticas.tests
 
 if __name__ == "__main__":
     runner = unittest.TextTestRunner()
     
     testes_lexer = unittest.defaultTestLoader.loadTestsFromModule(lexer.tests)
+    testes_parser = unittest.defaultTestLoader.loadTestsFromModule(parser.tests)
+    testes_semantica = unittest.defaultTestLoader.loadTestsFromModule(analise_semantica.tests)
+    testes_cache = unittest.defaultTestLoader.loadTestsFromModule(cache.tests)
+    testes_arvores = unittest.defaultTestLoader.loadTestsFromModule(arvores_sintaticas.tests)
     
-    runner.run(testes_lexer)
\ No newline at end of file
+    runner.run(unittest.TestSuite([testes_lexer, testes_parser, testes_semantica, testes_cache, testes_arvores]))
\ No newline at end of file